@@ -76,8 +76,12 @@ cp scripts/openclaw.service /etc/systemd/system/
 # Update backend URL in service file
 sed -i "s|BACKEND_URL=.*|BACKEND_URL=$BACKEND_URL|g" /etc/systemd/system/openclaw.service
 
+# Backend client daemon: keeps a warm process and connection pool for tool calls
+cp scripts/backend-client.service /etc/systemd/system/
+sed -i "s|BACKEND_URL=.*|BACKEND_URL=$BACKEND_URL|g" /etc/systemd/system/backend-client.service
+
 systemctl daemon-reload
-systemctl enable openclaw
+systemctl enable openclaw backend-client
 
 # Setup Clawdbot API Server (optional but recommended)
 echo "🔧 Setting up Clawdbot API Server..."
@@ -112,6 +116,7 @@ echo "   ANTHROPIC_API_KEY=sk-ant-..."
 echo "   OPENAI_API_KEY=sk-..."
 echo ""
 echo "3. Start services:"
+echo "   sudo systemctl start backend-client  # Tool-call daemon (optional)"
 echo "   sudo systemctl start openclaw    # Port 18789"
 echo "   sudo systemctl start clawdbot    # Port 8080"
 echo ""
@@ -5,27 +5,55 @@ Backend API Client for OpenClaw Integration
 This script allows OpenClaw to call the Transition OS backend API.
 Usage from OpenClaw: backend_client.py <command> [args]
 
+Daemon mode: `backend_client.py daemon` keeps one warm process with a pooled
+HTTP client listening on a Unix domain socket. Every other invocation first
+tries to hand its command to the daemon and prints the daemon's answer, so a
+tool call skips the httpx import and reuses a kept-alive backend connection.
+Without a daemon it calls the backend directly, as before.
+
 Environment:
     BACKEND_URL: The backend API URL (default: http://localhost:8000)
     BACKEND_API_KEY: Optional API key for authentication
+    BACKEND_CLIENT_SOCKET: Daemon socket (default: /tmp/backend_client-<uid>.sock;
+                           empty = never use the daemon)
+    BACKEND_CLIENT_TIMEOUT: Backend request timeout in seconds (default: 5)
 """
 
 import os
 import sys
 import json
-import httpx
+
+# httpx is imported where it is used, so forwarding a command to the daemon never pays for it
 
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 API_KEY = os.getenv("BACKEND_API_KEY")
+SOCKET_PATH = os.getenv("BACKEND_CLIENT_SOCKET", f"/tmp/backend_client-{os.getuid()}.sock")
+TIMEOUT = float(os.getenv("BACKEND_CLIENT_TIMEOUT", "5"))
+
+# Commands not resent directly if the daemon fails mid-request (the backend may have applied them)
+NOT_RETRYABLE = {"complete"}
+
+
+class UsageError(Exception):
+    """Bad command line; the message is printed as-is."""
 
 
 class TransitionOSClient:
     """Client for Transition OS Backend API"""
     
-    def __init__(self, base_url: str = None, api_key: str = None):
+    def __init__(self, base_url: str = None, api_key: str = None, http=None):
         self.base_url = base_url or BACKEND_URL
         self.api_key = api_key or API_KEY
         self.api_v1 = f"{self.base_url}/api"
+        self._http = http
+    
+    @property
+    def http(self):
+        """Pooled httpx.Client (shared by every client in the daemon)"""
+        if self._http is None:
+            import httpx
+            self._http = httpx.Client(timeout=TIMEOUT)
+        return self._http
     
     def _headers(self) -> dict:
         headers = {"Content-Type": "application/json"}
@@ -41,13 +69,13 @@ class TransitionOSClient:
         if status:
             params["status"] = status
         
-        response = httpx.get(f"{self.api_v1}/transitions", params=params, headers=self._headers())
+        response = self.http.get(f"{self.api_v1}/transitions", params=params, headers=self._headers())
         response.raise_for_status()
         return response.json()
     
     def get_household(self, household_id: int):
         """GET /api/transitions/{id}"""
-        response = httpx.get(f"{self.api_v1}/transitions/{household_id}", headers=self._headers())
+        response = self.http.get(f"{self.api_v1}/transitions/{household_id}", headers=self._headers())
         response.raise_for_status()
         return response.json()
     
@@ -57,7 +85,7 @@ class TransitionOSClient:
         if note:
             data["note"] = note
         
-        response = httpx.post(
+        response = self.http.post(
             f"{self.api_v1}/tasks/{task_id}/complete",
             json=data,
             headers=self._headers()
@@ -71,92 +99,222 @@ class TransitionOSClient:
         if document_url:
             data["document_url"] = document_url
         
-        response = httpx.post(f"{self.base_url}/documents/validate", json=data, headers=self._headers())
+        response = self.http.post(f"{self.base_url}/documents/validate", json=data, headers=self._headers())
         response.raise_for_status()
         return response.json()
     
     def get_meeting_pack(self, household_id: int):
         """GET /households/{id}/meeting-pack"""
-        response = httpx.get(f"{self.base_url}/households/{household_id}/meeting-pack", headers=self._headers())
+        response = self.http.get(f"{self.base_url}/households/{household_id}/meeting-pack", headers=self._headers())
         response.raise_for_status()
         return response.json()
     
     def get_eta(self, workflow_id: str):
         """GET /predictions/eta/{workflow_id}"""
-        response = httpx.get(f"{self.base_url}/predictions/eta/{workflow_id}", headers=self._headers())
+        response = self.http.get(f"{self.base_url}/predictions/eta/{workflow_id}", headers=self._headers())
         response.raise_for_status()
         return response.json()
 
 
-def main():
-    """CLI interface"""
-    if len(sys.argv) < 2:
-        print("Usage: backend_client.py <command> [args]")
-        print("")
-        print("Commands:")
-        print("  list [advisor_id] [status]   List households")
-        print("  get <household_id>           Get household details")
-        print("  complete <task_id> [note]    Complete a task")
-        print("  validate <doc_id> [url]      Validate document")
-        print("  meeting <household_id>       Get meeting pack")
-        print("  eta <workflow_id>            Get ETA prediction")
-        print("")
-        print(f"Backend URL: {BACKEND_URL}")
-        sys.exit(1)
-    
-    client = TransitionOSClient()
-    command = sys.argv[1]
+def usage(backend_url: str) -> str:
+    return "\n".join([
+        "Usage: backend_client.py <command> [args]",
+        "",
+        "Commands:",
+        "  list [advisor_id] [status]   List households",
+        "  get <household_id>           Get household details",
+        "  complete <task_id> [note]    Complete a task",
+        "  validate <doc_id> [url]      Validate document",
+        "  meeting <household_id>       Get meeting pack",
+        "  eta <workflow_id>            Get ETA prediction",
+        "  daemon [socket]              Serve commands on a Unix socket",
+        "",
+        f"Backend URL: {backend_url}",
+    ])
+
+
+def run_command(client: TransitionOSClient, args: list):
+    """Run one CLI command and return the backend's JSON answer"""
+    command = args[0]
     
-    try:
-        if command == "list":
-            advisor_id = sys.argv[2] if len(sys.argv) > 2 else None
-            status = sys.argv[3] if len(sys.argv) > 3 else None
-            result = client.list_households(advisor_id, status)
-        
-        elif command == "get":
-            if len(sys.argv) < 3:
-                print("Error: household_id required")
-                sys.exit(1)
-            result = client.get_household(int(sys.argv[2]))
-        
-        elif command == "complete":
-            if len(sys.argv) < 3:
-                print("Error: task_id required")
-                sys.exit(1)
-            note = sys.argv[3] if len(sys.argv) > 3 else None
-            result = client.complete_task(int(sys.argv[2]), note)
-        
-        elif command == "validate":
-            if len(sys.argv) < 3:
-                print("Error: document_id required")
-                sys.exit(1)
-            doc_url = sys.argv[3] if len(sys.argv) > 3 else None
-            result = client.validate_document(sys.argv[2], doc_url)
-        
-        elif command == "meeting":
-            if len(sys.argv) < 3:
-                print("Error: household_id required")
-                sys.exit(1)
-            result = client.get_meeting_pack(int(sys.argv[2]))
-        
-        elif command == "eta":
-            if len(sys.argv) < 3:
-                print("Error: workflow_id required")
-                sys.exit(1)
-            result = client.get_eta(sys.argv[2])
-        
-        else:
-            print(f"Unknown command: {command}")
-            sys.exit(1)
-        
-        print(json.dumps(result, indent=2, default=str))
+    if command == "list":
+        advisor_id = args[1] if len(args) > 1 else None
+        status = args[2] if len(args) > 2 else None
+        return client.list_households(advisor_id, status)
+    
+    elif command == "get":
+        if len(args) < 2:
+            raise UsageError("Error: household_id required")
+        return client.get_household(int(args[1]))
+    
+    elif command == "complete":
+        if len(args) < 2:
+            raise UsageError("Error: task_id required")
+        note = args[2] if len(args) > 2 else None
+        return client.complete_task(int(args[1]), note)
+    
+    elif command == "validate":
+        if len(args) < 2:
+            raise UsageError("Error: document_id required")
+        doc_url = args[2] if len(args) > 2 else None
+        return client.validate_document(args[1], doc_url)
     
-    except httpx.HTTPError as e:
-        print(json.dumps({"error": str(e)}))
-        sys.exit(1)
+    elif command == "meeting":
+        if len(args) < 2:
+            raise UsageError("Error: household_id required")
+        return client.get_meeting_pack(int(args[1]))
+    
+    elif command == "eta":
+        if len(args) < 2:
+            raise UsageError("Error: workflow_id required")
+        return client.get_eta(args[1])
+    
+    raise UsageError(f"Unknown command: {command}")
+
+
+def execute(client: TransitionOSClient, args: list) -> tuple:
+    """Run a command line; returns (exit code, text to print)"""
+    if not args:
+        return 1, usage(client.base_url)
+    try:
+        result = run_command(client, args)
+    except UsageError as e:
+        return 1, str(e)
     except Exception as e:
-        print(json.dumps({"error": str(e)}))
-        sys.exit(1)
+        return 1, json.dumps({"error": str(e)})
+    return 0, json.dumps(result, indent=2, default=str)
+
+
+# ==================== Daemon ====================
+
+def forward(args: list, socket_path: str = SOCKET_PATH):
+    """
+    Run a command line in the daemon.
+
+    Returns (exit code, text to print), or None when no daemon is reachable
+    (or it failed before answering a command that is safe to resend).
+    """
+    import socket
+
+    try:
+        # Only trust a socket owned by this user: the request carries the API key
+        if os.stat(socket_path).st_uid != os.getuid():
+            return None
+    except OSError:
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(TIMEOUT + 5)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+
+    request = {
+        "args": args,
+        "backend_url": os.getenv("BACKEND_URL"),
+        "api_key": os.getenv("BACKEND_API_KEY"),
+    }
+    try:
+        with sock:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        response = json.loads(b"".join(chunks))
+        return response["exit"], response["output"]
+    except (OSError, ValueError, KeyError) as e:
+        if args[0] in NOT_RETRYABLE:
+            return 1, json.dumps({"error": f"backend_client daemon failed: {e}"})
+        return None
+
+
+def serve(socket_path: str = SOCKET_PATH):
+    """Answer command lines sent to `socket_path` until stopped (SIGTERM or Ctrl-C)"""
+    import signal
+    import socket
+    import socketserver
+    import httpx
+
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+            raise SystemExit(f"A daemon is already listening on {socket_path}")
+        except OSError:
+            os.unlink(socket_path)  # left behind by a daemon that was killed
+        finally:
+            probe.close()
+
+    http = httpx.Client(
+        timeout=TIMEOUT,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60),
+    )
+    clients = {}
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return  # a connect-only probe (see above)
+            try:
+                request = json.loads(line)
+                # Each caller's own backend settings, over the one connection pool
+                key = (request.get("backend_url") or BACKEND_URL, request.get("api_key") or API_KEY)
+                client = clients.get(key)
+                if client is None:
+                    client = clients.setdefault(key, TransitionOSClient(key[0], key[1], http=http))
+                code, output = execute(client, request["args"])
+            except (ValueError, KeyError, TypeError) as e:
+                code, output = 1, json.dumps({"error": f"Bad daemon request: {e}"})
+            try:
+                self.wfile.write(json.dumps({"exit": code, "output": output}).encode("utf-8") + b"\n")
+            except OSError:
+                pass  # the caller gave up (timed out or was killed)
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    old_umask = os.umask(0o077)  # socket usable by this user only
+    try:
+        server = Server(socket_path, Handler)
+    finally:
+        os.umask(old_umask)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    print(f"backend_client daemon listening on {socket_path} (backend {BACKEND_URL})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        http.close()
+
+
+def main():
+    """CLI interface"""
+    args = sys.argv[1:]
+
+    if args and args[0] == "daemon":
+        serve(args[1] if len(args) > 1 else SOCKET_PATH)
+        return
+
+    answer = forward(args, SOCKET_PATH) if args and SOCKET_PATH else None
+    if answer is None:
+        answer = execute(TransitionOSClient(), args)
+
+    code, output = answer
+    print(output)
+    if code:
+        sys.exit(code)
 
 
 if __name__ == "__main__":
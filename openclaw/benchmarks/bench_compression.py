@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: response compression size, CPU cost and transfer time.
+
+Encodes household lists of typical sizes the way /households returns them,
+then compresses each body with the encoders CompressionMiddleware uses.
+Transfer time is estimated for a slow (2 Mbit/s) and a typical (20 Mbit/s)
+link, so the CPU spent compressing can be weighed against the bytes saved.
+
+Usage:
+    python openclaw/benchmarks/bench_compression.py [--rows 10,100,1000,10000] [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from bench_serialization import make_households
+
+from openclaw import clawdbot_compression
+from openclaw.clawdbot_compression import _Compressor
+from openclaw.clawdbot_responses import dumps
+
+LINKS = {"2 Mbit/s": 2e6, "20 Mbit/s": 20e6}
+
+
+def encoders():
+    configs = [("identity", None, 0), ("gzip-1", "gzip", 1), ("gzip-6", "gzip", 6)]
+    if clawdbot_compression.brotli is not None:
+        configs += [("br-4", "br", 4), ("br-11", "br", 11)]
+    return configs
+
+
+def compress(encoding: str, level: int, body: bytes) -> bytes:
+    gzip_level = level if encoding == "gzip" else 6
+    brotli_quality = level if encoding == "br" else 4
+    return _Compressor(encoding, gzip_level, brotli_quality).compress(body, finish=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10,100,1000,10000", help="comma-separated household counts")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per configuration (best is kept)")
+    args = parser.parse_args()
+
+    if clawdbot_compression.brotli is None:
+        print("brotli is not installed: only gzip is measured\n")
+
+    link_names = list(LINKS)
+    print(
+        f"{'rows':>6} {'encoding':>9} {'bytes':>10} {'ratio':>6} {'cpu ms':>8} "
+        + " ".join(f"{'total ms @ ' + name:>20}" for name in link_names)
+    )
+    for rows in [int(r) for r in args.rows.split(",")]:
+        body = dumps(make_households(rows))
+        number = max(1, 2000 // rows)
+        for label, encoding, level in encoders():
+            if encoding is None:
+                data, seconds = body, 0.0
+            else:
+                data = compress(encoding, level, body)
+                seconds = min(timeit.repeat(lambda: compress(encoding, level, body), number=number, repeat=args.repeat))
+                seconds /= number
+            totals = [seconds * 1e3 + len(data) * 8 / LINKS[name] * 1e3 for name in link_names]
+            print(
+                f"{rows:>6} {label:>9} {len(data):>10} {len(body) / len(data):>6.1f} {seconds * 1e3:>8.2f} "
+                + " ".join(f"{total:>20.1f}" for total in totals)
+            )
+
+
+if __name__ == "__main__":
+    main()
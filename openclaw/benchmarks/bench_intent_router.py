@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: intent routing cost per chat message vs. number of intents.
+
+Compares the compiled IntentRouter with the original approach (an ordered
+chain of substring checks, one `in` scan per keyword) as synthetic intents
+are added on top of the six built-in ones.
+
+Usage:
+    python openclaw/benchmarks/bench_intent_router.py [--messages N] [--repeat R]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from openclaw.clawdbot_intents import IntentRouter
+
+BUILTIN_INTENTS = [
+    ("dashboard", ["what's left", "status", "dashboard"], 60),
+    ("meeting_pack", ["meeting", "pack"], 55),
+    ("households", ["household", "client"], 50),
+    ("complete_task", ["complete", "done"], 40),
+    ("validate_document", ["document", "validate"], 30),
+    ("eta", ["eta", "when", "timeline"], 10),
+]
+
+SAMPLE_MESSAGES = [
+    "what's the status of my book today?",
+    "show me household 12 please",
+    "complete task 4512, the client signed the form",
+    "can you validate document doc-991 for NIGO issues",
+    "prepare the meeting pack for client 77 before Thursday",
+    "when will workflow wf-3312 finish? what's the timeline",
+    "hello there, what can you do for me",
+    "I need a quick overview of everything that is still open for the Johnson family transfer",
+]
+
+
+def build_intents(count: int, rng: random.Random):
+    """Built-in intents plus synthetic ones with 3 random keywords each."""
+    intents = list(BUILTIN_INTENTS)
+    for i in range(count - len(intents)):
+        keywords = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10))) for _ in range(3)]
+        intents.append((f"synthetic_{i}", keywords, -i))
+    return intents
+
+
+def naive_route(intents, message: str) -> str:
+    """The original if/elif style: scan the message once per keyword, in priority order."""
+    message = message.lower()
+    for name, keywords, _ in intents:
+        if any(keyword in message for keyword in keywords):
+            return name
+    return "help"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000, help="messages routed per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per configuration (best is kept)")
+    parser.add_argument("--counts", default="6,25,100,400,1000", help="comma-separated intent counts")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    messages = [rng.choice(SAMPLE_MESSAGES) for _ in range(args.messages)]
+
+    print(f"{'intents':>8} {'if/elif (µs/msg)':>18} {'router (µs/msg)':>17} {'speedup':>8}")
+    for count in [int(c) for c in args.counts.split(",")]:
+        intents = sorted(build_intents(count, rng), key=lambda item: -item[2])
+        router = IntentRouter()
+        for name, keywords, priority in intents:
+            router.register(name, keywords, priority=priority)
+        router.compile()
+
+        naive = min(timeit.repeat(lambda: [naive_route(intents, m) for m in messages], number=1, repeat=args.repeat))
+        compiled = min(timeit.repeat(lambda: [router.route(m) for m in messages], number=1, repeat=args.repeat))
+        naive_us = naive / len(messages) * 1e6
+        compiled_us = compiled / len(messages) * 1e6
+        print(f"{count:>8} {naive_us:>18.2f} {compiled_us:>17.2f} {naive_us / compiled_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Scaling report: /chat latency and Clawdbot memory against book size.
+
+For each book size, starts the stub backend with a datagen.py book of that
+size and a fresh clawdbot_server.py, then sends every chat intent:
+
+    cold    the first request (empty caches; the dashboard intent builds
+            the aggregates from the whole book)
+    warm    p50/p95 of --repeat further requests with the caches filled
+
+After each intent the Clawdbot process's resident memory is read (current
+RSS and its peak so far, from /proc: Linux only). complete_task runs last
+because it invalidates the cached household lists.
+
+Usage:
+    python openclaw/benchmarks/bench_scaling.py [--sizes 1000,10000,100000] [--repeat 20]
+        [--backend-latency-ms 0] [--json scaling.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loadgen import SCENARIOS, percentile, spawn_servers, stop_servers
+
+INTENTS = [
+    "chat:help",
+    "chat:dashboard",
+    "chat:households",
+    "chat:household",
+    "chat:meeting_pack",
+    "chat:validate_document",
+    "chat:eta",
+    "chat:complete_task",
+]
+
+
+def memory_mb(pid: int) -> Dict[str, Optional[float]]:
+    """Current and peak resident memory of `pid` in MiB (None where /proc is unavailable)."""
+    fields = {"VmRSS": None, "VmHWM": None}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in fields:
+                    fields[name] = int(value.split()[0]) / 1024.0
+    except OSError:
+        pass
+    return {"rss_mb": fields["VmRSS"], "peak_rss_mb": fields["VmHWM"]}
+
+
+def measure_size(size: int, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    url, processes = spawn_servers(
+        households=size, latency_ms=args.backend_latency_ms, server_log=args.server_log
+    )
+    clawdbot_pid = processes[1].pid
+    rows = [{"households": size, "intent": "(startup)", **memory_mb(clawdbot_pid)}]
+    print_row(rows[0])
+    try:
+        with httpx.Client(base_url=url, timeout=args.timeout) as client:
+            for intent in INTENTS:
+                build = SCENARIOS[intent]
+                rng = random.Random(f"{args.seed}-{intent}")
+                timings = []
+                size_bytes = 0
+                for attempt in range(args.repeat + 1):
+                    method, path, params, body = build(rng, 0, size)
+                    started = time.perf_counter()
+                    response = client.request(method, path, params=params, json=body)
+                    timings.append(time.perf_counter() - started)
+                    response.raise_for_status()
+                    size_bytes = len(response.content)
+                warm = sorted(timings[1:])
+                rows.append({
+                    "households": size,
+                    "intent": intent.split(":", 1)[1],
+                    "cold_ms": timings[0] * 1e3,
+                    "warm_p50_ms": percentile(warm, 50) * 1e3,
+                    "warm_p95_ms": percentile(warm, 95) * 1e3,
+                    "response_bytes": size_bytes,
+                    **memory_mb(clawdbot_pid),
+                })
+                print_row(rows[-1])
+    finally:
+        stop_servers(processes)
+    return rows
+
+
+def _fmt(value: Optional[float], spec: str) -> str:
+    if value is None:
+        return format("-", ">" + spec.rstrip("df").split(".")[0])
+    return format(value, spec)
+
+
+def print_header() -> None:
+    print(
+        f"{'households':>10} {'intent':<18} {'cold ms':>9} {'warm p50':>9} {'warm p95':>9} "
+        f"{'bytes':>9} {'rss MB':>8} {'peak MB':>8}"
+    )
+
+
+def print_row(row: Dict[str, Any]) -> None:
+    print(
+        f"{row['households']:>10} {row['intent']:<18} {_fmt(row.get('cold_ms'), '9.1f')} "
+        f"{_fmt(row.get('warm_p50_ms'), '9.1f')} {_fmt(row.get('warm_p95_ms'), '9.1f')} "
+        f"{_fmt(row.get('response_bytes'), '9d')} {_fmt(row['rss_mb'], '8.1f')} {_fmt(row['peak_rss_mb'], '8.1f')}",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated book sizes")
+    parser.add_argument("--repeat", type=int, default=20, help="warm requests per intent")
+    parser.add_argument("--backend-latency-ms", type=float, default=0.0, help="stub backend latency")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the request mix")
+    parser.add_argument("--server-log", default=os.devnull, help="file for the servers' output")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    print_header()
+    rows = []
+    for size in [int(s) for s in args.sizes.split(",")]:
+        rows += measure_size(size, args)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"sizes": args.sizes, "repeat": args.repeat, "results": rows}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: response serialization cost per household row.
+
+Reproduces the work FastAPI does for each way Clawdbot returns a payload:
+
+    /chat before        validate against ChatResponse, dump it to JSON-safe
+                        Python, encode with the standard-library json module
+    passthrough before  walk the backend list with jsonable_encoder, encode
+                        with json (endpoints without a response_model)
+    after               trusted_json(): encode once with FastJSONResponse
+                        (orjson, or compact json when orjson is missing)
+
+Usage:
+    python openclaw/benchmarks/bench_serialization.py [--rows 10,100,1000,10000] [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from openclaw import clawdbot_responses
+from openclaw.clawdbot_responses import FastJSONResponse
+from openclaw.clawdbot_server import ChatResponse
+
+STATUSES = ["IN_PROGRESS", "AT_RISK", "COMPLETED", "NIGO"]
+
+
+def make_households(count: int):
+    """Household rows shaped like /api/transitions output."""
+    return [
+        {
+            "id": i,
+            "name": f"Household {i}",
+            "advisor_id": f"adv-{i % 40}",
+            "advisor_name": f"Advisor {i % 40}",
+            "status": STATUSES[i % len(STATUSES)],
+            "open_tasks_count": i % 7,
+            "nigo_issues_count": i % 3,
+            "updated_at": "2026-10-01T12:00:00Z",
+            "next_meeting_at": None,
+            "accounts": [{"id": i * 10 + k, "type": "IRA", "balance": 1000.5 * k} for k in range(2)],
+        }
+        for i in range(count)
+    ]
+
+
+def chat_before(payload):
+    model = ChatResponse.model_validate(payload)
+    return JSONResponse.render(None, model.model_dump(mode="json"))
+
+
+def passthrough_before(households):
+    return JSONResponse.render(None, jsonable_encoder(households))
+
+
+def fast(content):
+    return FastJSONResponse.render(None, content)
+
+
+def stdlib_fast(content):
+    orjson, clawdbot_responses.orjson = clawdbot_responses.orjson, None
+    try:
+        return FastJSONResponse.render(None, content)
+    finally:
+        clawdbot_responses.orjson = orjson
+
+
+def best(fn, arg, repeat: int, number: int) -> float:
+    return min(timeit.repeat(lambda: fn(arg), number=number, repeat=repeat)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10,100,1000,10000", help="comma-separated household counts")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per configuration (best is kept)")
+    args = parser.parse_args()
+
+    if clawdbot_responses.orjson is None:
+        print("orjson is not installed: 'after (orjson)' falls back to json\n")
+
+    print(
+        f"{'rows':>6} {'chat before':>12} {'passthru before':>16} "
+        f"{'after (json)':>13} {'after (orjson)':>15}   (µs per row)"
+    )
+    for rows in [int(r) for r in args.rows.split(",")]:
+        households = make_households(rows)
+        payload = {"response": "🏠 Households", "session_id": "s", "actions_taken": ["listed_households"],
+                   "data": {"households": households}}
+        number = max(1, 20000 // rows)
+        results = [
+            best(chat_before, payload, args.repeat, number),
+            best(passthrough_before, households, args.repeat, number),
+            best(stdlib_fast, payload, args.repeat, number),
+            best(fast, payload, args.repeat, number),
+        ]
+        per_row = [seconds / rows * 1e6 for seconds in results]
+        print(f"{rows:>6} {per_row[0]:>12.2f} {per_row[1]:>16.2f} {per_row[2]:>13.2f} {per_row[3]:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
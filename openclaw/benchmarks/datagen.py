@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Synthetic book generator for scaling tests.
+
+Produces households shaped like /api/transitions/{id} answers (list fields
+plus tasks, NIGO issues and accounts) with realistic proportions:
+
+    - about one advisor per 150 households, with uneven books: advisors
+      who joined early (low numbers) hold more of them
+    - statuses: 55% IN_PROGRESS, 25% COMPLETED, 12% AT_RISK, 8% NIGO
+    - 1-12 tasks per household, mostly open on active transitions and
+      closed on completed ones; NIGO households carry 1-4 issues, others
+      occasionally one
+    - 1-5 accounts, and a meeting in the next two weeks for ~15%
+
+Generation is deterministic: household N depends only on the seed and N,
+so the first 10,000 households of a 100,000 book are the 10,000 book.
+Task ids are derived from the household (see task_id_for) and every
+household has a first task, so load generators can pick real ones without
+reading the data.
+
+Usage:
+    python openclaw/benchmarks/datagen.py --households 100000 [--seed 1] --out book.json
+    python openclaw/benchmarks/stub_backend.py --dataset book.json
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+STATUS_WEIGHTS = {"IN_PROGRESS": 55, "COMPLETED": 25, "AT_RISK": 12, "NIGO": 8}
+HOUSEHOLDS_PER_ADVISOR = 150
+MAX_TASKS = 12
+
+# Fixed reference time so the same seed always produces the same dates
+EPOCH = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+FIRST_NAMES = [
+    "Avery", "Blake", "Carmen", "Dana", "Elliot", "Farah", "Gwen", "Hiro", "Imani", "Jonas",
+    "Keira", "Luis", "Mara", "Nikhil", "Olive", "Priya", "Quinn", "Rosa", "Sven", "Tariq",
+]
+LAST_NAMES = [
+    "Abbott", "Baker", "Chen", "Diaz", "Evans", "Fischer", "Garcia", "Haddad", "Ivanova", "Jensen",
+    "Kowalski", "Lopez", "Mensah", "Nguyen", "Okafor", "Patel", "Rossi", "Silva", "Tanaka", "Weber",
+]
+TASK_TITLES = [
+    "Collect signed transfer form", "Verify beneficiary designations", "Request cost basis",
+    "Open destination account", "Confirm ACAT initiation", "Review fee schedule",
+    "Schedule onboarding call", "Upload ID documents", "Reconcile cash positions",
+    "Send welcome packet", "Confirm RMD elections", "Close legacy account",
+]
+NIGO_REASONS = [
+    "Missing signature", "Name mismatch with custodian", "Stale medallion guarantee",
+    "Account number invalid", "Missing page", "Outdated form version",
+]
+ACCOUNT_TYPES = ["IRA", "ROTH_IRA", "BROKERAGE", "TRUST", "401K", "JOINT"]
+
+
+def task_id_for(household_id: int, index: int = 0) -> int:
+    """Id of a household's `index`-th task (ids are derived, so load generators can pick real ones)."""
+    return household_id * 100 + index
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def make_household(household_id: int, seed: int = 1) -> Dict:
+    """Household `household_id` of the book for `seed`."""
+    rng = random.Random(f"{seed}:{household_id}")
+    # Advisors on the books when this household arrived, skewed towards the early ones
+    advisors = -(-household_id // HOUSEHOLDS_PER_ADVISOR)
+    advisor = int(advisors * rng.random() ** 1.5)
+    status = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()))[0]
+    started = EPOCH - timedelta(days=rng.randrange(1, 180))
+
+    open_share = {"COMPLETED": 0.0, "AT_RISK": 0.8, "NIGO": 0.7}.get(status, 0.5)
+    tasks = []
+    for index in range(1 + min(int(rng.expovariate(1 / 3)), MAX_TASKS - 1)):
+        done = rng.random() >= open_share
+        tasks.append({
+            "id": task_id_for(household_id, index),
+            "title": rng.choice(TASK_TITLES),
+            "status": "COMPLETED" if done else "PENDING",
+            "due_date": _timestamp(started + timedelta(days=rng.randrange(7, 60))),
+        })
+
+    issue_count = rng.randint(1, 4) if status == "NIGO" else (1 if rng.random() < 0.05 else 0)
+    nigo_issues = [
+        {
+            "id": household_id * 10 + index,
+            "reason": rng.choice(NIGO_REASONS),
+            "document_id": f"doc-{household_id}-{index}",
+            "raised_at": _timestamp(started + timedelta(days=rng.randrange(1, 30))),
+        }
+        for index in range(issue_count)
+    ]
+    accounts = [
+        {
+            "id": household_id * 10 + index,
+            "type": rng.choice(ACCOUNT_TYPES),
+            "balance": round(rng.lognormvariate(11.5, 1.2), 2),
+        }
+        for index in range(rng.randint(1, 5))
+    ]
+    next_meeting = EPOCH + timedelta(hours=rng.randrange(1, 24 * 14)) if rng.random() < 0.15 else None
+
+    return {
+        "id": household_id,
+        "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} Household",
+        "advisor_id": f"adv-{advisor}",
+        "advisor_name": f"Advisor {advisor}",
+        "status": status,
+        "open_tasks_count": sum(task["status"] != "COMPLETED" for task in tasks),
+        "nigo_issues_count": len(nigo_issues),
+        "created_at": _timestamp(started),
+        "updated_at": _timestamp(started + timedelta(days=rng.randrange(0, 30))),
+        "next_meeting_at": _timestamp(next_meeting) if next_meeting else None,
+        "accounts": accounts,
+        "tasks": tasks,
+        "nigo_issues": nigo_issues,
+    }
+
+
+def iter_households(count: int, seed: int = 1) -> Iterator[Dict]:
+    """Households 1..count of the book for `seed`."""
+    for household_id in range(1, count + 1):
+        yield make_household(household_id, seed)
+
+
+def make_book(count: int, seed: int = 1) -> Dict[int, Dict]:
+    """Book of `count` household details keyed by id (ids start at 1)."""
+    return {household["id"]: household for household in iter_households(count, seed)}
+
+
+def load_book(path: str) -> Dict[int, Dict]:
+    """Read a book written by this script."""
+    with open(path) as f:
+        households: List[Dict] = json.load(f)["households"]
+    return {int(household["id"]): household for household in households}
+
+
+def describe(book: Dict[int, Dict]) -> Dict[str, float]:
+    """Shape of a book: counts used to check the generator's proportions."""
+    households = list(book.values())
+    statuses: Dict[str, int] = {}
+    for household in households:
+        statuses[household["status"]] = statuses.get(household["status"], 0) + 1
+    advisors: Dict[str, int] = {}
+    for household in households:
+        advisors[household["advisor_id"]] = advisors.get(household["advisor_id"], 0) + 1
+    return {
+        "households": len(households),
+        "advisors": len(advisors),
+        "largest_advisor_book": max(advisors.values(), default=0),
+        "tasks": sum(len(h["tasks"]) for h in households),
+        "open_tasks": sum(h["open_tasks_count"] for h in households),
+        "nigo_issues": sum(h["nigo_issues_count"] for h in households),
+        **{f"status_{status.lower()}": count for status, count in sorted(statuses.items())},
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--households", type=int, default=10000, help="book size")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write the book here as JSON (omit to only print its shape)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    book = make_book(args.households, args.seed)
+    elapsed = time.perf_counter() - started
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"seed": args.seed, "households": list(book.values())}, f)
+    for field, value in describe(book).items():
+        print(f"{field:>22}: {value}")
+    print(f"{'generated in':>22}: {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
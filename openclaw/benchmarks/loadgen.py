@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Load generator: throughput and latency percentiles for Clawdbot endpoints.
+
+Runs each scenario (the /chat intents and every passthrough endpoint) as a
+closed loop at several concurrency levels: N workers each send a request,
+wait for the answer and send the next, for --duration seconds after a
+--warmup. Reports requests/s, p50/p95/p99 and max latency, and errors
+(non-2xx or transport failures; 429/503 from admission control count too,
+so measure with CLAWDBOT_ADMISSION=false unless shedding is the point).
+
+Point it at a running server, or pass --spawn to start the stub backend
+(stub_backend.py) and clawdbot_server.py on free local ports for the run:
+
+    python openclaw/benchmarks/loadgen.py --spawn --backend-latency-ms 20 --concurrency 1,8,32
+
+Save a run with --json and compare a later one against it with --baseline;
+the deltas of requests/s and p95/p99 are printed next to each row.
+
+Usage:
+    python openclaw/benchmarks/loadgen.py [--url http://127.0.0.1:8080 | --spawn]
+        [--scenarios chat:*,GET /households] [--concurrency 1,8,32] [--duration 10]
+        [--warmup 2] [--households 1000] [--json out.json] [--baseline previous.json]
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(BENCH_DIR))
+sys.path.insert(0, REPO_ROOT)
+
+from datagen import task_id_for
+
+# A request: (method, path, query params, JSON body)
+RequestSpec = Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def _chat(message: str) -> Callable[[random.Random, int, int], RequestSpec]:
+    def build(rng: random.Random, worker: int, households: int) -> RequestSpec:
+        household_id = rng.randint(1, households)
+        text = message.format(
+            household_id=household_id,
+            task_id=task_id_for(household_id),
+            n=rng.randrange(1000),
+        )
+        return "POST", "/chat", None, {"message": text, "user_id": f"load-{worker}", "session_id": f"load-{worker}"}
+
+    return build
+
+
+def _household(rng: random.Random, households: int) -> int:
+    return rng.randint(1, households)
+
+
+SCENARIOS: Dict[str, Callable[[random.Random, int, int], RequestSpec]] = {
+    "chat:dashboard": _chat("what's the status of my book?"),
+    "chat:households": _chat("show my households"),
+    "chat:household": _chat("show household {household_id}"),
+    "chat:complete_task": _chat("complete task {task_id}"),
+    "chat:validate_document": _chat("validate document doc-{n}"),
+    "chat:meeting_pack": _chat("meeting pack for household {household_id}"),
+    "chat:eta": _chat("eta for workflow wf-{n}"),
+    "chat:help": _chat("hello"),
+    "GET /households": lambda rng, w, n: ("GET", "/households", None, None),
+    "GET /households?limit": lambda rng, w, n: ("GET", "/households", {"limit": 50}, None),
+    "GET /households/{id}": lambda rng, w, n: ("GET", f"/households/{_household(rng, n)}", None, None),
+    "POST /tasks/{id}/complete": lambda rng, w, n: (
+        "POST", f"/tasks/{task_id_for(_household(rng, n))}/complete", None,
+        {"task_id": 0, "note": "load test"},
+    ),
+    "POST /tasks/complete:batch": lambda rng, w, n: (
+        "POST", "/tasks/complete:batch", None,
+        {"tasks": [{"task_id": task_id_for(_household(rng, n))} for _ in range(10)]},
+    ),
+    "POST /workflows/create": lambda rng, w, n: (
+        "POST", "/workflows/create", None, {"workflow_type": "ACAT", "advisor_id": f"adv-{w}"},
+    ),
+    "GET /workflows/{id}": lambda rng, w, n: ("GET", f"/workflows/wf-{rng.randrange(1000)}", None, None),
+    "POST /documents/validate": lambda rng, w, n: (
+        "POST", "/documents/validate", None, {"document_id": f"doc-{rng.randrange(1000)}"},
+    ),
+    "GET /predictions/eta/{id}": lambda rng, w, n: ("GET", f"/predictions/eta/wf-{rng.randrange(1000)}", None, None),
+    "GET /households/{id}/meeting-pack": lambda rng, w, n: (
+        "GET", f"/households/{_household(rng, n)}/meeting-pack", {"wait": "true"}, None,
+    ),
+}
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, math.ceil(p / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    households: int,
+    seed: int,
+) -> Dict[str, Any]:
+    """Drive one scenario with `concurrency` closed-loop workers; returns its measurements."""
+    build = SCENARIOS[name]
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    started = time.perf_counter()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    async def worker(index: int) -> None:
+        rng = random.Random(f"{seed}-{name}-{index}")
+        while True:
+            method, path, params, body = build(rng, index, households)
+            sent = time.perf_counter()
+            if sent >= stop_at:
+                return
+            try:
+                response = await client.request(method, path, params=params, json=body)
+                outcome = str(response.status_code)
+            except httpx.HTTPError as e:
+                outcome = type(e).__name__
+            done = time.perf_counter()
+            if sent >= measure_from:
+                latencies.append(done - sent)
+                statuses[outcome] = statuses.get(outcome, 0) + 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - measure_from
+    latencies.sort()
+    errors = sum(count for outcome, count in statuses.items() if not outcome.startswith("2"))
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": statuses,
+        "rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1e3,
+        "p95_ms": percentile(latencies, 95) * 1e3,
+        "p99_ms": percentile(latencies, 99) * 1e3,
+        "max_ms": (latencies[-1] if latencies else float("nan")) * 1e3,
+    }
+
+
+def _delta(current: float, previous: Optional[float]) -> str:
+    if previous is None or not previous or math.isnan(previous) or math.isnan(current):
+        return ""
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+
+def print_header(baseline: Optional[Dict[Tuple[str, int], Dict]] = None) -> None:
+    header = (
+        f"{'scenario':<34} {'conc':>4} {'reqs':>7} {'errs':>5} {'req/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    )
+    if baseline is not None:
+        header += f" {'Δreq/s':>7} {'Δp95':>6} {'Δp99':>6}"
+    print(header)
+
+
+def print_row(row: Dict[str, Any], baseline: Optional[Dict[Tuple[str, int], Dict]] = None) -> None:
+    line = (
+        f"{row['scenario']:<34} {row['concurrency']:>4} {row['requests']:>7} {row['errors']:>5} "
+        f"{row['rps']:>9.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}"
+    )
+    if baseline is not None:
+        previous = baseline.get((row["scenario"], row["concurrency"]), {})
+        line += (
+            f" {_delta(row['rps'], previous.get('rps')):>7}"
+            f" {_delta(row['p95_ms'], previous.get('p95_ms')):>6}"
+            f" {_delta(row['p99_ms'], previous.get('p99_ms')):>6}"
+        )
+    print(line, flush=True)
+
+
+# ==================== Spawned servers ====================
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def spawn_servers(
+    households: int = 1000,
+    dataset: Optional[str] = None,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    server_log: str = os.devnull,
+    env: Optional[Dict[str, str]] = None,
+) -> Tuple[str, List[subprocess.Popen]]:
+    """
+    Start the stub backend and Clawdbot on free ports; returns (Clawdbot URL,
+    [backend process, Clawdbot process]). `env` adds Clawdbot settings.
+    """
+    backend_port, clawdbot_port = _free_port(), _free_port()
+    log = open(server_log, "ab")
+    book = ["--dataset", dataset] if dataset else ["--households", str(households)]
+    backend = subprocess.Popen(
+        [
+            sys.executable, os.path.join(BENCH_DIR, "stub_backend.py"),
+            "--port", str(backend_port),
+            *book,
+            "--latency-ms", str(latency_ms),
+            "--jitter-ms", str(jitter_ms),
+            "--error-rate", str(error_rate),
+        ],
+        stdout=log,
+        stderr=log,
+    )
+    env = {
+        **os.environ,
+        "BACKEND_URL": f"http://127.0.0.1:{backend_port}",
+        "CLAWDBOT_HOST": "127.0.0.1",
+        "CLAWDBOT_PORT": str(clawdbot_port),
+        "CLAWDBOT_ADMISSION": os.getenv("CLAWDBOT_ADMISSION", "false"),
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "warning"),
+        "PYTHONPATH": REPO_ROOT,
+        **(env or {}),
+    }
+    clawdbot = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_ROOT, "openclaw", "clawdbot_server.py")],
+        env=env,
+        stdout=log,
+        stderr=log,
+    )
+    log.close()
+    processes = [backend, clawdbot]
+    try:
+        _wait_ready(f"http://127.0.0.1:{backend_port}/stub/stats", timeout=120.0)
+        url = f"http://127.0.0.1:{clawdbot_port}"
+        _wait_ready(f"{url}/health")
+    except Exception:
+        stop_servers(processes)
+        raise
+    return url, processes
+
+
+def stop_servers(processes: List[subprocess.Popen]) -> None:
+    for process in reversed(processes):
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+# ==================== Main ====================
+
+def select_scenarios(patterns: str) -> List[str]:
+    selected = []
+    for pattern in (p.strip() for p in patterns.split(",")):
+        selected += [name for name in SCENARIOS if fnmatch.fnmatchcase(name, pattern) and name not in selected]
+    return selected
+
+
+async def run(args: argparse.Namespace, url: str) -> List[Dict[str, Any]]:
+    scenarios = select_scenarios(args.scenarios)
+    levels = [int(c) for c in args.concurrency.split(",")]
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    results = []
+    print_header(baseline)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout) as client:
+        for name in scenarios:
+            for concurrency in levels:
+                row = await run_scenario(
+                    client, name, concurrency, args.duration, args.warmup, args.households, args.seed
+                )
+                results.append(row)
+                print_row(row, baseline)
+    return results
+
+
+def load_baseline(path: str) -> Dict[Tuple[str, int], Dict]:
+    with open(path) as f:
+        return {(row["scenario"], row["concurrency"]): row for row in json.load(f)["results"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="Clawdbot server to load")
+    parser.add_argument("--spawn", action="store_true", help="start the stub backend and Clawdbot for the run")
+    parser.add_argument("--scenarios", default="*", help="comma-separated scenario names or patterns (--list)")
+    parser.add_argument("--list", action="store_true", help="list the scenarios and exit")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per scenario and level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each measurement")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--households", type=int, default=1000, help="book size (ids requests pick from)")
+    parser.add_argument("--dataset", help="--spawn: book written by datagen.py (its size must match --households)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the request mix")
+    parser.add_argument("--backend-latency-ms", type=float, default=20.0, help="--spawn: stub backend latency")
+    parser.add_argument("--backend-jitter-ms", type=float, default=5.0, help="--spawn: stub backend jitter")
+    parser.add_argument("--backend-error-rate", type=float, default=0.0, help="--spawn: stub backend error rate")
+    parser.add_argument("--server-log", default=os.devnull, help="--spawn: file for the servers' output")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results file of an earlier run to compare against")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(SCENARIOS))
+        return
+
+    processes: List[subprocess.Popen] = []
+    url = args.url
+    if args.spawn:
+        url, processes = spawn_servers(
+            households=args.households,
+            dataset=args.dataset,
+            latency_ms=args.backend_latency_ms,
+            jitter_ms=args.backend_jitter_ms,
+            error_rate=args.backend_error_rate,
+            server_log=args.server_log,
+        )
+    try:
+        results = asyncio.run(run(args, url))
+    finally:
+        stop_servers(processes)
+
+    if args.json:
+        meta = {
+            "url": url,
+            "spawned": args.spawn,
+            "households": args.households,
+            "duration": args.duration,
+            "backend_latency_ms": args.backend_latency_ms if args.spawn else None,
+            "python": platform.python_version(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        with open(args.json, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Stub Transition OS backend for load tests.
+
+Serves the routes TransitionOSClient calls from an in-memory book
+(generated by datagen.py, or loaded from a file it wrote), so
+clawdbot_server.py can be measured without a live backend:
+
+    GET  /api/transitions                 list (advisor_id/status filters; limit/offset pages)
+    GET  /api/transitions/{id}            household detail with tasks and NIGO issues
+    GET  /api/transitions:batch?ids=      several household details in one call
+    POST /api/tasks/{id}/complete         (honours Idempotency-Key)
+    POST /api/tasks/complete:batch
+    POST /workflows, GET /workflows/{id}
+    POST /documents/validate
+    GET  /predictions/eta/{workflow_id}
+    GET  /households/{id}/meeting-pack
+
+Reads answer If-None-Match with 304 like the real backend. Every request
+first waits for the injected latency (normal around --latency-ms with
+--jitter-ms spread; --route-latency overrides it per path pattern), then
+fails with --error-status at --error-rate.
+
+Usage:
+    python openclaw/benchmarks/stub_backend.py [--port 8000] [--households 1000 | --dataset book.json]
+        [--latency-ms 20] [--jitter-ms 5] [--route-latency "/api/transitions=80"]
+        [--error-rate 0.01] [--error-status 503] [--seed 1]
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+
+from openclaw.clawdbot_responses import FastJSONResponse
+
+from datagen import load_book, make_book
+
+def summary_row(household: Dict) -> Dict:
+    """The list form of a household (detail without tasks and issues)."""
+    return {k: v for k, v in household.items() if k not in ("tasks", "nigo_issues", "accounts")}
+
+
+class FaultInjector:
+    """Latency and error injection applied before every request."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        route_latency: Optional[List[Tuple[str, float]]] = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            latency_ms: Mean added latency
+            jitter_ms: Standard deviation of the added latency
+            route_latency: (path pattern, mean ms) pairs overriding latency_ms (fnmatch patterns)
+            error_rate: Fraction of requests answered with error_status
+            error_status: Status code of injected errors
+            seed: Seed for the injection RNG (None = unseeded)
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.route_latency = route_latency or []
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+
+    def delay(self, path: str) -> float:
+        mean = next((ms for pattern, ms in self.route_latency if fnmatch.fnmatchcase(path, pattern)), self.latency_ms)
+        return max(0.0, self._rng.gauss(mean, self.jitter_ms) if self.jitter_ms else mean) / 1000.0
+
+    async def __call__(self, request: Request, call_next):
+        self.requests += 1
+        delay = self.delay(request.url.path)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.errors += 1
+            return JSONResponse({"detail": "injected error"}, status_code=self.error_status)
+        return await call_next(request)
+
+
+def create_app(book: Dict[int, Dict], faults: Optional[FaultInjector] = None) -> FastAPI:
+    """Stub backend serving `book` (household details keyed by id)."""
+    app = FastAPI(title="Transition OS stub backend", default_response_class=FastJSONResponse)
+    faults = faults or FaultInjector()
+    app.middleware("http")(faults)
+    tasks = {task["id"]: (household_id, task) for household_id, h in book.items() for task in h["tasks"]}
+    completions: Dict[str, Dict] = {}
+    workflows: Dict[str, Dict] = {}
+    state = {"version": 0}
+
+    def not_modified(request: Request, etag: str) -> bool:
+        return request.headers.get("if-none-match") == etag
+
+    @app.get("/stub/stats")
+    async def stub_stats():
+        return {"households": len(book), "requests": faults.requests, "injected_errors": faults.errors}
+
+    @app.get("/api/transitions")
+    async def list_transitions(
+        request: Request,
+        advisor_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ):
+        etag = f'"{state["version"]}-{advisor_id}-{status}-{limit}-{offset}"'
+        if not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        rows = [
+            summary_row(h)
+            for h in book.values()
+            if (advisor_id is None or h["advisor_id"] == advisor_id) and (status is None or h["status"] == status)
+        ]
+        if limit is None:
+            return FastJSONResponse(rows, headers={"ETag": etag})
+        page = rows[offset:offset + limit]
+        return FastJSONResponse(
+            {"items": page, "total": len(rows), "has_more": offset + len(page) < len(rows)},
+            headers={"ETag": etag},
+        )
+
+    @app.get("/api/transitions:batch")
+    async def batch_transitions(ids: str):
+        wanted = [int(i) for i in ids.split(",") if i.strip().isdigit()]
+        return {"items": [book[i] for i in wanted if i in book]}
+
+    @app.get("/api/transitions/{household_id}")
+    async def get_transition(household_id: int, request: Request):
+        household = book.get(household_id)
+        if household is None:
+            raise HTTPException(status_code=404, detail="Household not found")
+        etag = f'"{household_id}-{household["updated_at"]}-{household["open_tasks_count"]}"'
+        if not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return FastJSONResponse(household, headers={"ETag": etag})
+
+    def complete(task_id: int, note: Optional[str]) -> Dict:
+        if task_id not in tasks:
+            raise HTTPException(status_code=404, detail="Task not found")
+        household_id, task = tasks[task_id]
+        if task["status"] != "COMPLETED":
+            task["status"] = "COMPLETED"
+            household = book[household_id]
+            household["open_tasks_count"] = max(household["open_tasks_count"] - 1, 0)
+            household["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            state["version"] += 1
+        return {"id": task_id, "household_id": household_id, "status": "COMPLETED", "note": note}
+
+    @app.post("/api/tasks/complete:batch")
+    async def complete_tasks_batch(payload: Dict[str, Any]):
+        results = []
+        for item in payload.get("tasks", []):
+            try:
+                results.append(complete(int(item["task_id"]), item.get("note")))
+            except HTTPException as e:
+                results.append({"id": item.get("task_id"), "error": e.detail})
+        return {"results": results}
+
+    @app.post("/api/tasks/{task_id}/complete")
+    async def complete_task(task_id: int, payload: Dict[str, Any], request: Request):
+        key = request.headers.get("idempotency-key")
+        if key is not None and key in completions:
+            return completions[key]
+        result = complete(task_id, payload.get("note"))
+        if key is not None:
+            completions[key] = result
+        return result
+
+    @app.post("/workflows")
+    async def create_workflow(payload: Dict[str, Any]):
+        workflow_id = f"wf-{len(workflows) + 1}"
+        workflows[workflow_id] = {
+            "id": workflow_id,
+            "workflow_type": payload.get("workflow_type"),
+            "advisor_id": payload.get("advisor_id"),
+            "metadata": payload.get("metadata") or {},
+            "status": "CREATED",
+        }
+        return workflows[workflow_id]
+
+    @app.get("/workflows/{workflow_id}")
+    async def get_workflow(workflow_id: str):
+        return workflows.get(workflow_id) or {"id": workflow_id, "status": "IN_PROGRESS", "steps_completed": 3}
+
+    @app.post("/documents/validate")
+    async def validate_document(payload: Dict[str, Any]):
+        document_id = str(payload.get("document_id"))
+        issues = [] if sum(map(ord, document_id)) % 4 else [{"field": "signature", "reason": "missing"}]
+        return {"document_id": document_id, "valid": not issues, "nigo_issues": issues}
+
+    @app.get("/predictions/eta/{workflow_id}")
+    async def eta(workflow_id: str):
+        return {"workflow_id": workflow_id, "eta_days": sum(map(ord, workflow_id)) % 30 + 1, "confidence": 0.8}
+
+    @app.get("/households/{household_id}/meeting-pack")
+    async def meeting_pack(household_id: int):
+        household = book.get(household_id)
+        if household is None:
+            raise HTTPException(status_code=404, detail="Household not found")
+        return {
+            "household_id": household_id,
+            "summary": f"{household['name']}: {household['open_tasks_count']} open tasks",
+            "open_tasks": [task for task in household["tasks"] if task["status"] != "COMPLETED"],
+            "nigo_issues": household["nigo_issues"],
+            "talking_points": ["Review beneficiary designations", "Confirm transfer timeline"],
+        }
+
+    return app
+
+
+def parse_route_latency(spec: str) -> List[Tuple[str, float]]:
+    """Parse "/api/transitions=80,/households/*=200" into [(pattern, ms), ...]."""
+    pairs = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        pattern, _, ms = item.rpartition("=")
+        pairs.append((pattern, float(ms)))
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--households", type=int, default=1000, help="size of the generated book")
+    parser.add_argument("--dataset", help="serve a book written by datagen.py instead of generating one")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the book and the fault injection")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mean latency added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="standard deviation of the added latency")
+    parser.add_argument("--route-latency", default="", help='per-route mean latency, e.g. "/api/transitions=80"')
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failed on purpose")
+    parser.add_argument("--error-status", type=int, default=503, help="status code of injected failures")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    faults = FaultInjector(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        route_latency=parse_route_latency(args.route_latency),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    book = load_book(args.dataset) if args.dataset else make_book(args.households, seed=args.seed)
+    app = create_app(book, faults)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", loop="auto", http="auto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Summarize a Clawdbot span file (CLAWDBOT_TRACE_FILE).
+
+Prints latency percentiles per span name (routes, chat stages, backend
+calls, JSON decoding), then the slowest requests as span trees, so a slow
+/chat can be attributed to routing, a backend call or serialization.
+
+Usage:
+    python openclaw/benchmarks/trace_report.py traces.jsonl [--slowest 5] [--name "POST /chat"]
+"""
+
+import argparse
+import json
+import math
+from collections import defaultdict
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    rank = max(1, math.ceil(p / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def load_spans(path: str) -> List[Dict]:
+    spans = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue  # a line cut short by a crash
+    return spans
+
+
+def print_tree(span: Dict, children: Dict[str, List[Dict]], depth: int = 0) -> None:
+    detail = span["attributes"].get("path") or span["attributes"].get("intent") or ""
+    error = f"  [{span['error']}]" if span.get("error") else ""
+    print(f"    {'  ' * depth}{span['duration_ms']:>9.2f} ms  {span['name']}  {detail}{error}")
+    for child in sorted(children.get(span["span_id"], []), key=lambda s: s["start"]):
+        print_tree(child, children, depth + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="JSON-lines span file")
+    parser.add_argument("--slowest", type=int, default=5, help="slowest requests to break down")
+    parser.add_argument("--name", help="only break down root spans with this name (e.g. \"POST /chat\")")
+    args = parser.parse_args()
+
+    spans = load_spans(args.path)
+    durations: Dict[str, List[float]] = defaultdict(list)
+    children: Dict[str, List[Dict]] = defaultdict(list)
+    span_ids = {span["span_id"] for span in spans}
+    roots = []
+    for span in spans:
+        durations[span["name"]].append(span["duration_ms"])
+        if span["parent_id"] in span_ids:
+            children[span["parent_id"]].append(span)
+        else:
+            roots.append(span)
+
+    print(f"{'span':<40} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'total s':>9}")
+    for name, values in sorted(durations.items(), key=lambda item: -sum(item[1])):
+        values.sort()
+        print(
+            f"{name:<40} {len(values):>7} {percentile(values, 50):>9.2f} {percentile(values, 95):>9.2f} "
+            f"{percentile(values, 99):>9.2f} {sum(values) / 1000:>9.2f}"
+        )
+
+    if args.name:
+        roots = [span for span in roots if span["name"] == args.name]
+    print(f"\nSlowest {min(args.slowest, len(roots))} request(s):")
+    for root in sorted(roots, key=lambda s: -s["duration_ms"])[:args.slowest]:
+        print(f"\n  request {root['request_id']}  trace {root['trace_id']}")
+        print_tree(root, children)
+
+
+if __name__ == "__main__":
+    main()
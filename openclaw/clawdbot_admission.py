@@ -0,0 +1,373 @@
+"""
+Admission Control for Clawdbot (EC2)
+
+Caps the work Clawdbot accepts so one noisy client cannot starve everyone
+else or flood the Transition OS backend:
+
+    - RateLimiter: a token bucket per user (the request's user_id, or the
+      client address when there is none). A user over their rate gets a
+      429 with Retry-After straight away.
+    - ConcurrencyLimiter: a global cap on requests being served. Requests
+      past the cap wait in a short queue (interactive ones ahead of bulk
+      ones); when the queue is full, or the wait would outlast the request's
+      deadline, the request is shed with a 503 instead of piling up.
+    - AdmissionMiddleware: applies both to every HTTP request; admit() does
+      the same for work arriving another way (messages on /chat/ws).
+
+Interactive routes (chat, single-household reads) get priority: bulk
+routes may only hold part of the in-flight slots and have a shorter queue,
+so a burst of batch work leaves room for people typing into the chat.
+"""
+
+import asyncio
+import fnmatch
+import json
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from openclaw.clawdbot_metrics import ADMISSION_DECISIONS, ADMISSION_QUEUE_WAIT
+from openclaw.clawdbot_resilience import remaining_time
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+USER_HEADER = b"x-user-id"
+
+# /chat bodies are small; anything bigger is keyed by client address instead of parsed
+MAX_PEEK_BYTES = 64 * 1024
+
+
+class Overloaded(Exception):
+    """The request was not admitted; `status` is 429 (rate limited) or 503 (shed)."""
+
+    def __init__(self, status: int, reason: str, retry_after: float):
+        super().__init__(f"Request rejected ({reason}); retry in {retry_after:.1f}s")
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+# ==================== Per-user Rate Limiting ====================
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second up to `burst`."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, cost: float = 1.0) -> float:
+        """Take `cost` tokens; returns 0 on success, else seconds until they would be available."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (cost - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token bucket per user key, keeping at most `max_keys` buckets (least recently used dropped)."""
+
+    def __init__(self, rate: float = 5.0, burst: float = 20.0, max_keys: int = 10000):
+        """
+        Args:
+            rate: Sustained requests per second allowed per user
+            burst: Requests a user may make back-to-back after being idle
+            max_keys: Buckets kept in memory; a dropped bucket restarts full
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.limited = 0
+
+    def check(self, key: str, cost: float = 1.0) -> None:
+        """Charge `key` for a request; raise Overloaded (429) if it is over its rate."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        wait = bucket.take(cost)
+        if wait > 0:
+            self.limited += 1
+            raise Overloaded(429, "rate_limited", wait)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tracked_users": len(self._buckets),
+            "rate_limited": self.limited,
+        }
+
+
+# ==================== Global Concurrency Limit ====================
+
+class ConcurrencyLimiter:
+    """Caps requests in flight, queueing a bounded number by priority and shedding the rest."""
+
+    def __init__(
+        self,
+        max_in_flight: int = 64,
+        max_queue: int = 128,
+        max_wait: float = 2.0,
+        bulk_share: float = 0.5,
+    ):
+        """
+        Args:
+            max_in_flight: Requests served concurrently
+            max_queue: Interactive requests allowed to wait for a slot
+            max_wait: Longest a request waits before it is shed (capped by its deadline)
+            bulk_share: Fraction of slots and of the queue bulk requests may use
+        """
+        self.max_in_flight = max_in_flight
+        self.max_wait = max_wait
+        self.limits = {INTERACTIVE: max_in_flight, BULK: max(1, int(max_in_flight * bulk_share))}
+        self.queue_limits = {INTERACTIVE: max_queue, BULK: int(max_queue * bulk_share)}
+        self.in_flight = {INTERACTIVE: 0, BULK: 0}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {INTERACTIVE: deque(), BULK: deque()}
+        self.shed = {INTERACTIVE: 0, BULK: 0}
+
+    def _total(self) -> int:
+        return self.in_flight[INTERACTIVE] + self.in_flight[BULK]
+
+    def _has_room(self, priority: str) -> bool:
+        return self._total() < self.max_in_flight and self.in_flight[priority] < self.limits[priority]
+
+    def queue_depth(self, priority: str) -> int:
+        return sum(1 for waiter in self._waiters[priority] if not waiter.done())
+
+    async def acquire(self, priority: str = INTERACTIVE) -> float:
+        """Wait for a slot; returns the seconds spent queued or raises Overloaded (503)."""
+        waiters = self._waiters[priority]
+        # Interactive requests never queue behind bulk ones; bulk ones also wait for queued interactive work
+        queued_ahead = self.queue_depth(INTERACTIVE) + (self.queue_depth(BULK) if priority == BULK else 0)
+        if self._has_room(priority) and not queued_ahead:
+            self.in_flight[priority] += 1
+            return 0.0
+
+        wait = self.max_wait
+        budget = remaining_time()
+        if budget is not None:
+            wait = min(wait, budget)
+        if wait <= 0 or self.queue_depth(priority) >= self.queue_limits[priority]:
+            self.shed[priority] += 1
+            raise Overloaded(503, "queue_full" if wait > 0 else "queue_timeout", 1.0)
+
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, wait)
+        except asyncio.TimeoutError:
+            self.shed[priority] += 1
+            raise Overloaded(503, "queue_timeout", 1.0)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the client went away
+                self.release(priority)
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    pass
+                # Bulk requests may have been held back only by this waiter
+                self._wake()
+        return time.monotonic() - start
+
+    def release(self, priority: str = INTERACTIVE) -> None:
+        """Free a slot and hand it to the next waiter (interactive first)."""
+        self.in_flight[priority] -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        for queued in (INTERACTIVE, BULK):
+            waiters = self._waiters[queued]
+            while waiters and self._has_room(queued):
+                waiter = waiters.popleft()
+                if waiter.done():
+                    continue
+                self.in_flight[queued] += 1
+                waiter.set_result(None)
+            if any(not w.done() for w in waiters):
+                # Keep bulk waiting behind interactive work that could not be placed
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": dict(self.in_flight),
+            "queued": {priority: self.queue_depth(priority) for priority in self._waiters},
+            "shed": dict(self.shed),
+        }
+
+
+# ==================== ASGI Middleware ====================
+
+class AdmissionMiddleware:
+    """ASGI middleware rate limiting each user and capping concurrent requests."""
+
+    def __init__(
+        self,
+        app,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[ConcurrencyLimiter] = None,
+        bulk_paths: Iterable[str] = (),
+        skip_paths: Iterable[str] = ("/health", "/metrics", "/stats"),
+        body_user_paths: Iterable[str] = ("/chat", "/chat/stream"),
+    ):
+        """
+        Args:
+            app: ASGI application
+            rate_limiter: Per-user token buckets (None = no rate limit)
+            concurrency: Global in-flight limit (None = unlimited)
+            bulk_paths: Routes served at bulk priority (fnmatch patterns, e.g. "/households/*/meeting-pack")
+            skip_paths: Routes never limited (health checks and monitoring)
+            body_user_paths: Routes whose JSON body carries the user_id (used when no X-User-Id header)
+        """
+        self.app = app
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.bulk_paths = [(p, any(c in p for c in "*?[")) for p in bulk_paths]
+        self.skip_paths = set(skip_paths)
+        self.body_user_paths = set(body_user_paths)
+
+    def priority(self, path: str) -> str:
+        for pattern, is_glob in self.bulk_paths:
+            if (fnmatch.fnmatchcase(path, pattern) if is_glob else path == pattern):
+                return BULK
+        return INTERACTIVE
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or scope.get("method") == "OPTIONS" or path in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        priority = self.priority(path)
+        key = None
+        if self.rate_limiter is not None:
+            key, receive = await self._user_key(scope, receive)
+        try:
+            await admit(key, priority, self.rate_limiter, self.concurrency)
+        except Overloaded as exc:
+            await _reject(send, exc)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if self.concurrency is not None:
+                self.concurrency.release(priority)
+
+    async def _user_key(self, scope, receive) -> Tuple[str, Any]:
+        """The caller's user_id (header, else JSON body on chat routes), else its address."""
+        for name, value in scope.get("headers", ()):
+            if name == USER_HEADER and value:
+                return client_key(value.decode("latin-1"), None), receive
+
+        if scope.get("path") in self.body_user_paths and scope.get("method") == "POST":
+            messages, body = await _peek_body(receive, MAX_PEEK_BYTES)
+            receive = _replay(messages, receive)
+            user_id = _json_user_id(body) if body is not None else None
+            if user_id:
+                return client_key(user_id, None), receive
+
+        return client_key(None, scope.get("client")), receive
+
+
+def client_key(user_id: Optional[str], client: Optional[Tuple[str, int]]) -> str:
+    """Rate-limit key: the user id when known, else the client address."""
+    if user_id:
+        return "user:" + user_id
+    return "ip:" + (client[0] if client else "unknown")
+
+
+async def admit(
+    key: Optional[str],
+    priority: str,
+    rate_limiter: Optional[RateLimiter],
+    concurrency: Optional[ConcurrencyLimiter],
+) -> None:
+    """
+    Charge `key` against its rate limit, then take an in-flight slot at `priority`
+    (release it with concurrency.release). Records the decision; raises Overloaded.
+    """
+    try:
+        if rate_limiter is not None and key is not None:
+            rate_limiter.check(key)
+        waited = await concurrency.acquire(priority) if concurrency is not None else 0.0
+    except Overloaded as exc:
+        ADMISSION_DECISIONS.labels(priority, exc.reason).inc()
+        raise
+    ADMISSION_DECISIONS.labels(priority, "queued" if waited else "admitted").inc()
+    ADMISSION_QUEUE_WAIT.labels(priority).observe(waited)
+
+
+async def _peek_body(receive, limit: int) -> Tuple[List[dict], Optional[bytes]]:
+    """Read the request body (up to `limit` bytes), keeping the messages so they can be replayed."""
+    messages: List[dict] = []
+    chunks: List[bytes] = []
+    size = 0
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            return messages, None
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            return messages, None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return messages, b"".join(chunks)
+
+
+def _replay(messages: List[dict], receive):
+    pending = deque(messages)
+
+    async def replay_receive():
+        if pending:
+            return pending.popleft()
+        return await receive()
+
+    return replay_receive
+
+
+def _json_user_id(body: bytes) -> Optional[str]:
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    user_id = payload.get("user_id") if isinstance(payload, dict) else None
+    return str(user_id) if user_id not in (None, "") else None
+
+
+async def _reject(send, exc: Overloaded) -> None:
+    body = json.dumps({"detail": str(exc), "reason": exc.reason}).encode()
+    retry_after = max(1, math.ceil(exc.retry_after)) if math.isfinite(exc.retry_after) else 60
+    await send({
+        "type": "http.response.start",
+        "status": exc.status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
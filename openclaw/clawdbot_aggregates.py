@@ -0,0 +1,240 @@
+"""
+Dashboard Aggregates for Clawdbot (EC2)
+
+Materialized household counts (per advisor and per status, plus open task and
+NIGO totals) so dashboard replies don't rescan the whole book on every chat
+message. The store is built once from a household snapshot and then kept up
+to date incrementally as Clawdbot writes or change events arrive.
+"""
+
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from openclaw.clawdbot_websocket import advisor_key
+
+
+class AggregateCounts:
+    """Running totals for one slice of the book (all households or one advisor)."""
+
+    __slots__ = ("households", "by_status", "open_tasks", "nigo_issues")
+
+    def __init__(self):
+        self.households = 0
+        self.by_status: Counter = Counter()
+        self.open_tasks = 0
+        self.nigo_issues = 0
+
+    def apply(self, status: Optional[str], open_tasks: int, nigo_issues: int, sign: int) -> None:
+        self.households += sign
+        self.by_status[status] += sign
+        if self.by_status[status] <= 0:
+            del self.by_status[status]
+        self.open_tasks += sign * open_tasks
+        self.nigo_issues += sign * nigo_issues
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_households": self.households,
+            "by_status": {str(status): count for status, count in self.by_status.items()},
+            "in_progress": self.by_status.get("IN_PROGRESS", 0),
+            "at_risk": self.by_status.get("AT_RISK", 0),
+            "open_tasks": self.open_tasks,
+            "nigo_issues": self.nigo_issues,
+        }
+
+
+# (advisor_id, status, open_tasks, nigo_issues) as last seen for a household
+HouseholdRow = Tuple[Optional[str], Optional[str], int, int]
+
+
+# Called as listener(household_id, advisor_id, previous_status, status) when a counted household changes status
+StatusListener = Callable[[Any, Optional[str], Optional[str], Optional[str]], None]
+
+
+def _row(household: Dict) -> HouseholdRow:
+    return (
+        household.get("advisor_id"),
+        household.get("status"),
+        int(household.get("open_tasks_count") or 0),
+        int(household.get("nigo_issues_count") or 0),
+    )
+
+
+class DashboardAggregates:
+    """
+    Incrementally maintained dashboard counts.
+
+    Every update is O(1): the store remembers each household's last counted
+    row, so an upsert subtracts the old contribution and adds the new one.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        """
+        Args:
+            ttl: Seconds the aggregates are trusted before being rebuilt from a
+                 fresh snapshot (a safety net for changes Clawdbot never saw)
+        """
+        self.ttl = ttl
+        self._rows: Dict[Any, HouseholdRow] = {}
+        self._total = AggregateCounts()
+        # Keyed by advisor_key(): the backend's ids and a caller's query string compare equal
+        self._by_advisor: Dict[Optional[str], AggregateCounts] = {}
+        self._source: Optional[Any] = None
+        self._built_at: Optional[float] = None
+        self._dirty = True
+        self._listeners: List[StatusListener] = []
+        self.rebuilds = 0
+        self.updates = 0
+
+    def add_status_listener(self, listener: StatusListener) -> None:
+        """Call `listener` whenever an update or rebuild changes a known household's status."""
+        self._listeners.append(listener)
+
+    def _status_changed(self, household_id: Any, previous: HouseholdRow, row: HouseholdRow) -> None:
+        if previous[1] != row[1]:
+            for listener in self._listeners:
+                listener(household_id, row[0], previous[1], row[1])
+
+    # ==================== Building ====================
+
+    def rebuild(self, households: Iterable[Dict]) -> None:
+        """Recompute every aggregate from a full household snapshot."""
+        previous_rows = self._rows if self._listeners else {}
+        self._rows = {}
+        self._total = AggregateCounts()
+        self._by_advisor.clear()
+        for household in households:
+            household_id = household.get("id")
+            row = _row(household)
+            self._add(household_id, row)
+            previous = previous_rows.get(household_id)
+            if previous is not None:
+                self._status_changed(household_id, previous, row)
+        self._source = households
+        self._built_at = time.monotonic()
+        self._dirty = False
+        self.rebuilds += 1
+
+    def sync(self, households: Iterable[Dict]) -> None:
+        """Rebuild from `households` unless it is the snapshot already counted."""
+        if households is not self._source or self._dirty:
+            self.rebuild(households)
+
+    def is_fresh(self) -> bool:
+        """True when the aggregates can answer without a new snapshot."""
+        if self._dirty or self._built_at is None:
+            return False
+        return time.monotonic() - self._built_at < self.ttl
+
+    def mark_stale(self) -> None:
+        """Force a rebuild on next use (e.g. after a change that can't be applied incrementally)."""
+        self._dirty = True
+
+    # ==================== Incremental Updates ====================
+
+    def upsert(self, household: Dict) -> Optional[str]:
+        """
+        Add or replace one household's contribution.
+        Returns the household's previous status (None if it was not counted).
+        """
+        household_id = household.get("id")
+        previous = self._rows.get(household_id)
+        row = _row(household)
+        if previous is not None:
+            self._remove(household_id, previous)
+        self._add(household_id, row)
+        self.updates += 1
+        if previous is not None:
+            self._status_changed(household_id, previous, row)
+        return previous[1] if previous is not None else None
+
+    def remove(self, household_id: Any) -> None:
+        """Drop a household from the aggregates."""
+        previous = self._rows.get(household_id)
+        if previous is not None:
+            self._remove(household_id, previous)
+            self.updates += 1
+
+    def task_completed(self, household_id: Optional[Any]) -> None:
+        """Account for one completed task; marks the store stale if the household is unknown."""
+        self.adjust_open_tasks(household_id, -1)
+
+    def adjust_open_tasks(self, household_id: Optional[Any], delta: int) -> None:
+        """Add `delta` to a household's open tasks; marks the store stale if the household is unknown."""
+        previous = self._rows.get(household_id) if household_id is not None else None
+        if previous is None:
+            self.mark_stale()
+            return
+        advisor_id, status, open_tasks, nigo_issues = previous
+        self._remove(household_id, previous)
+        self._add(household_id, (advisor_id, status, max(open_tasks + delta, 0), nigo_issues))
+        self.updates += 1
+
+    def patch(self, household: Dict) -> None:
+        """
+        Apply a household change event that may carry only the changed fields;
+        the rest come from the household's counted row. A new household with
+        fields missing can't be counted, so the store is marked stale instead.
+        """
+        household_id = household.get("id")
+        previous = self._rows.get(household_id)
+        if previous is not None:
+            advisor_id, status, open_tasks, nigo_issues = previous
+            household = {
+                "advisor_id": advisor_id,
+                "status": status,
+                "open_tasks_count": open_tasks,
+                "nigo_issues_count": nigo_issues,
+                **household,
+            }
+        elif not {"advisor_id", "status"} <= household.keys():
+            self.mark_stale()
+            return
+        self.upsert(household)
+
+    # ==================== Reading ====================
+
+    def summary(self, advisor_id: Optional[str] = None) -> Dict[str, Any]:
+        """Return dashboard counts for the whole book or for one advisor."""
+        if advisor_id is None:
+            counts = self._total
+        else:
+            counts = self._by_advisor.get(advisor_key(advisor_id)) or AggregateCounts()
+        return {"advisor_id": advisor_id, **counts.to_dict()}
+
+    def get_row(self, household_id: Any) -> Optional[HouseholdRow]:
+        """Return the last counted (advisor_id, status, open_tasks, nigo_issues) for a household."""
+        return self._rows.get(household_id)
+
+    def stats(self) -> Dict[str, Any]:
+        age = time.monotonic() - self._built_at if self._built_at is not None else None
+        return {
+            "households": len(self._rows),
+            "advisors": len(self._by_advisor),
+            "fresh": self.is_fresh(),
+            "age_seconds": round(age, 3) if age is not None else None,
+            "rebuilds": self.rebuilds,
+            "incremental_updates": self.updates,
+        }
+
+    def _add(self, household_id: Any, row: HouseholdRow) -> None:
+        advisor_id, status, open_tasks, nigo_issues = row
+        self._rows[household_id] = row
+        self._total.apply(status, open_tasks, nigo_issues, 1)
+        key = advisor_key(advisor_id)
+        advisor = self._by_advisor.get(key)
+        if advisor is None:
+            advisor = self._by_advisor[key] = AggregateCounts()
+        advisor.apply(status, open_tasks, nigo_issues, 1)
+
+    def _remove(self, household_id: Any, row: HouseholdRow) -> None:
+        advisor_id, status, open_tasks, nigo_issues = row
+        del self._rows[household_id]
+        self._total.apply(status, open_tasks, nigo_issues, -1)
+        key = advisor_key(advisor_id)
+        advisor = self._by_advisor.get(key)
+        if advisor is not None:
+            advisor.apply(status, open_tasks, nigo_issues, -1)
+            if advisor.households <= 0:
+                del self._by_advisor[key]
@@ -6,62 +6,595 @@ Transition OS backend. It provides a clean interface for all backend operations.
 """
 
 import os
+import time
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
 import httpx
 
+from openclaw.clawdbot_cache import FRESH, STALE, SharedCacheStore, TTLCache
+from openclaw.clawdbot_coalescing import BatchLoader, SingleFlight
+from openclaw.clawdbot_tracing import span, trace_headers
+from openclaw.clawdbot_metrics import (
+    BACKEND_BATCH_SIZE,
+    BACKEND_ERRORS,
+    BACKEND_REQUEST_LATENCY,
+    BACKEND_REQUESTS_IN_FLIGHT,
+    BACKEND_RETRIES,
+)
+from openclaw.clawdbot_resilience import (
+    BackendDeadlineExceeded,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    RetryPolicy,
+    is_transient,
+    remaining_time,
+)
+
 logger = logging.getLogger(__name__)
 
 
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Connection pool configuration (shared by every call made through one client)
+POOL_MAX_CONNECTIONS = int(os.getenv("CLAWDBOT_POOL_MAX_CONNECTIONS", "100"))
+POOL_MAX_KEEPALIVE = int(os.getenv("CLAWDBOT_POOL_MAX_KEEPALIVE", "20"))
+POOL_KEEPALIVE_EXPIRY = float(os.getenv("CLAWDBOT_POOL_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = _env_bool("CLAWDBOT_HTTP2")
+
+# Timeouts in seconds
+TIMEOUT_CONNECT = float(os.getenv("CLAWDBOT_TIMEOUT_CONNECT", "5"))
+TIMEOUT_READ = float(os.getenv("CLAWDBOT_TIMEOUT_READ", "30"))
+TIMEOUT_WRITE = float(os.getenv("CLAWDBOT_TIMEOUT_WRITE", "30"))
+TIMEOUT_POOL = float(os.getenv("CLAWDBOT_TIMEOUT_POOL", "5"))
+
+# Household read cache (TTL + stale-while-revalidate, LRU with a memory cap)
+CACHE_ENABLED = _env_bool("CLAWDBOT_CACHE_ENABLED", True)
+CACHE_TTL = float(os.getenv("CLAWDBOT_CACHE_TTL", "30"))
+CACHE_STALE_TTL = float(os.getenv("CLAWDBOT_CACHE_STALE_TTL", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("CLAWDBOT_CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("CLAWDBOT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# SQLite file shared by the workers on one host (unset = per-process caches only)
+SHARED_CACHE_PATH = os.getenv("CLAWDBOT_SHARED_CACHE_PATH")
+
+# Retries (idempotent GETs only) and per-endpoint circuit breakers
+RETRY_ATTEMPTS = int(os.getenv("CLAWDBOT_RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("CLAWDBOT_RETRY_BASE_DELAY", "0.1"))
+RETRY_MAX_DELAY = float(os.getenv("CLAWDBOT_RETRY_MAX_DELAY", "2"))
+BREAKER_FAILURES = int(os.getenv("CLAWDBOT_BREAKER_FAILURES", "5"))
+BREAKER_RESET = float(os.getenv("CLAWDBOT_BREAKER_RESET", "30"))
+
+# Rows requested per page when walking the household list
+HOUSEHOLD_PAGE_SIZE = int(os.getenv("CLAWDBOT_HOUSEHOLD_PAGE_SIZE", "100"))
+
+# Batch task completion: fan-out width, and whether the backend has a bulk route
+BATCH_CONCURRENCY = int(os.getenv("CLAWDBOT_BATCH_CONCURRENCY", "8"))
+BULK_TASK_COMPLETE = _env_bool("BACKEND_BULK_TASK_COMPLETE")
+
+# get_household micro-batching: lookups arriving within the window share one
+# backend call (GET /api/transitions:batch when the backend has it); 0 disables
+HOUSEHOLD_BATCH_WINDOW = float(os.getenv("CLAWDBOT_HOUSEHOLD_BATCH_WINDOW_MS", "2")) / 1000.0
+HOUSEHOLD_BATCH_MAX = int(os.getenv("CLAWDBOT_HOUSEHOLD_BATCH_MAX", "100"))
+BULK_HOUSEHOLD_GET = _env_bool("BACKEND_BULK_HOUSEHOLD_GET")
+
+
+def _patch_rows(
+    rows: List[Dict], household: Dict, advisor_id: Optional[str], status: Optional[str], deleted: bool
+) -> Optional[List[Dict]]:
+    """
+    Return `rows` (a list cached for the advisor/status filters) with
+    `household` merged in, appended, or removed; None if it can't be decided.
+    """
+    household_id = str(household["id"])
+    index = next(
+        (i for i, row in enumerate(rows) if isinstance(row, dict) and str(row.get("id")) == household_id), None
+    )
+    if deleted:
+        return rows if index is None else rows[:index] + rows[index + 1:]
+    row = {**rows[index], **household} if index is not None else household
+    filters = (("advisor_id", advisor_id), ("status", status))
+    if any(wanted is not None and field not in row for field, wanted in filters):
+        return None
+    keep = all(wanted is None or str(row[field]) == str(wanted) for field, wanted in filters)
+    if index is None:
+        if not keep:
+            return rows
+        # A partial update can't stand in for a row the list doesn't have yet
+        if rows and isinstance(rows[0], dict) and not rows[0].keys() <= row.keys():
+            return None
+        return rows + [row]
+    return rows[:index] + ([row] if keep else []) + rows[index + 1:]
+
+
 class TransitionOSClient:
     """
     Client for interacting with the Transition OS backend API.
     This is used by Clawdbot to read/write data through the backend (not directly to DB).
     """
 
-    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[TTLCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
         """
         Initialize the client.
         
         Args:
             base_url: The backend API URL (e.g., "http://localhost:8000" or "http://54.221.139.68:8000")
             api_key: Optional API key for authentication
+            limits: Connection pool limits (defaults to CLAWDBOT_POOL_* env vars)
+            timeout: Request timeouts (defaults to CLAWDBOT_TIMEOUT_* env vars)
+            http2: Enable HTTP/2 (defaults to CLAWDBOT_HTTP2; needs the `h2` package)
+            transport: Optional custom transport (e.g. httpx.MockTransport)
+            cache: Household read cache (defaults to CLAWDBOT_CACHE_* env vars; None if disabled)
+            retry_policy: Retry policy for idempotent GETs (defaults to CLAWDBOT_RETRY_* env vars)
         """
         self.base_url = base_url or os.getenv("BACKEND_URL", "http://localhost:8000")
         self.api_key = api_key or os.getenv("BACKEND_API_KEY")
         self.api_v1 = f"{self.base_url}/api"
+
+        self.limits = limits or httpx.Limits(
+            max_connections=POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=POOL_MAX_KEEPALIVE,
+            keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = timeout or httpx.Timeout(
+            connect=TIMEOUT_CONNECT,
+            read=TIMEOUT_READ,
+            write=TIMEOUT_WRITE,
+            pool=TIMEOUT_POOL,
+        )
+        self.http2 = HTTP2_ENABLED if http2 is None else http2
+        if self.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+                self.http2 = False
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._requests_total = 0
+        self._in_flight = 0
+
+        if cache is None and CACHE_ENABLED:
+            cache = TTLCache(
+                ttl=CACHE_TTL,
+                stale_ttl=CACHE_STALE_TTL,
+                max_entries=CACHE_MAX_ENTRIES,
+                max_bytes=CACHE_MAX_BYTES,
+                shared=SharedCacheStore(SHARED_CACHE_PATH, namespace="households") if SHARED_CACHE_PATH else None,
+            )
+        self.cache = cache
+        self._refreshes: Dict[Hashable, asyncio.Task] = {}
+        self._refresh_failures = 0
+        self._flights = SingleFlight()
+        self.bulk_task_complete = BULK_TASK_COMPLETE
+        self.bulk_household_get = BULK_HOUSEHOLD_GET
+        self._household_loader = (
+            BatchLoader(self._load_households, window=HOUSEHOLD_BATCH_WINDOW, max_batch=HOUSEHOLD_BATCH_MAX)
+            if HOUSEHOLD_BATCH_WINDOW > 0
+            else None
+        )
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=RETRY_ATTEMPTS,
+            base_delay=RETRY_BASE_DELAY,
+            max_delay=RETRY_MAX_DELAY,
+        )
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stale_fallbacks = 0
+        self._not_modified = 0
         
         logger.info(f"TransitionOSClient initialized with backend: {self.base_url}")
 
+    # ==================== Connection Pool ====================
+
+    async def open(self) -> None:
+        """Open the shared connection pool (called from the server lifespan)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+                transport=self._transport,
+            )
+            logger.info(
+                f"Backend connection pool opened (max_connections={self.limits.max_connections}, "
+                f"keepalive={self.limits.max_keepalive_connections}, http2={self.http2})"
+            )
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool."""
+        for task in list(self._refreshes.values()):
+            task.cancel()
+        self._refreshes.clear()
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Backend connection pool closed")
+        self._client = None
+
+    async def __aenter__(self) -> "TransitionOSClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled client, opening it lazily if the lifespan did not."""
+        if self._client is None or self._client.is_closed:
+            await self.open()
+        return self._client
+
+    async def _request(
+        self, method: str, url: str, operation: str = "request", raw: bool = False, **kwargs
+    ) -> Any:
+        """
+        Send a request over the shared pool and return the decoded JSON body
+        (or the httpx.Response itself when `raw` is set).
+
+        `operation` names the client method; it selects the circuit breaker and
+        labels metrics. GETs are retried on transient failures with jittered
+        backoff, within the deadline of the incoming request being served.
+        """
+        client = await self._get_client()
+        breaker = self._breaker(operation)
+        attempts = self.retry_policy.max_attempts if method == "GET" else 1
+        start = time.perf_counter()
+        self._requests_total += 1
+        self._in_flight += 1
+        try:
+            for attempt in range(attempts):
+                breaker.before_call()
+                try:
+                    result = await self._send(
+                        client, method, url, raw=raw, operation=operation, attempt=attempt, **kwargs
+                    )
+                except DeadlineExceeded as e:
+                    # A backend too slow for the budget is failing; a budget spent elsewhere decides nothing
+                    if isinstance(e, BackendDeadlineExceeded):
+                        breaker.record_failure()
+                    else:
+                        breaker.abandon()
+                    raise
+                except Exception as e:
+                    if is_transient(e):
+                        breaker.record_failure()
+                    else:
+                        breaker.release()
+                    if attempt + 1 >= attempts or not is_transient(e):
+                        raise
+                    delay = self.retry_policy.backoff(attempt)
+                    remaining = remaining_time()
+                    if remaining is not None and remaining <= delay:
+                        raise
+                    BACKEND_RETRIES.labels(operation).inc()
+                    logger.info(f"Retrying {operation} in {delay:.2f}s after: {e}")
+                    await asyncio.sleep(delay)
+                except BaseException:
+                    breaker.abandon()
+                    raise
+                else:
+                    breaker.record_success()
+                    return result
+        except httpx.HTTPStatusError as e:
+            BACKEND_ERRORS.labels(operation, f"http_{e.response.status_code}").inc()
+            raise
+        except httpx.TimeoutException:
+            BACKEND_ERRORS.labels(operation, "timeout").inc()
+            raise
+        except httpx.TransportError:
+            BACKEND_ERRORS.labels(operation, "transport").inc()
+            raise
+        except CircuitOpenError:
+            BACKEND_ERRORS.labels(operation, "circuit_open").inc()
+            raise
+        except DeadlineExceeded:
+            BACKEND_ERRORS.labels(operation, "deadline").inc()
+            raise
+        except ValueError:
+            BACKEND_ERRORS.labels(operation, "decode").inc()
+            raise
+        finally:
+            self._in_flight -= 1
+            BACKEND_REQUEST_LATENCY.labels(operation).observe(time.perf_counter() - start)
+
+    async def _send(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        raw: bool = False,
+        operation: str = "request",
+        attempt: int = 0,
+        **kwargs,
+    ) -> Any:
+        """
+        One attempt, bounded by the remaining deadline (which is also passed
+        downstream) and traced as a span the backend sees as its parent.
+        """
+        with span(f"backend {operation}", method=method, path=httpx.URL(url).path, attempt=attempt) as call:
+            response = await self._exchange(client, method, url, **kwargs)
+            if call is not None:
+                call.set(status_code=response.status_code)
+        if raw and response.status_code == 304:
+            return response  # conditional GET: the caller's cached copy is current
+        response.raise_for_status()
+        if raw:
+            return response
+        with span(f"decode {operation}", bytes=len(response.content)):
+            return response.json()
+
+    async def _exchange(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send the request with this client's headers; returns the response whatever its status."""
+        headers = self._headers()
+        headers.update(kwargs.pop("headers", None) or {})
+        remaining = remaining_time()
+        if remaining is None:
+            with BACKEND_REQUESTS_IN_FLIGHT.track_inprogress():
+                response = await client.request(method, url, headers=headers, **kwargs)
+        else:
+            if remaining <= 0:
+                raise DeadlineExceeded(f"Deadline exceeded before calling {url}")
+            headers["X-Request-Timeout-Ms"] = str(int(remaining * 1000))
+            try:
+                with BACKEND_REQUESTS_IN_FLIGHT.track_inprogress():
+                    response = await asyncio.wait_for(
+                        client.request(method, url, headers=headers, **kwargs), timeout=remaining
+                    )
+            except asyncio.TimeoutError:
+                raise BackendDeadlineExceeded(f"Deadline exceeded waiting for {url}") from None
+        return response
+
+    def _breaker(self, operation: str) -> CircuitBreaker:
+        breaker = self._breakers.get(operation)
+        if breaker is None:
+            breaker = self._breakers[operation] = CircuitBreaker(
+                operation, failure_threshold=BREAKER_FAILURES, reset_timeout=BREAKER_RESET
+            )
+        return breaker
+
+    def breaker_stats(self) -> Dict[str, Any]:
+        """Return circuit breaker state per backend endpoint."""
+        return {operation: breaker.stats() for operation, breaker in self._breakers.items()}
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool statistics for sizing the pool."""
+        stats: Dict[str, Any] = {
+            "open": self._client is not None and not self._client.is_closed,
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "requests_total": self._requests_total,
+            "in_flight": self._in_flight,
+            "connections": 0,
+            "idle_connections": 0,
+            "active_connections": 0,
+        }
+        # httpcore does not expose a public stats API; inspect the pool defensively.
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", None) or [])
+        idle = 0
+        for connection in connections:
+            try:
+                if connection.is_idle():
+                    idle += 1
+            except Exception:
+                pass
+        stats["connections"] = len(connections)
+        stats["idle_connections"] = idle
+        stats["active_connections"] = len(connections) - idle
+        return stats
+
     def _headers(self) -> Dict[str, str]:
-        """Get request headers."""
-        headers = {"Content-Type": "application/json"}
+        """Get request headers (including the request ID and trace context of the request being served)."""
+        headers = {"Content-Type": "application/json", **trace_headers()}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
         return headers
 
+    # ==================== Cache & Coalescing ====================
+
+    async def _coalesced_get(
+        self, key: Hashable, url: str, params: Optional[Dict] = None, operation: str = "request"
+    ) -> Any:
+        """Idempotent GET shared by every concurrent caller asking for the same key."""
+        return await self._flights.do(
+            key,
+            lambda: self._request("GET", url, params=params, operation=operation),
+            on_timeout=self._breaker(operation).record_failure,
+        )
+
+    async def _conditional_get(
+        self, key: Hashable, url: str, params: Optional[Dict] = None, operation: str = "request"
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        Coalesced GET that revalidates the cached entry for `key` with
+        If-None-Match. Returns (value, etag); on 304 the cached value is reused
+        without transferring or decoding the body again.
+        """
+        async def fetch() -> Tuple[Any, Optional[str]]:
+            etag = self.cache.etag(key) if self.cache is not None else None
+            headers = {"If-None-Match": etag} if etag else None
+            response = await self._request(
+                "GET", url, params=params, operation=operation, raw=True, headers=headers
+            )
+            if response.status_code == 304:
+                cached = self.cache.peek(key) if self.cache is not None else None
+                if cached is not None:
+                    self._not_modified += 1
+                    return cached, etag
+                # Entry evicted while we asked; fetch the body unconditionally
+                response = await self._request("GET", url, params=params, operation=operation, raw=True)
+            try:
+                with span(f"decode {operation}", bytes=len(response.content)):
+                    value = response.json()
+            except ValueError:
+                BACKEND_ERRORS.labels(operation, "decode").inc()
+                raise
+            return value, response.headers.get("etag")
+
+        return await self._flights.do(key, fetch, on_timeout=self._breaker(operation).record_failure)
+
+    async def _cached(
+        self, key: Hashable, loader: Callable[[], Awaitable[Tuple[Any, Optional[str]]]]
+    ) -> Any:
+        """
+        Serve `key` from the cache. Fresh entries are returned directly; stale
+        entries are returned immediately while a background refresh runs.
+        `loader` returns (value, etag).
+        """
+        if self.cache is None:
+            value, _ = await loader()
+            return value
+
+        value, state = self.cache.lookup(key)
+        if state == FRESH:
+            return value
+        if state == STALE:
+            self._schedule_refresh(key, loader)
+            return value
+
+        generation = self.cache.generation
+        try:
+            value, etag = await loader()
+        except (CircuitOpenError, DeadlineExceeded, httpx.TransportError, httpx.HTTPStatusError) as e:
+            # Backend unavailable: an expired entry beats an error
+            if isinstance(e, httpx.HTTPStatusError) and not is_transient(e):
+                raise
+            fallback = self.cache.peek(key)
+            if fallback is None:
+                raise
+            self._stale_fallbacks += 1
+            logger.warning(f"Serving expired cache entry for {key}: {e}")
+            return fallback
+        self.cache.set(key, value, generation=generation, etag=etag)
+        return value
+
+    def _schedule_refresh(
+        self, key: Hashable, loader: Callable[[], Awaitable[Tuple[Any, Optional[str]]]]
+    ) -> None:
+        """Start a background refresh for `key` unless one is already running."""
+        if key in self._refreshes:
+            return
+
+        async def refresh() -> None:
+            generation = self.cache.generation
+            try:
+                value, etag = await loader()
+                self.cache.set(key, value, generation=generation, etag=etag)
+            except CircuitOpenError:
+                self._refresh_failures += 1
+            except Exception as e:
+                self._refresh_failures += 1
+                logger.warning(f"Background cache refresh failed for {key}: {e}")
+            finally:
+                self._refreshes.pop(key, None)
+
+        self._refreshes[key] = asyncio.create_task(refresh())
+
+    def invalidate_households(self, household_id: Optional[int] = None) -> None:
+        """
+        Invalidate cached household lists, plus one household's detail (or
+        every household's detail when the affected household is unknown).
+        """
+        if household_id is None:
+            matches = lambda key: key[0] in ("households", "household")
+        else:
+            household_key = ("household", int(household_id))
+            matches = lambda key: key[0] == "households" or key == household_key
+        # Reads already in flight may predate the write; don't hand them to new callers
+        self._flights.forget_where(matches)
+        if self.cache is not None:
+            self.cache.invalidate_where(matches)
+
+    def apply_household_change(self, household: Dict, deleted: bool = False) -> None:
+        """
+        Apply a pushed household change to the cache without refetching.
+
+        Cached full lists (advisor/status filtered) get the household's row
+        merged in, added or removed according to their filters; pages and the
+        household's detail are dropped, as are lists the row can't be placed in
+        (a partial update of a household the list doesn't hold).
+        """
+        household_key = ("household", int(household["id"]))
+        affected = lambda key: key[0] == "households" or key == household_key
+        self._flights.forget_where(affected)
+        if self.cache is None:
+            return
+        patched: Dict[Hashable, List[Dict]] = {}
+        for key in self.cache.keys():
+            if key[0] != "households" or len(key) != 3:
+                continue
+            rows = self.cache.peek(key)
+            if isinstance(rows, list):
+                rows = _patch_rows(rows, household, key[1], key[2], deleted)
+                if rows is not None:
+                    patched[key] = rows
+        self.cache.invalidate_where(lambda key: affected(key) and key not in patched)
+        for key, rows in patched.items():
+            self.cache.replace(key, rows)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return cache hit/miss counters and memory usage."""
+        if self.cache is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            **self.cache.stats(),
+            "refreshes_in_flight": len(self._refreshes),
+            "refresh_failures": self._refresh_failures,
+            "stale_fallbacks": self._stale_fallbacks,
+            "not_modified": self._not_modified,
+        }
+
+    def coalescing_stats(self) -> Dict[str, Any]:
+        """Return single-flight counters (followers = backend calls saved)."""
+        return self._flights.stats()
+
+    def batching_stats(self) -> Dict[str, Any]:
+        """Return get_household batching counters."""
+        if self._household_loader is None:
+            return {"enabled": False}
+        return {"enabled": True, "bulk_route": self.bulk_household_get, **self._household_loader.stats()}
+
     # ==================== Workflows ====================
 
     async def create_workflow(self, workflow_type: str, advisor_id: str, metadata: Optional[Dict] = None) -> Dict:
         """Create a new workflow for an advisor."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/workflows",
-                json={"workflow_type": workflow_type, "advisor_id": advisor_id, "metadata": metadata or {}},
-                headers=self._headers(),
-            )
-            response.raise_for_status()
-            return response.json()
+        result = await self._request(
+            "POST",
+            f"{self.base_url}/workflows",
+            json={"workflow_type": workflow_type, "advisor_id": advisor_id, "metadata": metadata or {}},
+            operation="create_workflow",
+        )
+        # A new workflow can add a transition to the advisor's book
+        self._flights.forget_where(lambda key: key[0] == "households")
+        if self.cache is not None:
+            self.cache.invalidate_where(lambda key: key[0] == "households")
+        return result
 
     async def get_workflow(self, workflow_id: str) -> Dict:
         """Get workflow dashboard/status."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/workflows/{workflow_id}",
-                headers=self._headers(),
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._coalesced_get(
+            ("workflow", workflow_id),
+            f"{self.base_url}/workflows/{workflow_id}",
+            operation="get_workflow",
+        )
 
     # ==================== Households / Transitions ====================
 
@@ -75,75 +608,325 @@ class TransitionOSClient:
         if status:
             params["status"] = status
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_v1}/transitions",
-                params=params,
-                headers=self._headers(),
+        key = ("households", advisor_id, status)
+        return await self._cached(
+            key,
+            lambda: self._conditional_get(
+                key, f"{self.api_v1}/transitions", params=params, operation="list_households"
+            ),
+        )
+
+    async def iter_households(
+        self,
+        advisor_id: Optional[str] = None,
+        status: Optional[str] = None,
+        offset: int = 0,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict]:
+        """
+        Yield households one page at a time, starting at `offset`.
+
+        Pages are requested with limit/offset, or with the backend's cursor once
+        a page returns one ({"items": [...], "next_cursor": ...}). Pages are
+        fetched lazily, so a caller that stops early never loads the rest.
+        """
+        page_size = page_size or HOUSEHOLD_PAGE_SIZE
+
+        # The whole book is already cached: page through it without a backend call
+        if self.cache is not None:
+            households, state = self.cache.lookup(("households", advisor_id, status))
+            if state == FRESH:
+                for household in households[offset:]:
+                    yield household
+                return
+
+        cursor = None
+        by_cursor = False
+        first_id = None
+        while True:
+            items, cursor, has_more = await self._households_page(
+                advisor_id, status, page_size, offset, cursor
             )
-            response.raise_for_status()
-            return response.json()
+            if len(items) > page_size:
+                # Backend ignored the paging parameters and sent the whole list
+                for household in items[offset:]:
+                    yield household
+                return
+            if items and first_id is not None and items[0].get("id") == first_id:
+                # ...or sent it again: the book fits in one page and we have seen all of it
+                return
+            if items and first_id is None:
+                first_id = items[0].get("id")
+            for household in items:
+                yield household
+            if has_more is False or (has_more is None and len(items) < page_size):
+                return
+            if cursor is None and by_cursor:
+                return
+            by_cursor = cursor is not None
+            offset += len(items)
+            if not items:
+                return
+
+    async def list_households_page(
+        self,
+        limit: int,
+        offset: int = 0,
+        advisor_id: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[Dict]:
+        """Return at most `limit` households from `offset`, fetching only the pages that cover them."""
+        households: List[Dict] = []
+        if limit <= 0:
+            return households
+        async for household in self.iter_households(
+            advisor_id, status, offset=offset, page_size=min(limit, HOUSEHOLD_PAGE_SIZE)
+        ):
+            households.append(household)
+            if len(households) >= limit:
+                break
+        return households
+
+    async def _households_page(
+        self,
+        advisor_id: Optional[str],
+        status: Optional[str],
+        limit: int,
+        offset: int,
+        cursor: Optional[str],
+    ) -> Tuple[List[Dict], Optional[str], Optional[bool]]:
+        """
+        Fetch one page of households. Returns (items, next_cursor, has_more);
+        has_more is None when the backend sent a bare list and did not say.
+        """
+        params: Dict[str, Any] = {"limit": limit}
+        if cursor is not None:
+            params["cursor"] = cursor
+        else:
+            params["offset"] = offset
+        if advisor_id:
+            params["advisor_id"] = advisor_id
+        if status:
+            params["status"] = status
+
+        # Same "households" prefix as the full list, so writes invalidate pages too
+        key = ("households", advisor_id, status, cursor if cursor is not None else offset, limit)
+        page = await self._cached(
+            key,
+            lambda: self._conditional_get(
+                key, f"{self.api_v1}/transitions", params=params, operation="list_households_page"
+            ),
+        )
+        if isinstance(page, list):
+            return page, None, None
+        if isinstance(page, dict):
+            items = next(
+                (page[field] for field in ("items", "results", "data") if isinstance(page.get(field), list)),
+                [],
+            )
+            next_cursor = page.get("next_cursor")
+            has_more = page.get("has_more")
+            if next_cursor:
+                has_more = True
+            elif has_more is None and isinstance(page.get("total"), int):
+                has_more = offset + len(items) < page["total"]
+            return items, next_cursor, None if has_more is None else bool(has_more)
+        return [], None, False
 
     async def get_household(self, household_id: int) -> Dict:
-        """Get detailed information about a specific household."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_v1}/transitions/{household_id}",
-                headers=self._headers(),
+        """
+        Get detailed information about a specific household.
+        Cache misses made concurrently by different requests are batched.
+        """
+        household_id = int(household_id)
+        if self._household_loader is None:
+            return await self._cached(("household", household_id), lambda: self._fetch_household(household_id))
+        return await self._cached(
+            ("household", household_id), lambda: self._household_loader.load(household_id)
+        )
+
+    async def _fetch_household(self, household_id: int) -> Tuple[Any, Optional[str]]:
+        """One household by its own route (revalidated with If-None-Match); returns (value, etag)."""
+        return await self._conditional_get(
+            ("household", household_id), f"{self.api_v1}/transitions/{household_id}", operation="get_household"
+        )
+
+    async def _load_households(self, household_ids: List[int]) -> Dict[int, Any]:
+        """
+        BatchLoader batch function: (value, etag) or an exception per household.
+
+        Uses the backend bulk route when BACKEND_BULK_HOUSEHOLD_GET is set
+        (falling back if the backend answers 404/405), otherwise fetches each
+        household with at most CLAWDBOT_BATCH_CONCURRENCY calls in flight.
+        """
+        BACKEND_BATCH_SIZE.labels("get_household").observe(len(household_ids))
+        if self.bulk_household_get and len(household_ids) > 1:
+            try:
+                return await self._get_households_bulk(household_ids)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in (404, 405):
+                    raise
+                logger.warning("Backend has no bulk household route; falling back to fan-out")
+                self.bulk_household_get = False
+
+        semaphore = asyncio.Semaphore(max(1, BATCH_CONCURRENCY))
+
+        async def fetch_one(household_id: int) -> Tuple[int, Any]:
+            async with semaphore:
+                try:
+                    return household_id, await self._fetch_household(household_id)
+                except Exception as e:
+                    return household_id, e
+
+        return dict(await asyncio.gather(*(fetch_one(household_id) for household_id in household_ids)))
+
+    async def _get_households_bulk(self, household_ids: List[int]) -> Dict[int, Any]:
+        """
+        One backend call for many households: GET /api/transitions:batch?ids=1,2,3
+        answering a list (or {"items": [...]}) of household detail objects.
+        Households missing from the answer are fetched by their own route.
+        """
+        payload = await self._request(
+            "GET",
+            f"{self.api_v1}/transitions:batch",
+            params={"ids": ",".join(str(household_id) for household_id in household_ids)},
+            operation="get_households_bulk",
+        )
+        items = payload
+        if isinstance(payload, dict):
+            items = next((payload[k] for k in ("items", "results", "data") if isinstance(payload.get(k), list)), [])
+        found: Dict[int, Any] = {}
+        for item in items if isinstance(items, list) else []:
+            try:
+                found[int(item["id"])] = (item, None)
+            except (KeyError, TypeError, ValueError):
+                continue
+        missing = [household_id for household_id in household_ids if household_id not in found]
+        if missing:
+            results = await asyncio.gather(
+                *(self._fetch_household(household_id) for household_id in missing), return_exceptions=True
             )
-            response.raise_for_status()
-            return response.json()
+            found.update(zip(missing, results))
+        return found
 
     # ==================== Tasks ====================
 
-    async def complete_task(self, task_id: int, note: Optional[str] = None) -> Dict:
-        """Mark a task as completed."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.api_v1}/tasks/{task_id}/complete",
-                json={"status": "COMPLETED", "note": note},
-                headers=self._headers(),
-            )
-            response.raise_for_status()
-            return response.json()
+    async def complete_task(
+        self, task_id: int, note: Optional[str] = None, idempotency_key: Optional[str] = None
+    ) -> Dict:
+        """
+        Mark a task as completed. `idempotency_key` is sent as Idempotency-Key
+        so a repeated delivery (e.g. from the outbox) is applied once.
+        """
+        result = await self._request(
+            "POST",
+            f"{self.api_v1}/tasks/{task_id}/complete",
+            json={"status": "COMPLETED", "note": note},
+            operation="complete_task",
+            headers={"Idempotency-Key": idempotency_key} if idempotency_key else None,
+        )
+        self.invalidate_households(household_id_of(result))
+        return result
+
+    async def complete_tasks(
+        self, items: List[Dict[str, Any]], concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Complete many tasks. `items` are {"task_id": int, "note": str | None}.
+
+        Uses the backend bulk route when BACKEND_BULK_TASK_COMPLETE is set
+        (falling back if the backend answers 404/405), otherwise fans out to
+        complete_task with at most `concurrency` calls in flight. Returns one
+        {"task_id", "ok", "result" | "error", "status_code"} entry per item,
+        in input order; per-item failures never fail the whole batch.
+        """
+        if not items:
+            return []
+
+        if self.bulk_task_complete:
+            try:
+                return await self._complete_tasks_bulk(items)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in (404, 405):
+                    raise
+                logger.warning("Backend has no bulk task completion route; falling back to fan-out")
+                self.bulk_task_complete = False
+
+        semaphore = asyncio.Semaphore(max(1, concurrency or BATCH_CONCURRENCY))
+
+        async def complete_one(item: Dict[str, Any]) -> Dict[str, Any]:
+            task_id = item["task_id"]
+            async with semaphore:
+                try:
+                    result = await self.complete_task(task_id, item.get("note"))
+                    return {"task_id": task_id, "ok": True, "result": result}
+                except httpx.HTTPStatusError as e:
+                    return {
+                        "task_id": task_id,
+                        "ok": False,
+                        "status_code": e.response.status_code,
+                        "error": str(e),
+                    }
+                except Exception as e:
+                    return {"task_id": task_id, "ok": False, "status_code": None, "error": str(e)}
+
+        return list(await asyncio.gather(*(complete_one(item) for item in items)))
+
+    async def _complete_tasks_bulk(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        One backend call for the whole batch. Expects a list (or {"results": [...]})
+        of per-task results, matched to the input by task id or else by position;
+        items without a usable result are reported as failed.
+        """
+        payload = await self._request(
+            "POST",
+            f"{self.api_v1}/tasks/complete:batch",
+            json={
+                "tasks": [
+                    {"task_id": item["task_id"], "status": "COMPLETED", "note": item.get("note")}
+                    for item in items
+                ]
+            },
+            operation="complete_tasks_bulk",
+        )
+        self.invalidate_households()
+        results = payload.get("results") if isinstance(payload, dict) else payload
+        return [
+            _bulk_item_outcome(item["task_id"], result)
+            for item, result in zip(items, _match_bulk_results(items, results))
+        ]
 
     # ==================== Documents ====================
 
     async def validate_document(self, document_id: str, document_url: Optional[str] = None) -> Dict:
         """Validate a document for NIGO issues."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/documents/validate",
-                json={"document_id": document_id, "document_url": document_url},
-                headers=self._headers(),
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._request(
+            "POST",
+            f"{self.base_url}/documents/validate",
+            json={"document_id": document_id, "document_url": document_url},
+            operation="validate_document",
+        )
 
     # ==================== Predictions ====================
 
     async def get_eta_prediction(self, workflow_id: str) -> Dict:
         """Get ETA prediction for a workflow."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/predictions/eta/{workflow_id}",
-                headers=self._headers(),
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._coalesced_get(
+            ("eta", workflow_id),
+            f"{self.base_url}/predictions/eta/{workflow_id}",
+            operation="get_eta_prediction",
+        )
 
     # ==================== Entity Resolution ====================
 
     async def run_entity_match(self, source_data: Dict) -> Dict:
         """Run entity resolution on source data."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/entity/match",
-                json=source_data,
-                headers=self._headers(),
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._request(
+            "POST",
+            f"{self.base_url}/entity/match",
+            json=source_data,
+            operation="run_entity_match",
+        )
 
     # ==================== Communications ====================
 
@@ -151,30 +934,79 @@ class TransitionOSClient:
         self, template_type: str, recipient: str, context: Dict
     ) -> Dict:
         """Draft a communication message."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/communications/draft",
-                json={
-                    "template_type": template_type,
-                    "recipient": recipient,
-                    "context": context,
-                },
-                headers=self._headers(),
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._request(
+            "POST",
+            f"{self.base_url}/communications/draft",
+            json={
+                "template_type": template_type,
+                "recipient": recipient,
+                "context": context,
+            },
+            operation="draft_communication",
+        )
 
     # ==================== Meeting Pack ====================
 
     async def get_meeting_pack(self, household_id: int) -> Dict:
         """Generate a meeting pack for a household."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/households/{household_id}/meeting-pack",
-                headers=self._headers(),
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._request(
+            "GET",
+            f"{self.base_url}/households/{household_id}/meeting-pack",
+            operation="get_meeting_pack",
+        )
+
+
+def _match_bulk_results(items: List[Dict[str, Any]], results: Any) -> List[Any]:
+    """Each item's entry in a bulk response (None where there isn't one)."""
+    if not isinstance(results, list):
+        return [None] * len(items)
+    ids = [_bulk_result_id(result) for result in results]
+    if results and all(task_id is not None for task_id in ids):
+        by_id: Dict[str, Any] = {}
+        for task_id, result in zip(ids, results):
+            by_id.setdefault(task_id, result)
+        return [by_id.get(str(item["task_id"])) for item in items]
+    if len(results) == len(items):
+        return results
+    return [None] * len(items)
+
+
+def _bulk_result_id(result: Any) -> Optional[str]:
+    if not isinstance(result, dict):
+        return None
+    task_id = result.get("task_id", result.get("id"))
+    return str(task_id) if task_id is not None else None
+
+
+def _bulk_item_outcome(task_id: Any, result: Any) -> Dict[str, Any]:
+    """A bulk response entry in the shape complete_tasks_batch reports for fan-out calls."""
+    if not isinstance(result, dict):
+        return {"task_id": task_id, "ok": False, "status_code": None, "error": "No result in bulk response"}
+    status_code = result.get("status_code", result.get("status"))
+    if not isinstance(status_code, int) or isinstance(status_code, bool):
+        status_code = None
+    if result.get("error") or (status_code is not None and not 200 <= status_code < 300):
+        return {
+            "task_id": task_id,
+            "ok": False,
+            "status_code": status_code,
+            "error": str(result.get("error") or f"HTTP {status_code}"),
+        }
+    return {"task_id": task_id, "ok": True, "result": result}
+
+
+def household_id_of(payload: Any) -> Optional[int]:
+    """Best-effort extraction of the household a backend write touched."""
+    if not isinstance(payload, dict):
+        return None
+    for field in ("household_id", "transition_id"):
+        value = payload.get(field)
+        if value is not None:
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+    return None
 
 
 # Singleton instance for easy import
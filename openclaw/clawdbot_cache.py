@@ -0,0 +1,437 @@
+"""
+In-process response cache for Clawdbot (EC2)
+
+A small TTL + LRU cache used by TransitionOSClient to avoid pulling the same
+backend data on every chat turn. Entries go through three states:
+
+    fresh  → served directly
+    stale  → served directly while the caller refreshes in the background
+    expired → treated as a miss (kept until evicted as a last-resort fallback)
+
+Memory is bounded both by entry count and by an estimate of the encoded size.
+
+With several server workers, each process has its own TTLCache. Passing a
+SharedCacheStore (a local SQLite file) adds a second tier they all read
+through and write to, so one worker's backend call serves the others, and
+invalidations reach every worker.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    size: int
+    fresh_until: float
+    stale_until: float
+    etag: Optional[str] = None
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory footprint of a JSON-like value by its encoded length."""
+    try:
+        return len(json.dumps(value, default=str, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return 1024
+
+
+class TTLCache:
+    """
+    LRU cache with a freshness TTL, a stale-while-revalidate window and a
+    memory cap. Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        stale_ttl: float = 300.0,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+        shared: Optional["SharedCacheStore"] = None,
+    ):
+        """
+        Args:
+            ttl: Seconds an entry is served as fresh
+            stale_ttl: Extra seconds an entry may be served stale while refreshing
+            max_entries: Maximum number of entries before LRU eviction
+            max_bytes: Maximum estimated size of all entries before LRU eviction
+            clock: Monotonic clock (overridable for tests)
+            shared: Optional cross-process tier consulted on local misses
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        # Bumped on every invalidation so in-flight loads can detect they are outdated
+        self.generation = 0
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.shared = shared
+        self.shared_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: Hashable) -> Tuple[Any, str]:
+        """Return (value, state) where state is FRESH, STALE or MISS."""
+        if self.shared is not None and self.shared.changed():
+            # Another worker invalidated something; we can't tell what, so start over locally
+            self._drop_local()
+        entry = self._entries.get(key)
+        if entry is None and self.shared is not None:
+            entry = self._load_shared(key)
+        if entry is None:
+            self.misses += 1
+            return None, MISS
+
+        now = self._clock()
+        if now < entry.fresh_until:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value, FRESH
+        if now < entry.stale_until:
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            return entry.value, STALE
+
+        # Expired entries stay until evicted so peek() can serve them if the backend is down
+        self.misses += 1
+        return None, MISS
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return a cached value regardless of age (even expired), without touching counters or LRU order."""
+        entry = self._entries.get(key)
+        return entry.value if entry is not None else None
+
+    def etag(self, key: Hashable) -> Optional[str]:
+        """Return the validator stored with a value (any age), for conditional requests."""
+        entry = self._entries.get(key)
+        return entry.etag if entry is not None else None
+
+    def set(
+        self, key: Hashable, value: Any, generation: Optional[int] = None, etag: Optional[str] = None
+    ) -> bool:
+        """
+        Store a value (with its ETag, if any). If `generation` is given and the
+        cache was invalidated since it was read, the (outdated) value is dropped
+        and False is returned. Re-storing the cached object just renews it.
+        """
+        if generation is not None and generation != self.generation:
+            return False
+
+        current = self._entries.get(key)
+        size = current.size if current is not None and current.value is value else estimate_size(value)
+        if size > self.max_bytes:
+            self._remove(key)
+            return False
+
+        self._remove(key)
+        now = self._clock()
+        self._entries[key] = CacheEntry(
+            value=value,
+            size=size,
+            fresh_until=now + self.ttl,
+            stale_until=now + self.ttl + self.stale_ttl,
+            etag=etag,
+        )
+        self._bytes += size
+        self._evict()
+        if self.shared is not None and not (current is not None and current.value is value):
+            self.shared.put(key, value, etag, self.ttl, self.ttl + self.stale_ttl)
+        elif self.shared is not None:
+            self.shared.touch(key, self.ttl, self.ttl + self.stale_ttl)
+        return True
+
+    def replace(self, key: Hashable, value: Any) -> bool:
+        """
+        Store a value patched from a change event. Unlike set(), loads that
+        started before the change can no longer overwrite it, and other
+        workers drop their local copy and reload the patched one.
+        """
+        self.generation += 1
+        stored = self.set(key, value)
+        if stored and self.shared is not None:
+            self.shared.announce()
+        return stored
+
+    def keys(self) -> List[Hashable]:
+        """Keys held locally (any age)."""
+        return list(self._entries)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        self.generation += 1
+        if self._remove(key):
+            self.invalidations += 1
+        if self.shared is not None:
+            self.shared.delete_where(lambda k: k == key)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches `predicate`. Returns the number dropped."""
+        self.generation += 1
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        if self.shared is not None:
+            self.shared.delete_where(predicate)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self.generation += 1
+        self.invalidations += len(self._entries)
+        self._drop_local()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and memory usage."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "shared": self.shared is not None,
+            "shared_hits": self.shared_hits,
+            "shared_errors": self.shared.errors if self.shared is not None else 0,
+        }
+
+    def _drop_local(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _load_shared(self, key: Hashable) -> Optional[CacheEntry]:
+        """Copy a live entry from the shared tier into this process's LRU."""
+        found = self.shared.get(key)
+        if found is None:
+            return None
+        value, etag, fresh_for, stale_for, size = found
+        now = self._clock()
+        entry = CacheEntry(
+            value=value,
+            size=size,
+            fresh_until=now + fresh_for,
+            stale_until=now + stale_for,
+            etag=etag,
+        )
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self._evict()
+        self.shared_hits += 1
+        return entry
+
+    def _remove(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+
+class SharedCacheStore:
+    """
+    Cache tier shared by the worker processes of one host, in a SQLite file.
+
+    Keys must be JSON-encodable (tuples of str/int/None) and values JSON.
+    Writes go through every TTLCache.set(); an epoch counter bumped on
+    invalidation tells the other workers to drop their local copies.
+    Entries are kept until their stale window ends.
+    """
+
+    def __init__(self, path: str, namespace: str = "default", check_interval: float = 0.1):
+        """
+        Args:
+            path: SQLite file (e.g. /dev/shm/clawdbot-cache.db for a RAM-backed store)
+            namespace: Separates caches sharing one file
+            check_interval: Seconds between checks for other workers' invalidations
+        """
+        self.path = path
+        self.namespace = namespace
+        self.check_interval = check_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._epoch: Optional[int] = None
+        self._checked_at = 0.0
+        self.errors = 0
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per process: workers are forked/spawned after import
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, etag TEXT,"
+                " fresh_until REAL NOT NULL, stale_until REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_epochs (namespace TEXT PRIMARY KEY, epoch INTEGER NOT NULL)"
+            )
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _encode_key(key: Hashable) -> str:
+        return json.dumps(list(key) if isinstance(key, tuple) else key, separators=(",", ":"))
+
+    @staticmethod
+    def _decode_key(text: str) -> Hashable:
+        key = json.loads(text)
+        return tuple(key) if isinstance(key, list) else key
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, Optional[str], float, float, int]]:
+        """Return (value, etag, seconds fresh, seconds until expiry, encoded size) for a live entry."""
+        try:
+            row = self._db().execute(
+                "SELECT value, etag, fresh_until, stale_until FROM cache_entries"
+                " WHERE namespace = ? AND key = ?",
+                (self.namespace, self._encode_key(key)),
+            ).fetchone()
+        except sqlite3.Error:
+            self.errors += 1
+            return None
+        now = time.time()
+        if row is None or row[3] <= now:
+            return None
+        return json.loads(row[0]), row[1], row[2] - now, row[3] - now, len(row[0])
+
+    def put(self, key: Hashable, value: Any, etag: Optional[str], ttl: float, stale_ttl: float) -> None:
+        now = time.time()
+        try:
+            self._db().execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.namespace,
+                    self._encode_key(key),
+                    json.dumps(value, default=str, separators=(",", ":")),
+                    etag,
+                    now + ttl,
+                    now + stale_ttl,
+                ),
+            )
+        except (sqlite3.Error, TypeError, ValueError):
+            self.errors += 1
+
+    def touch(self, key: Hashable, ttl: float, stale_ttl: float) -> None:
+        """Renew an entry whose value was revalidated (e.g. by a 304)."""
+        now = time.time()
+        try:
+            self._db().execute(
+                "UPDATE cache_entries SET fresh_until = ?, stale_until = ? WHERE namespace = ? AND key = ?",
+                (now + ttl, now + stale_ttl, self.namespace, self._encode_key(key)),
+            )
+        except sqlite3.Error:
+            self.errors += 1
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        try:
+            db = self._db()
+            now = time.time()
+            keys = [
+                (self.namespace, text)
+                for (text,) in db.execute("SELECT key FROM cache_entries WHERE namespace = ?", (self.namespace,))
+                if predicate(self._decode_key(text))
+            ]
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", keys)
+            db.execute("DELETE FROM cache_entries WHERE stale_until <= ?", (now,))
+            self._bump_epoch(db)
+            db.execute("COMMIT")
+        except sqlite3.Error:
+            self.errors += 1
+            self._rollback()
+
+    def clear(self) -> None:
+        try:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            db.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+            self._bump_epoch(db)
+            db.execute("COMMIT")
+        except sqlite3.Error:
+            self.errors += 1
+            self._rollback()
+
+    def announce(self) -> None:
+        """Tell the other workers to drop their local copies (e.g. after replacing entries)."""
+        try:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            self._bump_epoch(db)
+            db.execute("COMMIT")
+        except sqlite3.Error:
+            self.errors += 1
+            self._rollback()
+
+    def changed(self) -> bool:
+        """True (at most once per change) when another process invalidated entries."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        try:
+            row = self._db().execute(
+                "SELECT epoch FROM cache_epochs WHERE namespace = ?", (self.namespace,)
+            ).fetchone()
+        except sqlite3.Error:
+            self.errors += 1
+            return False
+        epoch = row[0] if row else 0
+        changed = self._epoch is not None and epoch != self._epoch
+        self._epoch = epoch
+        return changed
+
+    def _bump_epoch(self, db: sqlite3.Connection) -> None:
+        db.execute(
+            "INSERT INTO cache_epochs VALUES (?, 1)"
+            " ON CONFLICT(namespace) DO UPDATE SET epoch = epoch + 1",
+            (self.namespace,),
+        )
+        # Our own invalidation is already applied locally; anyone else's is left for changed()
+        row = db.execute("SELECT epoch FROM cache_epochs WHERE namespace = ?", (self.namespace,)).fetchone()
+        if self._epoch is not None and row[0] == self._epoch + 1:
+            self._epoch = row[0]
+
+    def _rollback(self) -> None:
+        try:
+            if self._conn is not None and self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,221 @@
+"""
+Request coalescing for Clawdbot (EC2)
+
+SingleFlight makes identical concurrent calls share one execution: the first
+caller for a key starts the call, later callers for the same key await the
+same result (or exception) instead of hitting the backend again.
+
+BatchLoader goes one step further for lookups by ID: calls for *different*
+keys made within a few milliseconds of each other are collected and
+resolved by one batch call (DataLoader-style micro-batching).
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Mapping, Optional
+
+from openclaw.clawdbot_resilience import DeadlineExceeded, deadline_scope, remaining_time
+from openclaw.clawdbot_tracing import span
+
+
+class SingleFlight:
+    """Deduplicate concurrent in-flight calls by key."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        # Budget each in-flight call started with (None = no deadline)
+        self._budgets: Dict[asyncio.Task, Optional[float]] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        on_timeout: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """
+        Run `fn` once for all concurrent callers sharing `key`.
+
+        The call runs in its own task, so a cancelled caller does not cancel
+        the shared call for everyone else. Callers receive the same decoded
+        result object and must treat it as read-only.
+
+        The call runs under its leader's deadline, the longest budget known
+        when it starts, so the deadline still reaches the backend and its
+        circuit breaker. A follower whose own deadline runs out first gets
+        DeadlineExceeded and `on_timeout` is called (the backend was too slow
+        for it). If the leader's deadline runs out instead, a follower with
+        more time left than the call was given starts it again under its own.
+        """
+        join = True
+        while True:
+            budget = remaining_time()
+            task = self._calls.get(key) if join else None
+            leader = task is None or task.done()
+            if leader:
+                self.leaders += 1
+                task = asyncio.ensure_future(fn())
+                self._calls[key] = task
+                self._budgets[task] = budget
+                task.add_done_callback(lambda t, key=key: self._done(key, t))
+            else:
+                self.followers += 1
+            shared_budget = self._budgets.get(task)
+            try:
+                if leader or budget is None:
+                    # A leader's call is bounded by the leader's own deadline already
+                    return await asyncio.shield(task)
+                return await asyncio.wait_for(asyncio.shield(task), max(budget, 0.0))
+            except asyncio.TimeoutError:
+                if task.done():
+                    raise  # the shared call itself raised TimeoutError
+                if on_timeout is not None:
+                    on_timeout()
+                raise DeadlineExceeded(f"Deadline exceeded waiting for shared call {key!r}") from None
+            except DeadlineExceeded:
+                # The leader's budget ran out; only a caller with clearly more time tries again
+                remaining = remaining_time()
+                if leader or not join or shared_budget is None:
+                    raise
+                if remaining is not None and remaining <= shared_budget:
+                    raise
+                join = False
+
+    def forget(self, key: Hashable) -> None:
+        """Let the next caller for `key` start a new call (e.g. after a write)."""
+        self._calls.pop(key, None)
+
+    def forget_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Forget every in-flight key matching `predicate`."""
+        for key in [key for key in self._calls if predicate(key)]:
+            self._calls.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return coalescing counters."""
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        self._budgets.pop(task, None)
+        # Mark the exception as retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+class BatchLoader:
+    """Collect concurrent load(key) calls into batched calls of `batch_fn`."""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Hashable]], Awaitable[Mapping[Hashable, Any]]],
+        window: float = 0.002,
+        max_batch: int = 100,
+    ):
+        """
+        Args:
+            batch_fn: Resolves a list of distinct keys; returns {key: value or Exception}
+                      (a key missing from the result fails with KeyError)
+            window: Seconds to wait for more keys after the first one arrives
+            max_batch: Dispatch as soon as this many keys are waiting
+        """
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        # Latest deadline among the pending callers (None once any caller has no deadline)
+        self._deadline: Optional[float] = None
+        self._unbounded = False
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.loads = 0
+        self.batches = 0
+        self.keys = 0
+        self.max_batch_seen = 0
+
+    async def load(self, key: Hashable) -> Any:
+        """Return batch_fn's result for `key`, batched with other keys requested meanwhile."""
+        self.loads += 1
+        budget = remaining_time()
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            # Nobody may await a key whose callers were all cancelled; retrieve its exception anyway
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+        if budget is None:
+            self._unbounded = True
+        else:
+            self._deadline = max(self._deadline or 0.0, budget)
+
+        # The batch's backend call is traced under whichever caller opened it; this span covers the wait
+        with span("batch.wait", key=repr(key)):
+            if budget is None:
+                return await asyncio.shield(future)
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), max(budget, 0.0))
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"Deadline exceeded waiting for batched load of {key!r}") from None
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        budget = None if self._unbounded else self._deadline
+        self._deadline, self._unbounded = None, False
+        self.batches += 1
+        self.keys += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        task = asyncio.ensure_future(self._run(batch, budget))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[Hashable, asyncio.Future], budget: Optional[float]) -> None:
+        try:
+            # The batch gets as long as its most patient caller
+            with deadline_scope(budget):
+                results = await self.batch_fn(list(batch))
+        except BaseException as e:
+            # Fail every waiter, including when the batch task itself is cancelled
+            for future in batch.values():
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for key, future in batch.items():
+            if future.done():
+                continue
+            result = results.get(key, KeyError(key))
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batching counters (loads - keys = lookups deduplicated within a window)."""
+        return {
+            "loads": self.loads,
+            "batches": self.batches,
+            "keys": self.keys,
+            "avg_batch": round(self.keys / self.batches, 2) if self.batches else 0.0,
+            "max_batch": self.max_batch_seen,
+        }
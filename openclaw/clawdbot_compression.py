@@ -0,0 +1,226 @@
+"""
+Response Compression for Clawdbot (EC2)
+
+Household lists, meeting packs and /chat payloads are large, repetitive JSON
+that compresses 10-20x. CompressionMiddleware negotiates brotli (when the
+`brotli` package is installed) or gzip from Accept-Encoding and compresses
+responses above a size threshold. A per-route policy turns it off for small
+or streaming routes (health checks, /metrics, SSE).
+"""
+
+import asyncio
+import zlib
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+# Never worth compressing: already compressed, or must be flushed event by event
+DEFAULT_SKIP_TYPES = ("text/event-stream", "image/", "audio/", "video/", "application/gzip", "application/zip")
+
+# Bodies larger than this are compressed in a worker thread to keep the event loop free
+THREAD_MIN_SIZE = 256 * 1024
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    codings: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+def choose_encoding(header: str, algorithms: Sequence[str]) -> Optional[str]:
+    """Pick the first of `algorithms` (in server preference order) the client accepts."""
+    accepted = parse_accept_encoding(header)
+    for algorithm in algorithms:
+        quality = accepted.get(algorithm, accepted.get("*", 0.0))
+        if quality > 0:
+            return algorithm
+    return None
+
+
+class _Compressor:
+    """Incremental gzip or brotli encoder."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._br.process(data)
+            return out + (self._br.finish() if finish else self._br.flush())
+        out = self._gz.compress(data)
+        return out + self._gz.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing HTTP responses with brotli or gzip."""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        skip_paths: Iterable[str] = ("/health", "/metrics"),
+        skip_types: Sequence[str] = DEFAULT_SKIP_TYPES,
+        algorithms: Optional[Sequence[str]] = None,
+    ):
+        """
+        Args:
+            app: ASGI application
+            minimum_size: Bodies smaller than this many bytes are sent as-is
+            gzip_level: zlib level 1-9
+            brotli_quality: brotli quality 0-11 (4-5 is a good speed/size point for dynamic JSON)
+            skip_paths: Routes never compressed (exact path, or prefix when ending in "*")
+            skip_types: Content types (or type prefixes) never compressed
+            algorithms: Encodings in preference order (default: br if available, then gzip)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        paths = list(skip_paths)
+        self.skip_paths = {p for p in paths if not p.endswith("*")}
+        self.skip_prefixes = tuple(p[:-1] for p in paths if p.endswith("*"))
+        self.skip_types = tuple(skip_types)
+        if algorithms is None:
+            algorithms = ("br", "gzip") if brotli is not None else ("gzip",)
+        self.algorithms = tuple(a for a in algorithms if a != "br" or brotli is not None)
+
+    def _skip_path(self, path: str) -> bool:
+        return path in self.skip_paths or (bool(self.skip_prefixes) and path.startswith(self.skip_prefixes))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._skip_path(scope.get("path", "")):
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        if_none_match = b""
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+            elif name == b"if-none-match":
+                if_none_match = value
+        encoding = choose_encoding(accept, self.algorithms) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[dict] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                headers = dict(_lower_headers(message.get("headers", ())))
+                content_type = headers.get(b"content-type", b"").decode("latin-1").lower()
+                passthrough = (
+                    b"content-encoding" in headers
+                    or message["status"] in (204, 206, 304)
+                    or content_type.startswith(self.skip_types)
+                )
+                if passthrough:
+                    if message["status"] == 304:
+                        # Match the validator the client's cached 200 carried: weak only if that
+                        # 200 was compressed (a body under minimum_size went out with the strong one)
+                        message["headers"] = [
+                            (name, _weak_etag(value))
+                            if name.lower() == b"etag" and _sent_weak(if_none_match, value)
+                            else (name, value)
+                            for name, value in message.get("headers", ())
+                        ]
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                data = await _compress(compressor, body, not more_body)
+                # Single-chunk bodies get their new length; streamed ones go out chunked
+                length = None if more_body else len(data)
+                start["headers"] = _compressed_headers(start.get("headers", ()), encoding, length)
+                await send(start)
+            else:
+                data = await _compress(compressor, body, not more_body)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+async def _compress(compressor: _Compressor, body: bytes, finish: bool) -> bytes:
+    if len(body) >= THREAD_MIN_SIZE:
+        return await asyncio.to_thread(compressor.compress, body, finish)
+    return compressor.compress(body, finish)
+
+
+def _weak_etag(value: bytes) -> bytes:
+    return value if value.startswith(b"W/") else b"W/" + value
+
+
+def _sent_weak(if_none_match: bytes, etag: bytes) -> bool:
+    """True when If-None-Match names `etag` in its weak form (W/"...")."""
+    weak = _weak_etag(etag)
+    return any(candidate.strip() == weak for candidate in if_none_match.split(b","))
+
+
+def _lower_headers(headers: Iterable[Tuple[bytes, bytes]]) -> Iterable[Tuple[bytes, bytes]]:
+    return ((name.lower(), value) for name, value in headers)
+
+
+def _compressed_headers(headers: Iterable[Tuple[bytes, bytes]], encoding: str, length: Optional[int]):
+    """Response headers for the encoded body: new length, encoding, Vary and a weak ETag."""
+    result = []
+    vary = None
+    for name, value in headers:
+        lower = name.lower()
+        if lower == b"content-length":
+            continue
+        if lower == b"vary":
+            vary = value
+            continue
+        if lower == b"etag":
+            # The encoded bytes differ from the identity representation (RFC 9110 §8.8.3)
+            value = _weak_etag(value)
+        result.append((name, value))
+    result.append((b"content-encoding", encoding.encode()))
+    if length is not None:
+        result.append((b"content-length", str(length).encode()))
+    if vary is None:
+        result.append((b"vary", b"Accept-Encoding"))
+    elif b"accept-encoding" not in vary.lower():
+        result.append((b"vary", vary + b", Accept-Encoding"))
+    else:
+        result.append((b"vary", vary))
+    return result
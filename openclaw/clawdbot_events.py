@@ -0,0 +1,285 @@
+"""
+Backend Change Events for Clawdbot (EC2)
+
+The backend POSTs household, task and workflow changes to /events so cached
+reads are corrected the moment something changes rather than when their TTL
+runs out, which lets CLAWDBOT_CACHE_TTL be raised well above the default.
+
+Requests are authenticated with either
+
+    Authorization: Bearer <CLAWDBOT_EVENTS_TOKEN>
+
+or an HMAC-SHA256 signature of "<timestamp>.<raw body>" keyed with
+CLAWDBOT_EVENTS_SECRET:
+
+    X-Clawdbot-Timestamp: 1760000000
+    X-Clawdbot-Signature: sha256=<hex digest>
+
+Signed requests older than the tolerance are refused (replay protection).
+With neither setting the endpoint is disabled.
+
+The body is one event, a list of events, or {"events": [...]}:
+
+    {"id": "evt_123", "type": "household.updated", "data": {"id": 42, "status": "AT_RISK"}}
+
+    household.created / household.updated   data = the household (at least "id";
+                                            an update may carry only changed fields)
+    household.deleted                       data = {"id"}
+    task.created / task.completed /
+    task.updated / task.deleted             data = {"household_id", ...}, optionally
+                                            with "household" (the updated household)
+    workflow.*                              data = {"household_id"} or {"household": {...}}
+
+Unknown types are acknowledged and ignored so the backend doesn't retry them;
+event ids seen recently are skipped, so redelivery is harmless. An event with
+a malformed field (e.g. a non-numeric open_tasks_count) is rejected on its own,
+before anything is changed, and its id isn't remembered, so a corrected
+redelivery still applies.
+
+With several workers each event reaches only one of them: the shared cache
+tier carries the cache changes to the others, whose dashboard aggregates
+catch up at their next rebuild.
+"""
+
+import hashlib
+import hmac
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from openclaw.clawdbot_aggregates import DashboardAggregates
+from openclaw.clawdbot_backend_client import TransitionOSClient, household_id_of
+from openclaw.clawdbot_meeting_packs import MeetingPackService
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "x-clawdbot-signature"
+TIMESTAMP_HEADER = "x-clawdbot-timestamp"
+
+# Household fields the cache and aggregates count with, coerced before any state changes
+COUNT_FIELDS = ("open_tasks_count", "nigo_issues_count")
+
+
+class EventAuthError(Exception):
+    """The request isn't from the backend (bad token, signature or timestamp)."""
+
+
+class EventVerifier:
+    """Checks that an /events request carries the shared token or a valid signature."""
+
+    def __init__(self, token: Optional[str] = None, secret: Optional[str] = None, tolerance: float = 300.0):
+        """
+        Args:
+            token: Bearer token the backend sends (None = not accepted)
+            secret: HMAC key for signed requests (None = not accepted)
+            tolerance: Maximum age in seconds of a signed request
+        """
+        self.token = token
+        self.secret = secret.encode() if secret else None
+        self.tolerance = tolerance
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token or self.secret)
+
+    def verify(self, headers: Dict[str, str], body: bytes) -> None:
+        """Raise EventAuthError unless the request is authenticated."""
+        signature = headers.get(SIGNATURE_HEADER)
+        if self.secret and signature:
+            self._verify_signature(signature, headers.get(TIMESTAMP_HEADER), body)
+            return
+        authorization = headers.get("authorization", "")
+        if self.token and authorization.startswith("Bearer "):
+            if hmac.compare_digest(authorization[len("Bearer "):].encode(), self.token.encode()):
+                return
+            raise EventAuthError("invalid token")
+        raise EventAuthError("missing credentials")
+
+    def _verify_signature(self, signature: str, timestamp: Optional[str], body: bytes) -> None:
+        try:
+            sent_at = float(timestamp)
+        except (TypeError, ValueError):
+            raise EventAuthError("missing or invalid timestamp")
+        if abs(time.time() - sent_at) > self.tolerance:
+            raise EventAuthError("timestamp outside tolerance")
+        expected = hmac.new(self.secret, timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(signature.removeprefix("sha256=").encode(), expected.encode()):
+            raise EventAuthError("invalid signature")
+
+
+def parse_events(payload: Any) -> List[Dict]:
+    """Normalize a request body to a list of events; raises ValueError if it isn't one."""
+    if isinstance(payload, dict):
+        payload = payload["events"] if "events" in payload else [payload]
+    if not isinstance(payload, list) or not all(
+        isinstance(event, dict) and isinstance(event.get("type"), str) for event in payload
+    ):
+        raise ValueError("expected an event, a list of events, or {\"events\": [...]}")
+    return payload
+
+
+class EventProcessor:
+    """Applies backend change events to the read cache, dashboard aggregates and meeting packs."""
+
+    def __init__(
+        self,
+        client: TransitionOSClient,
+        aggregates: DashboardAggregates,
+        meeting_packs: Optional[MeetingPackService] = None,
+        dedupe_size: int = 10000,
+    ):
+        """
+        Args:
+            client: Backend client whose household cache is patched
+            aggregates: Dashboard counts to keep current
+            meeting_packs: Pack cache to drop changed households from
+            dedupe_size: Recent event ids remembered to skip redeliveries
+        """
+        self.client = client
+        self.aggregates = aggregates
+        self.meeting_packs = meeting_packs
+        self.dedupe_size = dedupe_size
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self.applied = 0
+        self.duplicates = 0
+        self.ignored = 0
+        self.rejected = 0
+
+    def apply_all(self, events: Iterable[Dict]) -> Dict[str, int]:
+        """Apply events in order; returns how many were applied, duplicates, ignored and rejected."""
+        counts = {"applied": 0, "duplicates": 0, "ignored": 0, "rejected": 0}
+        for event in events:
+            outcome = self.apply(event)
+            counts[outcome] += 1
+        return counts
+
+    def apply(self, event: Dict) -> str:
+        """Apply one event; returns "applied", "duplicates", "ignored" or "rejected"."""
+        event_id = event.get("id")
+        if event_id is not None and str(event_id) in self._seen:
+            self._seen.move_to_end(str(event_id))
+            self.duplicates += 1
+            return "duplicates"
+
+        kind, _, action = event["type"].partition(".")
+        data = event.get("data")
+        data = data if isinstance(data, dict) else {}
+        handler = {
+            "household": self._household_event,
+            "task": self._task_event,
+            "workflow": self._workflow_event,
+        }.get(kind)
+        try:
+            handled = handler is not None and handler(action, data)
+        except Exception as e:
+            # Not remembered as seen: the backend's redelivery (fixed or not) is tried again
+            logger.warning(f"Rejected backend event {event['type']} ({event_id}): {e}")
+            self.rejected += 1
+            return "rejected"
+        self._remember(event_id)
+        if not handled:
+            logger.info(f"Ignoring backend event {event['type']} ({event_id})")
+            self.ignored += 1
+            return "ignored"
+        self.applied += 1
+        return "applied"
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "applied": self.applied,
+            "duplicates": self.duplicates,
+            "ignored": self.ignored,
+            "rejected": self.rejected,
+        }
+
+    def _remember(self, event_id: Any) -> None:
+        if event_id is None:
+            return
+        self._seen[str(event_id)] = None
+        if len(self._seen) > self.dedupe_size:
+            self._seen.popitem(last=False)
+
+    # ==================== Handlers ====================
+
+    def _household_event(self, action: str, data: Dict) -> bool:
+        household = _household(data)
+        if household is None:
+            return False
+        if action == "deleted":
+            self._household_deleted(household["id"])
+        elif action in ("created", "updated"):
+            self._household_changed(household)
+        else:
+            return False
+        return True
+
+    def _task_event(self, action: str, data: Dict) -> bool:
+        household = _household(data.get("household"))
+        household_id = household["id"] if household is not None else household_id_of(data)
+        if household_id is None:
+            return False
+        if household is not None:
+            self._household_changed(household)
+            return True
+        # Task counts change but the event doesn't say what they are now; a +/-1 here would
+        # double-count a change the aggregates already saw (our own completion, a redelivery)
+        self.client.invalidate_households(household_id)
+        self._drop_pack(household_id)
+        self.aggregates.mark_stale()
+        return True
+
+    def _workflow_event(self, action: str, data: Dict) -> bool:
+        household = _household(data.get("household"))
+        if household is not None:
+            self._household_changed(household)
+            return True
+        household_id = household_id_of(data)
+        if household_id is None:
+            return False
+        self.client.invalidate_households(household_id)
+        self._drop_pack(household_id)
+        self.aggregates.mark_stale()
+        return True
+
+    def _household_changed(self, household: Dict) -> None:
+        self.client.apply_household_change(household)
+        self.aggregates.patch(household)
+        self._drop_pack(household["id"])
+
+    def _household_deleted(self, household_id: int) -> None:
+        self.client.apply_household_change({"id": household_id}, deleted=True)
+        self.aggregates.remove(household_id)
+        self._drop_pack(household_id)
+
+    def _drop_pack(self, household_id: int) -> None:
+        if self.meeting_packs is not None:
+            self.meeting_packs.invalidate(household_id)
+
+
+def _household(data: Any) -> Optional[Dict]:
+    """
+    The household in an event payload with its id and counts as ints, or None
+    if there is none. Raises ValueError for a field that can't be used.
+    """
+    if not isinstance(data, dict) or data.get("id") is None:
+        return None
+    household = {**data, "id": _int_field(data, "id")}
+    for field in COUNT_FIELDS:
+        if household.get(field) is not None:
+            household[field] = _int_field(household, field)
+            if household[field] < 0:
+                raise ValueError(f"{field} is negative: {household[field]}")
+    if household.get("status") is not None and not isinstance(household["status"], str):
+        raise ValueError(f"status is not a string: {household['status']!r}")
+    return household
+
+
+def _int_field(data: Dict, field: str) -> int:
+    value = data[field]
+    if isinstance(value, bool):
+        raise ValueError(f"{field} is not an integer: {value!r}")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} is not an integer: {value!r}") from None
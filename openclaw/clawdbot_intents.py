@@ -0,0 +1,166 @@
+"""
+Intent Router for Clawdbot (EC2)
+
+Maps chat messages to intents with a single compiled regular expression.
+All intent keywords are merged into one trie-shaped pattern, so routing a
+message is one left-to-right scan no matter how many intents are registered.
+The same scan extracts entity IDs ("household 12", "task #7", "workflow wf-3").
+
+Matching rules:
+    - Keywords match case-insensitively at the start of a word, so
+      "household" also matches "households" but "eta" does not match "beta".
+    - An intent matches when any of its keywords and all of its required
+      keywords appear in the message.
+    - Among matching intents the highest priority wins.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Sequence, Set
+
+
+@dataclass
+class Intent:
+    name: str
+    keywords: Sequence[str]
+    priority: int = 0
+    requires: Sequence[str] = ()
+
+
+@dataclass
+class IntentMatch:
+    intent: str
+    args: Dict[str, Any] = field(default_factory=dict)
+    keywords: Set[str] = field(default_factory=set)
+
+
+# Entity words that introduce an ID, mapped to the argument they fill
+ENTITY_ARGS = {
+    "household": "household_id",
+    "client": "household_id",
+    "task": "task_id",
+    "workflow": "workflow_id",
+    "document": "document_id",
+    "doc": "document_id",
+}
+
+# Arguments converted to int (the backend uses integer household/task IDs)
+INT_ARGS = {"household_id", "task_id"}
+
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation shaped like a trie, e.g. ["status", "start"]
+    becomes "sta(?:tus|rt)". Python's regex engine tries alternatives one by
+    one, so sharing prefixes keeps matching cost independent of word count.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        ending = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not ending:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if ending else group
+
+    return build(trie)
+
+
+class IntentRouter:
+    """Registry of intents compiled into a single-pass matcher."""
+
+    def __init__(self, default: str = "help"):
+        self.default = default
+        self._intents: Dict[str, Intent] = {}
+        self._keyword_intents: Dict[str, List[Intent]] = {}
+        self._pattern: Optional[Pattern] = None
+
+    def __len__(self) -> int:
+        return len(self._intents)
+
+    def register(
+        self,
+        name: str,
+        keywords: Sequence[str],
+        priority: int = 0,
+        requires: Sequence[str] = (),
+    ) -> Intent:
+        """Register (or replace) an intent. The matcher is recompiled on next use."""
+        intent = Intent(
+            name=name,
+            keywords=[k.lower() for k in keywords],
+            priority=priority,
+            requires=[k.lower() for k in requires],
+        )
+        self._intents[name] = intent
+        self._pattern = None
+        return intent
+
+    def compile(self) -> None:
+        """Compile every keyword and the entity-ID pattern into one regex."""
+        self._keyword_intents = {}
+        for intent in self._intents.values():
+            for keyword in intent.keywords:
+                self._keyword_intents.setdefault(keyword, []).append(intent)
+
+        words = set(self._keyword_intents)
+        for intent in self._intents.values():
+            words.update(intent.requires)
+        keyword_pattern = trie_pattern(words) if words else r"(?!)"
+        # Matched against the lowercased message (cheaper than re.IGNORECASE)
+        self._pattern = re.compile(
+            r"\b(?:"
+            r"(?P<entity>" + trie_pattern(ENTITY_ARGS) + r")s?"
+            r"\s*(?:id\s*)?(?:#|:|no\.?)?\s*(?P<id>(?=[\w-]*\d)\w[\w-]*)"
+            r"|(?P<keyword>" + keyword_pattern + r"))"
+        )
+
+    def route(self, message: str) -> IntentMatch:
+        """Return the best intent for `message` along with any extracted IDs."""
+        if self._pattern is None:
+            self.compile()
+
+        # Keywords in message order, so equal-priority ties go to the earliest mention
+        found: Dict[str, None] = {}
+        args: Dict[str, Any] = {}
+        text = message.lower()
+        # IDs are sliced from the original message to keep their case, unless
+        # lowercasing changed the length (some non-ASCII characters do)
+        source = message if len(text) == len(message) else text
+        for match in self._pattern.finditer(text):
+            keyword = match.group("keyword")
+            if keyword is not None:
+                found[keyword] = None
+                continue
+            entity = match.group("entity")
+            found[entity] = None
+            arg = ENTITY_ARGS[entity]
+            value = source[match.start("id"):match.end("id")]
+            if arg in INT_ARGS:
+                if not value.isdigit():
+                    continue
+                value = int(value)
+            args.setdefault(arg, value)
+
+        best: Optional[Intent] = None
+        for keyword in found:
+            for intent in self._keyword_intents.get(keyword, ()):
+                if best is not None and intent.priority <= best.priority:
+                    continue
+                if all(required in found for required in intent.requires):
+                    best = intent
+
+        return IntentMatch(
+            intent=best.name if best is not None else self.default,
+            args=args,
+            keywords=set(found),
+        )
@@ -0,0 +1,294 @@
+"""
+Meeting Pack Precomputation for Clawdbot (EC2)
+
+Meeting-pack generation is the slowest backend call we proxy, and advisors
+open the same pack many times before a meeting. This module:
+
+    - caches generated packs, versioned by the household they describe, so a
+      change to the household makes the old pack miss
+    - runs generation as background jobs that callers can poll instead of
+      holding a worker for the whole call
+    - periodically pre-generates packs for AT_RISK households and households
+      with a meeting coming up
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from openclaw.clawdbot_cache import FRESH, SharedCacheStore, TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Household fields that may carry the next meeting time (ISO 8601)
+MEETING_FIELDS = ("next_meeting_at", "next_meeting", "meeting_date", "meeting_at")
+# Household fields that identify a household revision, in order of preference
+VERSION_FIELDS = ("version", "updated_at", "last_modified")
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class MeetingPackJob:
+    job_id: str
+    household_id: int
+    version: str
+    status: str = JOB_PENDING
+    created_at: float = 0.0
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "household_id": self.household_id,
+            "version": self.version,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+def household_version(household: Dict[str, Any]) -> str:
+    """Identify a household revision: its version/updated_at field, else a content hash."""
+    for field in VERSION_FIELDS:
+        value = household.get(field)
+        if value is not None:
+            return str(value)
+    encoded = json.dumps(household, sort_keys=True, default=str).encode()
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def needs_pack(household: Dict[str, Any], window: timedelta) -> bool:
+    """True for AT_RISK households and households with a meeting within `window`."""
+    if household.get("status") == "AT_RISK":
+        return True
+    now = datetime.now(timezone.utc)
+    for field in MEETING_FIELDS:
+        meeting_at = _parse_datetime(household.get(field))
+        if meeting_at is not None and now <= meeting_at <= now + window:
+            return True
+    return False
+
+
+class MeetingPackService:
+    """Versioned meeting-pack cache with background generation jobs."""
+
+    def __init__(
+        self,
+        client,
+        ttl: float = 3600.0,
+        max_entries: int = 512,
+        concurrency: int = 2,
+        refresh_interval: float = 300.0,
+        upcoming_window_hours: float = 48.0,
+        max_jobs: int = 1000,
+        shared: Optional[SharedCacheStore] = None,
+    ):
+        """
+        Args:
+            client: TransitionOSClient used to read households and generate packs
+            ttl: Seconds a generated pack is served
+            max_entries: Maximum number of cached packs
+            concurrency: Maximum number of packs generated at once
+            refresh_interval: Seconds between pre-generation sweeps (0 disables them)
+            upcoming_window_hours: How far ahead a meeting counts as "upcoming"
+            max_jobs: Finished jobs kept for polling before the oldest are dropped
+            shared: Optional cross-worker store, so a pack generated by one worker serves all
+        """
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self.window = timedelta(hours=upcoming_window_hours)
+        self.max_jobs = max_jobs
+        # household_id -> (version, pack); a list once it has been through the shared store
+        self._packs = TTLCache(ttl=ttl, stale_ttl=0, max_entries=max_entries, shared=shared)
+        self._concurrency = concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._jobs: "OrderedDict[str, MeetingPackJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._active: Dict[tuple, str] = {}
+        self._scheduler: Optional[asyncio.Task] = None
+        self.generated = 0
+        self.failures = 0
+        self.sweeps = 0
+
+    # ==================== Lifecycle ====================
+
+    async def start(self) -> None:
+        """Start the pre-generation scheduler."""
+        self._semaphore = asyncio.Semaphore(self._concurrency)
+        if self.refresh_interval > 0 and self._scheduler is None:
+            self._scheduler = asyncio.create_task(self._run_scheduler())
+
+    async def stop(self) -> None:
+        """Stop the scheduler and cancel running jobs."""
+        tasks = list(self._tasks.values())
+        if self._scheduler is not None:
+            tasks.append(self._scheduler)
+            self._scheduler = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._active.clear()
+
+    # ==================== Packs ====================
+
+    async def current_version(self, household_id: int) -> str:
+        """Version of the household as it is now (served from the client's cache)."""
+        return household_version(await self.client.get_household(household_id))
+
+    def get_cached(self, household_id: int, version: str) -> Optional[Dict]:
+        """Return the cached pack for this household version, if any."""
+        entry, state = self._packs.lookup(household_id)
+        if state == FRESH and entry[0] == version:
+            return entry[1]
+        return None
+
+    def invalidate(self, household_id: Optional[int] = None) -> None:
+        """Drop cached packs for one household, or all of them."""
+        if household_id is None:
+            self._packs.clear()
+        else:
+            self._packs.invalidate(household_id)
+
+    def submit(self, household_id: int, version: str) -> MeetingPackJob:
+        """Queue generation of a pack; an identical queued or running job is reused."""
+        job_id = self._active.get((household_id, version))
+        if job_id is not None:
+            return self._jobs[job_id]
+
+        job = MeetingPackJob(
+            job_id=uuid.uuid4().hex,
+            household_id=household_id,
+            version=version,
+            created_at=time.time(),
+        )
+        self._jobs[job.job_id] = job
+        self._active[(household_id, version)] = job.job_id
+        self._tasks[job.job_id] = asyncio.create_task(self._run_job(job))
+        self._prune_jobs()
+        return job
+
+    async def get_or_generate(self, household_id: int) -> Dict:
+        """Return the current pack, generating it (and waiting) if it is not cached."""
+        version = await self.current_version(household_id)
+        pack = self.get_cached(household_id, version)
+        if pack is not None:
+            return pack
+        job = self.submit(household_id, version)
+        task = self._tasks.get(job.job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        pack = self.get_job_pack(job)
+        if pack is None:
+            raise RuntimeError(f"Meeting pack generation failed: {job.error or 'pack evicted'}")
+        return pack
+
+    def get_job(self, job_id: str) -> Optional[MeetingPackJob]:
+        return self._jobs.get(job_id)
+
+    def get_job_pack(self, job: MeetingPackJob) -> Optional[Dict]:
+        """Return the pack a finished job produced, if it is still cached."""
+        if job.status != JOB_DONE:
+            return None
+        entry = self._packs.peek(job.household_id)
+        if entry is not None and entry[0] == job.version:
+            return entry[1]
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        statuses: Dict[str, int] = {}
+        for job in self._jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "cached_packs": len(self._packs),
+            "cache": self._packs.stats(),
+            "jobs": statuses,
+            "generated": self.generated,
+            "failures": self.failures,
+            "sweeps": self.sweeps,
+        }
+
+    # ==================== Background Work ====================
+
+    async def _run_job(self, job: MeetingPackJob) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        try:
+            async with self._semaphore:
+                job.status = JOB_RUNNING
+                pack = await self.client.get_meeting_pack(job.household_id)
+            self._packs.set(job.household_id, (job.version, pack))
+            job.status = JOB_DONE
+            self.generated += 1
+        except asyncio.CancelledError:
+            job.status = JOB_FAILED
+            job.error = "cancelled"
+            raise
+        except Exception as e:
+            job.status = JOB_FAILED
+            job.error = str(e)
+            self.failures += 1
+            logger.warning(f"Meeting pack generation failed for household {job.household_id}: {e}")
+        finally:
+            job.finished_at = time.time()
+            self._tasks.pop(job.job_id, None)
+            self._active.pop((job.household_id, job.version), None)
+
+    async def _run_scheduler(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Meeting pack sweep failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def sweep(self) -> int:
+        """Queue packs for every household that needs one and has no current pack."""
+        self.sweeps += 1
+        queued = 0
+        async for household in self.client.iter_households():
+            if not needs_pack(household, self.window) or household.get("id") is None:
+                continue
+            household_id = int(household["id"])
+            version = await self.current_version(household_id)
+            if self.get_cached(household_id, version) is None:
+                self.submit(household_id, version)
+                queued += 1
+        if queued:
+            logger.info(f"Queued {queued} meeting pack(s) for pre-generation")
+        return queued
+
+    def _prune_jobs(self) -> None:
+        while len(self._jobs) > self.max_jobs:
+            oldest_id = next(
+                (job_id for job_id, job in self._jobs.items() if job.status in (JOB_DONE, JOB_FAILED)),
+                None,
+            )
+            if oldest_id is None:
+                break
+            del self._jobs[oldest_id]
@@ -0,0 +1,345 @@
+"""
+Task Completion Outbox for Clawdbot (EC2)
+
+With the outbox enabled, POST /tasks/{id}/complete records the completion
+in a local SQLite file (WAL, fsync on commit) and answers 202 at once; a
+background drainer then delivers the entries to the backend:
+
+    - in order: the oldest undelivered entry goes first, and later entries
+      wait while it is being retried
+    - with retries: transient failures (timeouts, 5xx, 429, open circuit)
+      back off with jitter; a 4xx, or running out of attempts, marks the
+      entry failed so it stops blocking the queue
+    - idempotently: every entry carries an idempotency key (the client's
+      Idempotency-Key header, or a generated one) that is sent to the backend
+      on each attempt and deduplicates client retries locally
+
+Several workers may share one outbox file; a lease on the entry being
+delivered keeps them from delivering it twice, and an entry whose worker
+died is picked up again once its lease expires.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from openclaw.clawdbot_resilience import CircuitOpenError, DeadlineExceeded, RetryPolicy, is_transient
+
+logger = logging.getLogger(__name__)
+
+# Entry states
+PENDING = "pending"
+DELIVERING = "delivering"
+DELIVERED = "delivered"
+FAILED = "failed"
+
+_COLUMNS = (
+    "id", "idempotency_key", "task_id", "note", "status", "attempts", "next_attempt_at",
+    "lease_until", "created_at", "updated_at", "last_error", "result",
+)
+
+
+def _entry(row: Tuple) -> Dict[str, Any]:
+    entry = dict(zip(_COLUMNS, row))
+    entry["result"] = json.loads(entry["result"]) if entry["result"] is not None else None
+    return entry
+
+
+class TaskOutbox:
+    """Durable write-behind queue of task completions, drained to the backend in order."""
+
+    def __init__(
+        self,
+        path: str,
+        client,
+        on_delivered: Optional[Callable[[Dict[str, Any], Any], None]] = None,
+        max_attempts: int = 10,
+        retry_policy: Optional[RetryPolicy] = None,
+        poll_interval: float = 1.0,
+        lease: float = 60.0,
+        retention: float = 86400.0,
+    ):
+        """
+        Args:
+            path: SQLite file holding the outbox (must survive restarts, so not /dev/shm)
+            client: TransitionOSClient used for delivery
+            on_delivered: Called with (entry, backend result) after each delivery
+            max_attempts: Delivery attempts before an entry is marked failed
+            retry_policy: Backoff between attempts (default: 1s doubling up to 5 min, jittered)
+            poll_interval: Seconds between checks when no new entries wake the drainer
+            lease: Seconds an entry stays claimed by the worker delivering it
+            retention: Seconds delivered entries are kept for status lookups
+        """
+        self.path = path
+        self.client = client
+        self.on_delivered = on_delivered
+        self.max_attempts = max(1, max_attempts)
+        self.retry_policy = retry_policy or RetryPolicy(base_delay=1.0, max_delay=300.0)
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.retention = retention
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._drainer: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.failed = 0
+        self.retried = 0
+
+    # ==================== Storage ====================
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # FULL: an acknowledged completion must survive a power loss, not just a crash
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS task_outbox ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " idempotency_key TEXT NOT NULL UNIQUE,"
+                " task_id INTEGER NOT NULL, note TEXT,"
+                " status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+                " next_attempt_at REAL NOT NULL, lease_until REAL,"
+                " created_at REAL NOT NULL, updated_at REAL NOT NULL,"
+                " last_error TEXT, result TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS task_outbox_status ON task_outbox (status, id)")
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run a storage call in a thread so fsyncs never stall the event loop."""
+        def locked():
+            with self._lock:
+                return fn(*args)
+
+        return await asyncio.to_thread(locked)
+
+    def _select(self, where: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        rows = self._db().execute(f"SELECT {', '.join(_COLUMNS)} FROM task_outbox {where}", params).fetchall()
+        return [_entry(row) for row in rows]
+
+    def _insert(self, task_id: int, note: Optional[str], key: str) -> Tuple[Dict[str, Any], bool]:
+        now = time.time()
+        cursor = self._db().execute(
+            "INSERT OR IGNORE INTO task_outbox"
+            " (idempotency_key, task_id, note, status, next_attempt_at, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, task_id, note, PENDING, now, now, now),
+        )
+        entry = self._select("WHERE idempotency_key = ?", (key,))[0]
+        return entry, cursor.rowcount == 1
+
+    def _claim(self) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+        """
+        Claim the oldest undelivered entry if it is due. Returns (entry, None),
+        or (None, seconds until it is due / None if the queue is empty).
+        """
+        conn = self._db()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            heads = self._select(
+                "WHERE status IN (?, ?) ORDER BY id LIMIT 1", (PENDING, DELIVERING)
+            )
+            if not heads:
+                conn.execute("COMMIT")
+                return None, None
+            head = heads[0]
+            if head["status"] == DELIVERING and head["lease_until"] > now:
+                # Another worker is delivering it
+                conn.execute("COMMIT")
+                return None, head["lease_until"] - now
+            if head["status"] == PENDING and head["next_attempt_at"] > now:
+                conn.execute("COMMIT")
+                return None, head["next_attempt_at"] - now
+            conn.execute(
+                "UPDATE task_outbox SET status = ?, lease_until = ?, attempts = attempts + 1, updated_at = ?"
+                " WHERE id = ?",
+                (DELIVERING, now + self.lease, now, head["id"]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        head.update(status=DELIVERING, attempts=head["attempts"] + 1)
+        return head, None
+
+    def _finish(
+        self, entry_id: int, status: str, error: Optional[str] = None, result: Any = None,
+        next_attempt_at: Optional[float] = None,
+    ) -> None:
+        now = time.time()
+        self._db().execute(
+            "UPDATE task_outbox SET status = ?, lease_until = NULL, last_error = ?, result = ?,"
+            " next_attempt_at = COALESCE(?, next_attempt_at), updated_at = ? WHERE id = ?",
+            (
+                status,
+                error,
+                json.dumps(result, default=str) if result is not None else None,
+                next_attempt_at,
+                now,
+                entry_id,
+            ),
+        )
+
+    def _purge(self) -> None:
+        self._db().execute(
+            "DELETE FROM task_outbox WHERE status = ? AND updated_at < ?",
+            (DELIVERED, time.time() - self.retention),
+        )
+
+    def _counts(self) -> Dict[str, Any]:
+        conn = self._db()
+        counts = {status: 0 for status in (PENDING, DELIVERING, DELIVERED, FAILED)}
+        for status, count in conn.execute("SELECT status, COUNT(*) FROM task_outbox GROUP BY status"):
+            counts[status] = count
+        oldest = conn.execute(
+            "SELECT MIN(created_at) FROM task_outbox WHERE status IN (?, ?)", (PENDING, DELIVERING)
+        ).fetchone()[0]
+        counts["oldest_pending_age_seconds"] = round(time.time() - oldest, 3) if oldest is not None else None
+        return counts
+
+    def _requeue(self, entry_id: int) -> bool:
+        now = time.time()
+        cursor = self._db().execute(
+            "UPDATE task_outbox SET status = ?, attempts = 0, next_attempt_at = ?, updated_at = ?"
+            " WHERE id = ? AND status = ?",
+            (PENDING, now, now, entry_id, FAILED),
+        )
+        return cursor.rowcount == 1
+
+    # ==================== API ====================
+
+    async def enqueue(
+        self, task_id: int, note: Optional[str] = None, idempotency_key: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Durably record a task completion. Returns (entry, created); a repeated
+        idempotency key returns the existing entry with created=False.
+        """
+        key = idempotency_key or f"clawdbot-{uuid.uuid4()}"
+        entry, created = await self._run(self._insert, int(task_id), note, key)
+        if created and self._wakeup is not None:
+            self._wakeup.set()
+        return entry, created
+
+    async def get(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        entries = await self._run(self._select, "WHERE id = ?", (entry_id,))
+        return entries[0] if entries else None
+
+    async def entries(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Entries in delivery order, optionally only those in one state."""
+        if status is None:
+            return await self._run(self._select, "WHERE status != ? ORDER BY id LIMIT ?", (DELIVERED, limit))
+        return await self._run(self._select, "WHERE status = ? ORDER BY id LIMIT ?", (status, limit))
+
+    async def retry(self, entry_id: int) -> bool:
+        """Put a failed entry back in the queue (at its original position)."""
+        requeued = await self._run(self._requeue, entry_id)
+        if requeued and self._wakeup is not None:
+            self._wakeup.set()
+        return requeued
+
+    async def stats(self) -> Dict[str, Any]:
+        return {
+            **(await self._run(self._counts)),
+            "delivered_total": self.delivered,
+            "failed_total": self.failed,
+            "retries_total": self.retried,
+        }
+
+    # ==================== Drainer ====================
+
+    async def start(self) -> None:
+        """Open the outbox and start delivering entries."""
+        await self._run(self._db)
+        self._wakeup = asyncio.Event()
+        if self._drainer is None:
+            self._drainer = asyncio.create_task(self._run_drainer())
+
+    async def stop(self) -> None:
+        """Stop the drainer; an entry cut off mid-delivery is retried after its lease."""
+        if self._drainer is not None:
+            self._drainer.cancel()
+            await asyncio.gather(self._drainer, return_exceptions=True)
+            self._drainer = None
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+    async def _run_drainer(self) -> None:
+        last_purge = 0.0
+        while True:
+            self._wakeup.clear()
+            try:
+                wait = await self.drain_once()
+                if time.monotonic() - last_purge > 3600:
+                    await self._run(self._purge)
+                    last_purge = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task outbox drain failed: {e}")
+                wait = self.poll_interval
+            if wait == 0:
+                continue
+            # New entries wake the drainer early; other workers' entries are found by polling
+            timeout = self.poll_interval if wait is None else min(wait, self.poll_interval)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain_once(self) -> Optional[float]:
+        """
+        Deliver the head entry if it is due. Returns 0 when one was processed,
+        else the seconds until the head is due (None when the queue is empty).
+        """
+        entry, wait = await self._run(self._claim)
+        if entry is None:
+            return wait
+        try:
+            result = await self.client.complete_task(
+                entry["task_id"], entry["note"], idempotency_key=entry["idempotency_key"]
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            transient = isinstance(e, (CircuitOpenError, DeadlineExceeded)) or is_transient(e)
+            if transient and entry["attempts"] < self.max_attempts:
+                delay = max(self.retry_policy.backoff(entry["attempts"] - 1), 0.05)
+                if isinstance(e, CircuitOpenError):
+                    delay = max(delay, e.retry_after)
+                self.retried += 1
+                await self._run(self._finish, entry["id"], PENDING, _describe(e), None, time.time() + delay)
+                logger.info(f"Outbox entry {entry['id']} (task {entry['task_id']}) retrying in {delay:.1f}s: {e}")
+            else:
+                self.failed += 1
+                await self._run(self._finish, entry["id"], FAILED, _describe(e))
+                logger.warning(f"Outbox entry {entry['id']} (task {entry['task_id']}) failed: {e}")
+            return 0.0
+
+        self.delivered += 1
+        await self._run(self._finish, entry["id"], DELIVERED, None, result)
+        if self.on_delivered is not None:
+            try:
+                self.on_delivered(entry, result)
+            except Exception as e:
+                logger.warning(f"Outbox on_delivered callback failed: {e}")
+        return 0.0
+
+
+def _describe(error: BaseException) -> str:
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"HTTP {error.response.status_code}: {error.response.text[:200]}"
+    return f"{type(error).__name__}: {error}"
@@ -0,0 +1,186 @@
+"""
+Resilience primitives for Clawdbot (EC2)
+
+Keeps Clawdbot's own latency bounded when the Transition OS backend is slow
+or failing:
+
+    - Deadlines: each incoming request gets a time budget (from the
+      X-Request-Timeout-Ms header or a default) carried in a context variable,
+      so every backend call made while serving it knows how long it may take.
+    - RetryPolicy: bounded retries with full-jitter exponential backoff for
+      idempotent calls that failed transiently.
+    - CircuitBreaker: after repeated failures an endpoint fails fast for a
+      cool-down period instead of tying up workers; one trial call then
+      decides whether it closes again.
+"""
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+
+DEADLINE_HEADER = "x-request-timeout-ms"
+
+# Absolute time.monotonic() deadline for the request being served, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("clawdbot_deadline", default=None)
+
+# Backend responses worth retrying (and counting against the circuit)
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+
+class DeadlineExceeded(Exception):
+    """The incoming request's time budget ran out before the backend answered."""
+
+
+class BackendDeadlineExceeded(DeadlineExceeded):
+    """The budget ran out while waiting on the backend (counts against its circuit)."""
+
+
+class CircuitOpenError(Exception):
+    """The circuit for a backend endpoint is open; the call was not attempted."""
+
+    def __init__(self, operation: str, retry_after: float):
+        super().__init__(f"Backend circuit open for {operation}; retry in {retry_after:.1f}s")
+        self.operation = operation
+        self.retry_after = retry_after
+
+
+# ==================== Deadlines ====================
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Run the enclosed code with a deadline `seconds` from now (None = no deadline)."""
+    token = _deadline.set(time.monotonic() + seconds if seconds is not None else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class DeadlineMiddleware:
+    """ASGI middleware giving each HTTP request a deadline from its header or a default budget."""
+
+    def __init__(self, app, default_timeout: Optional[float] = 25.0, max_timeout: Optional[float] = None):
+        self.app = app
+        self.default_timeout = default_timeout
+        self.max_timeout = max_timeout or default_timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = self.default_timeout
+        for name, value in scope.get("headers", ()):
+            if name == DEADLINE_HEADER.encode():
+                try:
+                    budget = max(float(value) / 1000.0, 0.0)
+                except ValueError:
+                    pass
+                break
+        if budget is not None and self.max_timeout is not None:
+            budget = min(budget, self.max_timeout)
+
+        with deadline_scope(budget):
+            await self.app(scope, receive, send)
+
+
+# ==================== Retries ====================
+
+class RetryPolicy:
+    """Bounded retries with full-jitter exponential backoff."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.1, max_delay: float = 2.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (0-based): uniform in [0, min(cap, base * 2^attempt)]."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def is_transient(error: BaseException) -> bool:
+    """True for failures that say nothing about the request itself (timeouts, resets, 5xx, 429)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS or error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+# ==================== Circuit Breaker ====================
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker (closed → open → half-open → closed)."""
+
+    def __init__(self, operation: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.operation = operation
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now."""
+        if self.state == CLOSED:
+            return
+        elapsed = time.monotonic() - self.opened_at
+        if self.state == OPEN and elapsed >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError(self.operation, max(self.reset_timeout - elapsed, 0.0))
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._trial_in_flight = False
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor failed in a way that counts (e.g. a 4xx)."""
+        if self.state == HALF_OPEN:
+            self.record_success()
+
+    def abandon(self) -> None:
+        """End a call that decided nothing (cancelled, or out of budget before it was sent)."""
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN:
+            self.state = OPEN  # still open; the next call becomes the trial
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
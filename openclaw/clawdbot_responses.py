@@ -0,0 +1,96 @@
+"""
+Fast JSON Responses for Clawdbot (EC2)
+
+FastAPI's default path for a returned dict is: validate it against the
+response_model, walk it with jsonable_encoder, then encode it with the
+standard-library json module. Most of what Clawdbot returns is backend JSON
+it has only just decoded, so that work buys nothing.
+
+FastJSONResponse encodes with orjson when it is installed (falling back to
+json), and trusted_json() wraps an already JSON-safe payload so the endpoint
+returns it as-is, skipping validation and jsonable_encoder. etag_json() adds
+an ETag and answers conditional requests with 304 Not Modified.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode the few non-JSON types that reach a response (pydantic models, sets, ...)."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode `content` as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def trusted_json(
+    content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None
+) -> FastJSONResponse:
+    """
+    Return an already JSON-safe payload (e.g. backend JSON) without response_model
+    validation or jsonable_encoder; FastAPI passes Response objects through untouched.
+    """
+    return FastJSONResponse(content=content, status_code=status_code, headers=headers)
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for an encoded response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag` (RFC 9110 §13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def etag_json(request: Request, content: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    trusted_json() with an ETag: 304 (no body) when the client's If-None-Match
+    still matches, so an unchanged poll costs a header round-trip.
+    """
+    response = trusted_json(content, headers=headers)
+    etag = make_etag(response.body)
+    # Browsers may keep the body but must revalidate it before each use
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={**(headers or {}), **cache_headers})
+    response.headers.update(cache_headers)
+    return response
@@ -10,25 +10,128 @@ Architecture:
 """
 
 import os
+import re
+import json
 import sys
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 from contextlib import asynccontextmanager
 
 # Add parent directory to path to import backend modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, HTTPException
+# Run as a script, uvicorn workers re-run this file as __mp_main__ and then
+# import "openclaw.clawdbot_server:app"; alias it so the module executes once
+if __name__ in ("__main__", "__mp_main__"):
+    sys.modules.setdefault("openclaw.clawdbot_server", sys.modules[__name__])
+
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
 # Import the backend client
-from openclaw.clawdbot_backend_client import TransitionOSClient, backend_client
+from openclaw.clawdbot_backend_client import (
+    SHARED_CACHE_PATH,
+    TransitionOSClient,
+    backend_client,
+    household_id_of,
+)
+from openclaw.clawdbot_aggregates import DashboardAggregates
+from openclaw.clawdbot_cache import SharedCacheStore
+from openclaw.clawdbot_intents import INT_ARGS, IntentMatch, IntentRouter
+from openclaw.clawdbot_sessions import ChatSession, SessionStore
+from openclaw.clawdbot_meeting_packs import JOB_DONE, JOB_FAILED, MeetingPackService
+from openclaw.clawdbot_outbox import TaskOutbox
+from openclaw.clawdbot_events import EventAuthError, EventProcessor, EventVerifier, parse_events
+from openclaw.clawdbot_metrics import (
+    CHAT_INTENT_LATENCY,
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    REGISTRY as METRICS_REGISTRY,
+    CallbackGauge,
+    MetricsMiddleware,
+)
+from openclaw.clawdbot_admission import (
+    INTERACTIVE,
+    AdmissionMiddleware,
+    ConcurrencyLimiter,
+    Overloaded,
+    RateLimiter,
+    admit,
+    client_key,
+)
+from openclaw.clawdbot_compression import CompressionMiddleware
+from openclaw.clawdbot_resilience import CircuitOpenError, DeadlineExceeded, DeadlineMiddleware, deadline_scope
+from openclaw.clawdbot_responses import FastJSONResponse, dumps as json_dumps, etag_json, trusted_json
+from openclaw.clawdbot_tracing import REQUEST_ID_HEADER, TracingMiddleware, configure as configure_tracing, span
+from openclaw.clawdbot_websocket import ChatConnection, ConnectionManager, advisor_key
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Materialized dashboard counts, rebuilt at most once per TTL and patched on writes
+dashboard_aggregates = DashboardAggregates(ttl=float(os.getenv("CLAWDBOT_AGGREGATES_TTL", "300")))
+
+# Open /chat/ws connections; households turning AT_RISK are pushed to them
+chat_connections = ConnectionManager(
+    push_statuses=[
+        status.strip() for status in os.getenv("CLAWDBOT_WS_PUSH_STATUSES", "AT_RISK").split(",") if status.strip()
+    ],
+)
+dashboard_aggregates.add_status_listener(chat_connections.household_status_changed)
+
+# Pre-generated, versioned meeting packs served without holding a worker
+meeting_packs = MeetingPackService(
+    backend_client,
+    ttl=float(os.getenv("CLAWDBOT_MEETING_PACK_TTL", "3600")),
+    concurrency=int(os.getenv("CLAWDBOT_MEETING_PACK_CONCURRENCY", "2")),
+    refresh_interval=float(os.getenv("CLAWDBOT_MEETING_PACK_INTERVAL", "300")),
+    upcoming_window_hours=float(os.getenv("CLAWDBOT_MEETING_PACK_WINDOW_HOURS", "48")),
+    shared=SharedCacheStore(SHARED_CACHE_PATH, namespace="meeting_packs") if SHARED_CACHE_PATH else None,
+)
+
+# Write-behind task completions: with a path set, POST /tasks/{id}/complete answers 202
+# and a background drainer delivers the completion to the backend
+TASK_OUTBOX_PATH = os.getenv("CLAWDBOT_TASK_OUTBOX_PATH")
+task_outbox = TaskOutbox(
+    TASK_OUTBOX_PATH,
+    backend_client,
+    on_delivered=lambda entry, result: dashboard_aggregates.task_completed(household_id_of(result)),
+    max_attempts=int(os.getenv("CLAWDBOT_TASK_OUTBOX_MAX_ATTEMPTS", "10")),
+) if TASK_OUTBOX_PATH else None
+
+# Change events pushed by the backend to /events (disabled unless a token or secret is set)
+event_verifier = EventVerifier(
+    token=os.getenv("CLAWDBOT_EVENTS_TOKEN") or None,
+    secret=os.getenv("CLAWDBOT_EVENTS_SECRET") or None,
+    tolerance=float(os.getenv("CLAWDBOT_EVENTS_TOLERANCE", "300")),
+)
+event_processor = EventProcessor(backend_client, dashboard_aggregates, meeting_packs)
+
+# Spans of each request (routing, backend calls, serialization) appended to a JSON-lines file;
+# request IDs and trace context reach the backend either way
+tracer = configure_tracing(
+    os.getenv("CLAWDBOT_TRACE_FILE") or None,
+    sample_rate=float(os.getenv("CLAWDBOT_TRACE_SAMPLE_RATE", "1")),
+)
+
+# Largest page /households serves; chat lists only the first CHAT_HOUSEHOLDS_LIMIT rows
+HOUSEHOLDS_MAX_LIMIT = int(os.getenv("CLAWDBOT_HOUSEHOLDS_MAX_LIMIT", "500"))
+CHAT_HOUSEHOLDS_LIMIT = int(os.getenv("CLAWDBOT_CHAT_HOUSEHOLDS_LIMIT", "50"))
+
+# Batch task completion limits
+BATCH_MAX_TASKS = int(os.getenv("CLAWDBOT_BATCH_MAX_TASKS", "200"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("CLAWDBOT_BATCH_CONCURRENCY", "8"))
+
+# Per-session conversation state for follow-up questions
+chat_sessions = SessionStore(
+    ttl=float(os.getenv("CLAWDBOT_SESSION_TTL", "1800")),
+    max_sessions=int(os.getenv("CLAWDBOT_SESSION_MAX", "10000")),
+    max_bytes=int(os.getenv("CLAWDBOT_SESSION_MAX_BYTES", str(64 * 1024 * 1024))),
+)
+
 
 # ==================== Pydantic Models ====================
 
@@ -57,6 +160,17 @@ class TaskCompleteRequest(BaseModel):
     note: Optional[str] = None
 
 
+class TaskCompleteBatchItem(BaseModel):
+    task_id: int
+    note: Optional[str] = None
+
+
+class TaskCompleteBatchRequest(BaseModel):
+    tasks: list[TaskCompleteBatchItem]
+    note: Optional[str] = None  # default note for items without one
+    concurrency: Optional[int] = None
+
+
 class QueryRequest(BaseModel):
     query_type: str  # "households", "tasks", "documents", "dashboard"
     filters: Optional[Dict] = None
@@ -69,8 +183,20 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     logger.info("Starting Clawdbot Server on EC2...")
     logger.info(f"Backend URL: {backend_client.base_url}")
-    yield
-    logger.info("Shutting down Clawdbot Server...")
+    await backend_client.open()
+    await meeting_packs.start()
+    if task_outbox is not None:
+        await task_outbox.start()
+    try:
+        yield
+    finally:
+        logger.info("Shutting down Clawdbot Server...")
+        if task_outbox is not None:
+            await task_outbox.stop()
+        await meeting_packs.stop()
+        await backend_client.aclose()
+        if tracer.exporter is not None:
+            tracer.exporter.close()
 
 
 app = FastAPI(
@@ -78,17 +204,96 @@ app = FastAPI(
     description="AI Assistant for Transition OS - runs on EC2",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
-# CORS - Allow frontend to connect
+# gzip/brotli for large JSON bodies; SSE is never compressed (it must flush per event)
+if os.getenv("CLAWDBOT_COMPRESSION", "true").strip().lower() in ("1", "true", "yes", "on"):
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=int(os.getenv("CLAWDBOT_COMPRESSION_MIN_SIZE", "1024")),
+        gzip_level=int(os.getenv("CLAWDBOT_GZIP_LEVEL", "6")),
+        brotli_quality=int(os.getenv("CLAWDBOT_BROTLI_QUALITY", "4")),
+        skip_paths=[
+            path.strip()
+            for path in os.getenv("CLAWDBOT_COMPRESSION_SKIP_PATHS", "/health,/metrics").split(",")
+            if path.strip()
+        ],
+    )
+
+# Per-user rate limits and a global in-flight cap; bulk routes yield to interactive ones.
+# Rate limiting is opt-in: requests without X-User-Id are keyed by client IP, so
+# everyone behind one NAT or proxy would share a bucket until the frontend sends it.
+CLAWDBOT_RATE_LIMIT_RPS = float(os.getenv("CLAWDBOT_RATE_LIMIT_RPS", "0"))
+admission_rate_limiter = RateLimiter(
+    rate=CLAWDBOT_RATE_LIMIT_RPS,
+    burst=float(os.getenv("CLAWDBOT_RATE_LIMIT_BURST", "50")),
+) if CLAWDBOT_RATE_LIMIT_RPS > 0 else None
+admission_concurrency = ConcurrencyLimiter(
+    max_in_flight=int(os.getenv("CLAWDBOT_MAX_IN_FLIGHT", "64")),
+    max_queue=int(os.getenv("CLAWDBOT_MAX_QUEUE", "128")),
+    max_wait=float(os.getenv("CLAWDBOT_QUEUE_TIMEOUT", "2")),
+    bulk_share=float(os.getenv("CLAWDBOT_BULK_SHARE", "0.5")),
+)
+ADMISSION_ENABLED = os.getenv("CLAWDBOT_ADMISSION", "true").strip().lower() in ("1", "true", "yes", "on")
+if ADMISSION_ENABLED:
+    app.add_middleware(
+        AdmissionMiddleware,
+        rate_limiter=admission_rate_limiter,
+        concurrency=admission_concurrency,
+        # Backend change events must never be shed: a dropped one leaves the cache wrong until its TTL
+        skip_paths=["/health", "/metrics", "/stats", "/events"],
+        bulk_paths=[
+            path.strip()
+            for path in os.getenv(
+                "CLAWDBOT_BULK_PATHS",
+                "/households,/tasks/complete:batch,/households/*/meeting-pack,/documents/validate",
+            ).split(",")
+            if path.strip()
+        ],
+    )
+
+# CORS - Allow frontend to connect (outside admission control so 429/503 responses carry CORS headers)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Configure this properly for production
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # ETag lets the frontend send If-None-Match on its next poll; X-Request-ID identifies the trace
+    expose_headers=["ETag", "Retry-After", "X-Request-ID"],
 )
 
+# Per-request time budget shared by every backend call made while serving it
+REQUEST_DEADLINE = float(os.getenv("CLAWDBOT_REQUEST_DEADLINE", "25"))
+app.add_middleware(
+    DeadlineMiddleware,
+    default_timeout=REQUEST_DEADLINE,
+    max_timeout=float(os.getenv("CLAWDBOT_REQUEST_DEADLINE_MAX", "60")),
+)
+
+# Request latency per route
+app.add_middleware(MetricsMiddleware)
+
+# Request ID and root span (added last so it is outermost and covers everything)
+app.add_middleware(TracingMiddleware)
+
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """Backend endpoint is failing: fail fast and tell the caller when to retry."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
+
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    """The request's time budget ran out waiting on the backend."""
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
 
 # ==================== Health & Status ====================
 
@@ -102,6 +307,136 @@ async def health_check():
     }
 
 
+@app.get("/stats")
+async def stats():
+    """Runtime statistics used to size the backend connection pool and cache."""
+    return {
+        "pool": backend_client.pool_stats(),
+        "cache": backend_client.cache_stats(),
+        "coalescing": backend_client.coalescing_stats(),
+        "batching": backend_client.batching_stats(),
+        "aggregates": dashboard_aggregates.stats(),
+        "sessions": chat_sessions.stats(),
+        "meeting_packs": meeting_packs.stats(),
+        "circuit_breakers": backend_client.breaker_stats(),
+        "websockets": chat_connections.stats(),
+        "task_outbox": await task_outbox.stats() if task_outbox is not None else {"enabled": False},
+        "events": {"enabled": event_verifier.enabled, **event_processor.stats()},
+        "tracing": tracer.stats(),
+        "admission": {
+            "rate_limit": admission_rate_limiter.stats() if admission_rate_limiter is not None else {"enabled": False},
+            "concurrency": admission_concurrency.stats(),
+        },
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics."""
+    return Response(content=METRICS_REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+def _cache_metric(field: str) -> Dict[tuple, float]:
+    samples = {}
+    for name, cache_stats in (
+        ("households", backend_client.cache_stats()),
+        ("meeting_packs", meeting_packs.stats()["cache"]),
+    ):
+        if field in cache_stats:
+            samples[(name,)] = cache_stats[field]
+    return samples
+
+
+def _pool_utilisation() -> Dict[tuple, float]:
+    pool = backend_client.pool_stats()
+    limit = pool["max_connections"] or 0
+    return {(): pool["active_connections"] / limit if limit else 0.0}
+
+
+CallbackGauge(
+    "clawdbot_cache_hit_ratio",
+    "Share of cache lookups served from cache (fresh or stale).",
+    lambda: _cache_metric("hit_ratio"),
+    ["cache"],
+)
+CallbackGauge(
+    "clawdbot_cache_entries",
+    "Entries currently held in each cache.",
+    lambda: _cache_metric("entries"),
+    ["cache"],
+)
+CallbackGauge(
+    "clawdbot_cache_bytes",
+    "Estimated size of each cache in bytes.",
+    lambda: _cache_metric("bytes"),
+    ["cache"],
+)
+CallbackGauge(
+    "clawdbot_backend_pool_connections",
+    "Backend connections in the shared pool, by state.",
+    lambda: {
+        ("active",): backend_client.pool_stats()["active_connections"],
+        ("idle",): backend_client.pool_stats()["idle_connections"],
+    },
+    ["state"],
+)
+CallbackGauge(
+    "clawdbot_backend_pool_utilisation",
+    "Active backend connections as a fraction of the pool's max_connections.",
+    _pool_utilisation,
+)
+CallbackGauge(
+    "clawdbot_coalesced_requests",
+    "Single-flight counters: leaders hit the backend, followers shared a call.",
+    lambda: {
+        ("leaders",): backend_client.coalescing_stats()["leaders"],
+        ("followers",): backend_client.coalescing_stats()["followers"],
+    },
+    ["role"],
+)
+CallbackGauge(
+    "clawdbot_backend_circuit_open",
+    "1 while the circuit breaker for a backend endpoint is open or half-open.",
+    lambda: {
+        (operation,): 0 if breaker["state"] == "closed" else 1
+        for operation, breaker in backend_client.breaker_stats().items()
+    },
+    ["operation"],
+)
+CallbackGauge(
+    "clawdbot_admission_in_flight",
+    "Requests holding an admission slot, by priority.",
+    lambda: {(priority,): count for priority, count in admission_concurrency.in_flight.items()},
+    ["priority"],
+)
+CallbackGauge(
+    "clawdbot_admission_queue_depth",
+    "Requests waiting for an admission slot, by priority.",
+    lambda: {(priority,): count for priority, count in admission_concurrency.stats()["queued"].items()},
+    ["priority"],
+)
+CallbackGauge(
+    "clawdbot_websocket_connections",
+    "Open /chat/ws connections.",
+    lambda: {(): len(chat_connections)},
+)
+CallbackGauge(
+    "clawdbot_task_outbox_deliveries",
+    "Task outbox delivery outcomes since start (delivered, failed, retried).",
+    lambda: {
+        ("delivered",): task_outbox.delivered,
+        ("failed",): task_outbox.failed,
+        ("retried",): task_outbox.retried,
+    } if task_outbox is not None else {},
+    ["outcome"],
+)
+CallbackGauge(
+    "clawdbot_chat_sessions",
+    "Chat sessions currently held in memory.",
+    lambda: {(): len(chat_sessions)},
+)
+
+
 # ==================== Chat / Natural Language Interface ====================
 
 @app.post("/chat", response_model=ChatResponse)
@@ -110,68 +445,422 @@ async def chat(request: ChatRequest):
     Main chat endpoint for the frontend.
     Processes natural language requests and interacts with the backend.
     """
-    message = request.message.lower()
-    actions = []
-    data = None
-    response_text = ""
-
     try:
-        # Intent detection and routing
-        if "what's left" in message or "status" in message or "dashboard" in message:
-            # Get dashboard/overview
-            households = await backend_client.list_households()
-            data = {"households": households}
-            response_text = format_dashboard_response(households)
-            actions.append("listed_households")
-
-        elif "household" in message or "client" in message:
-            # Try to extract household ID or name
-            # For now, list all households
-            households = await backend_client.list_households()
-            data = {"households": households}
-            response_text = format_households_list(households)
-            actions.append("listed_households")
-
-        elif "complete" in message or "done" in message and "task" in message:
-            # Task completion would need task ID extraction
-            response_text = "To complete a task, please provide the task ID or use the /tasks/complete endpoint."
-            actions.append("requested_task_id")
-
-        elif "document" in message or "validate" in message:
-            response_text = "I can validate documents for NIGO issues. Please provide the document ID."
-            actions.append("ready_to_validate_document")
-
-        elif "meeting" in message or "pack" in message:
-            response_text = "I can prepare a meeting pack. Which household/client is the meeting for?"
-            actions.append("requested_household_for_meeting")
-
-        elif "eta" in message or "when" in message or "timeline" in message:
-            response_text = "I can predict completion times. Which workflow are you asking about?"
-            actions.append("requested_workflow_for_eta")
+        with span("chat.route"):
+            session = chat_sessions.get(request.user_id, request.session_id)
+            match = route_message(request.message, session)
+        with span("chat.intent", intent=match.intent), CHAT_INTENT_LATENCY.labels(match.intent).time():
+            result = await handle_intent(match, request, session)
+        record_turn(session, match, result)
+        # Same shape as ChatResponse; `data` is backend JSON, so skip re-validating it
+        with span("chat.serialize"):
+            return trusted_json({
+                "response": result.response,
+                "session_id": request.session_id,
+                "actions_taken": result.actions_taken,
+                "data": result.data,
+            })
+
+    except (CircuitOpenError, DeadlineExceeded):
+        raise
+    except Exception as e:
+        logger.error(f"Error processing chat: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        else:
-            response_text = (
-                "I'm Clawdbot, your Transition OS assistant. I can help you with:\n"
-                "• View dashboard and status\n"
-                "• List households and clients\n"
-                "• Complete tasks\n"
-                "• Validate documents\n"
-                "• Generate meeting packs\n"
-                "• Check ETAs and predictions\n\n"
-                "What would you like to do?"
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Streaming variant of /chat using Server-Sent Events.
+
+    Events, in order:
+        intent  {"intent": ..., "args": {...}} as soon as the message is routed
+        text    {"delta": ...} one per line of the reply
+        data    {"key": ..., "items": [...], "offset": n} list payloads in chunks
+                (other payload values arrive as {"key": ..., "value": ...})
+        done    {"session_id": ..., "actions_taken": [...]}
+        error   {"detail": ...} if processing fails
+    """
+    return StreamingResponse(
+        stream_chat_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ==================== Intent Handling ====================
+
+INTENT_DASHBOARD = "dashboard"
+INTENT_HOUSEHOLDS = "households"
+INTENT_COMPLETE_TASK = "complete_task"
+INTENT_VALIDATE_DOCUMENT = "validate_document"
+INTENT_MEETING_PACK = "meeting_pack"
+INTENT_ETA = "eta"
+INTENT_HELP = "help"
+
+HELP_TEXT = (
+    "I'm Clawdbot, your Transition OS assistant. I can help you with:\n"
+    "• View dashboard and status\n"
+    "• List households and clients\n"
+    "• Complete tasks\n"
+    "• Validate documents\n"
+    "• Generate meeting packs\n"
+    "• Check ETAs and predictions\n\n"
+    "What would you like to do?"
+)
+
+# Number of list items per SSE "data" event
+STREAM_CHUNK_SIZE = int(os.getenv("CLAWDBOT_STREAM_CHUNK_SIZE", "50"))
+
+
+class IntentResult(BaseModel):
+    response: str
+    actions_taken: list[str] = []
+    data: Optional[Dict] = None
+    awaiting: Optional[str] = None  # argument the reply asked the user for
+
+
+# Priorities keep the original routing order (dashboard words beat household
+# words, which beat task words, ...), except that meeting packs outrank the
+# generic household listing so "meeting pack for household 12" works.
+intent_router = IntentRouter(default=INTENT_HELP)
+intent_router.register(INTENT_DASHBOARD, ["what's left", "status", "dashboard"], priority=60)
+intent_router.register(INTENT_MEETING_PACK, ["meeting", "pack"], priority=55)
+intent_router.register(INTENT_HOUSEHOLDS, ["household", "client"], priority=50)
+intent_router.register(INTENT_COMPLETE_TASK, ["complete", "done"], priority=40, requires=["task"])
+intent_router.register(INTENT_VALIDATE_DOCUMENT, ["document", "validate"], priority=30)
+intent_router.register(INTENT_ETA, ["eta", "when", "timeline"], priority=10)
+
+
+# Argument each intent needs to act rather than ask
+INTENT_ARGS = {
+    INTENT_HOUSEHOLDS: "household_id",
+    INTENT_MEETING_PACK: "household_id",
+    INTENT_COMPLETE_TASK: "task_id",
+    INTENT_VALIDATE_DOCUMENT: "document_id",
+    INTENT_ETA: "workflow_id",
+}
+
+# Words that point back at an entity from an earlier turn ("meeting pack for that household")
+REFERENCE_WORDS = re.compile(r"\b(?:that|this|it|same|again)\b")
+# Completing a task is a write, so it only runs on an explicit instruction naming
+# the task ("complete task 12", "mark task 12 as done"). Anything else that routes
+# to it ("is task 12 done?", "not done with task 4 yet") is asked back for confirmation.
+COMPLETE_TASK_COMMAND = re.compile(
+    r"^\s*(?:please\s+)?(?:"
+    r"(?:complete|finish|close)\s+task\s*#?\s*\d+"
+    r"|mark\s+task\s*#?\s*\d+\s+(?:as\s+)?(?:done|complete|completed)"
+    r")(?:\s+please)?\s*[.!]?\s*$"
+)
+# Replies to a confirmation prompt
+CONFIRM_YES = re.compile(r"^\s*(?:yes|y|yeah|yep|sure|ok(?:ay)?|confirm(?:ed)?|do it|go ahead)\b[\s.!]*$")
+CONFIRM_NO = re.compile(r"^\s*(?:no|n|nope|cancel|stop|don'?t|do not)\b")
+# A reply that is just an ID, e.g. "12" or "#wf-3" after "Which workflow?"
+BARE_ID = re.compile(r"^\s*#?\s*(?P<id>(?=[\w-]*\d)\w[\w-]*)\s*[.!?]?\s*$")
+
+
+def route_message(message: str, session: Optional[ChatSession] = None) -> IntentMatch:
+    """Route a message, filling in missing IDs from the session for follow-up turns."""
+    match = intent_router.route(message)
+    if session is None:
+        return match
+
+    # Answer to a confirmation prompt ("Do you want me to mark task 12 as completed?" → "yes")
+    if session.pending_arg == "confirm":
+        arg = INTENT_ARGS[session.pending_intent]
+        text = message.lower()
+        confirmed = CONFIRM_YES.match(text) is not None
+        if arg in session.entities and (confirmed or CONFIRM_NO.match(text)):
+            return IntentMatch(
+                intent=session.pending_intent,
+                args={arg: session.entities[arg], "confirm": confirmed},
+                keywords=match.keywords,
             )
-            actions.append("provided_help")
 
-        return ChatResponse(
-            response=response_text,
-            session_id=request.session_id,
-            actions_taken=actions,
-            data=data,
+    # Answer to a question from the previous turn ("Which household?" → "household 12" / "12")
+    elif session.pending_intent and match.intent in (INTENT_HELP, INTENT_HOUSEHOLDS, session.pending_intent):
+        arg = session.pending_arg
+        value = match.args.get(arg)
+        bare = BARE_ID.match(message) if value is None else None
+        if bare is not None:
+            value = bare.group("id")
+            if arg in INT_ARGS:
+                value = int(value) if value.isdigit() else None
+        if value is not None:
+            return IntentMatch(
+                intent=session.pending_intent,
+                args={**match.args, arg: value},
+                keywords=match.keywords,
+            )
+
+    # Reference to an entity resolved earlier ("meeting pack for that household"); a
+    # remembered task_id is never completed without a yes/no confirmation (handle_intent)
+    arg = INTENT_ARGS.get(match.intent)
+    if arg and arg not in match.args and arg in session.entities and REFERENCE_WORDS.search(message.lower()):
+        match.args[arg] = session.entities[arg]
+    return match
+
+
+def record_turn(session: ChatSession, match: IntentMatch, result: IntentResult) -> None:
+    """Remember what this turn resolved and fetched for the next one."""
+    session.entities.update((arg, value) for arg, value in match.args.items() if arg != "confirm")
+    if result.awaiting:
+        session.await_argument(match.intent, result.awaiting)
+    else:
+        session.clear_pending()
+    households = (result.data or {}).get("households")
+    if isinstance(households, list):
+        session.remember_households(households)
+    chat_sessions.save(session)
+
+
+async def handle_intent(
+    match: IntentMatch, request: ChatRequest, session: Optional[ChatSession] = None
+) -> IntentResult:
+    """Run the backend calls for an intent and build the reply. Shared by /chat and /chat/stream."""
+    intent = match.intent
+    args = match.args
+
+    if intent == INTENT_DASHBOARD:
+        # Get dashboard/overview from the materialized aggregates
+        await ensure_dashboard_aggregates()
+        advisor_id = (request.context or {}).get("advisor_id")
+        summary = dashboard_aggregates.summary(advisor_id)
+        return IntentResult(
+            response=format_dashboard_response(summary),
+            actions_taken=["summarized_dashboard"],
+            data={"dashboard": summary},
         )
 
+    if intent == INTENT_HOUSEHOLDS:
+        if "household_id" in args:
+            # Always fetched: a row remembered from an earlier turn may be out of date
+            household = await backend_client.get_household(args["household_id"])
+            return IntentResult(
+                response=format_household_detail(household),
+                actions_taken=["fetched_household"],
+                data={"household": household},
+            )
+        # Only the first rows are shown, so only the pages covering them are fetched
+        households = await backend_client.list_households_page(limit=CHAT_HOUSEHOLDS_LIMIT)
+        total = dashboard_aggregates.summary()["total_households"] if dashboard_aggregates.is_fresh() else None
+        return IntentResult(
+            response=format_households_list(households, total=total),
+            actions_taken=["listed_households"],
+            data={"households": households},
+        )
+
+    if intent == INTENT_COMPLETE_TASK:
+        if "task_id" in args:
+            if args.get("confirm") is False:
+                return IntentResult(
+                    response=f"OK, task {args['task_id']} stays open.",
+                    actions_taken=["cancelled_task_completion"],
+                )
+            if not args.get("confirm") and not COMPLETE_TASK_COMMAND.match(request.message.lower()):
+                return IntentResult(
+                    response=f"Do you want me to mark task {args['task_id']} as completed? (yes/no)",
+                    actions_taken=["requested_task_confirmation"],
+                    data={"task_id": args["task_id"]},
+                    awaiting="confirm",
+                )
+            result = await backend_client.complete_task(args["task_id"])
+            dashboard_aggregates.task_completed(household_id_of(result))
+            return IntentResult(
+                response=f"✅ Task {args['task_id']} marked as completed.",
+                actions_taken=["completed_task"],
+                data={"task": result},
+            )
+        return IntentResult(
+            response="To complete a task, please provide the task ID or use the /tasks/complete endpoint.",
+            actions_taken=["requested_task_id"],
+            awaiting="task_id",
+        )
+
+    if intent == INTENT_VALIDATE_DOCUMENT:
+        if "document_id" in args:
+            result = await backend_client.validate_document(args["document_id"])
+            return IntentResult(
+                response=f"📄 Validation finished for document {args['document_id']}.",
+                actions_taken=["validated_document"],
+                data={"validation": result},
+            )
+        return IntentResult(
+            response="I can validate documents for NIGO issues. Please provide the document ID.",
+            actions_taken=["ready_to_validate_document"],
+            awaiting="document_id",
+        )
+
+    if intent == INTENT_MEETING_PACK:
+        if "household_id" in args:
+            pack = await meeting_packs.get_or_generate(args["household_id"])
+            return IntentResult(
+                response=f"📋 Meeting pack ready for household {args['household_id']}.",
+                actions_taken=["generated_meeting_pack"],
+                data={"meeting_pack": pack},
+            )
+        return IntentResult(
+            response="I can prepare a meeting pack. Which household/client is the meeting for?",
+            actions_taken=["requested_household_for_meeting"],
+            awaiting="household_id",
+        )
+
+    if intent == INTENT_ETA:
+        if "workflow_id" in args:
+            prediction = await backend_client.get_eta_prediction(args["workflow_id"])
+            return IntentResult(
+                response=f"⏱️ ETA prediction for workflow {args['workflow_id']} is ready.",
+                actions_taken=["predicted_eta"],
+                data={"eta": prediction},
+            )
+        return IntentResult(
+            response="I can predict completion times. Which workflow are you asking about?",
+            actions_taken=["requested_workflow_for_eta"],
+            awaiting="workflow_id",
+        )
+
+    return IntentResult(response=HELP_TEXT, actions_taken=["provided_help"])
+
+
+def sse_event(event: str, payload: Any) -> str:
+    """Encode one Server-Sent Event."""
+    return f"event: {event}\ndata: {json_dumps(payload).decode()}\n\n"
+
+
+async def chat_events(request: ChatRequest) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (event, payload) pairs for one chat message; shared by /chat/stream and /chat/ws."""
+    with span("chat.route"):
+        session = chat_sessions.get(request.user_id, request.session_id)
+        match = route_message(request.message, session)
+    yield "intent", {"intent": match.intent, "args": match.args}
+
+    with span("chat.intent", intent=match.intent), CHAT_INTENT_LATENCY.labels(match.intent).time():
+        result = await handle_intent(match, request, session)
+    record_turn(session, match, result)
+    for line in result.response.splitlines(keepends=True):
+        yield "text", {"delta": line}
+
+    for key, value in (result.data or {}).items():
+        if isinstance(value, list):
+            for offset in range(0, len(value), STREAM_CHUNK_SIZE):
+                chunk = value[offset:offset + STREAM_CHUNK_SIZE]
+                yield "data", {"key": key, "items": chunk, "offset": offset}
+        else:
+            yield "data", {"key": key, "value": value}
+
+    yield "done", {"session_id": request.session_id, "actions_taken": result.actions_taken}
+
+
+async def stream_chat_events(request: ChatRequest) -> AsyncIterator[str]:
+    """Yield the SSE events for one chat message."""
+    try:
+        async for event, payload in chat_events(request):
+            yield sse_event(event, payload)
+
     except Exception as e:
-        logger.error(f"Error processing chat: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error(f"Error streaming chat: {e}")
+        yield sse_event("error", {"detail": str(e)})
+
+
+async def answer_ws_message(connection: ChatConnection, frame: Dict[str, Any]) -> None:
+    """Process one chat message received on /chat/ws, sending its events as frames."""
+    message_id = frame.get("id")
+    message = frame.get("message")
+    if not isinstance(message, str) or not message.strip():
+        await connection.send({"type": "error", "id": message_id, "detail": "message must be a non-empty string"})
+        return
+
+    request = ChatRequest(
+        message=message,
+        session_id=connection.session_id,
+        user_id=connection.user_id,
+        context=frame.get("context") if isinstance(frame.get("context"), dict) else None,
+    )
+    admitted = False
+    try:
+        # Same admission rules and time budget as an HTTP /chat request
+        if ADMISSION_ENABLED:
+            key = client_key(connection.user_id, connection.websocket.client)
+            await admit(key, INTERACTIVE, admission_rate_limiter, admission_concurrency)
+            admitted = True
+        # Each message is its own trace, tagged with the request ID the connection was opened with
+        with tracer.trace(
+            "WS /chat/ws message", request_id=connection.request_id, session_id=connection.session_id
+        ), deadline_scope(REQUEST_DEADLINE):
+            async for event, payload in chat_events(request):
+                await connection.send({"type": event, "id": message_id, **payload})
+    except Overloaded as exc:
+        await connection.send({
+            "type": "error",
+            "id": message_id,
+            "detail": str(exc),
+            "status": exc.status,
+            "retry_after": round(exc.retry_after, 3),
+        })
+    except WebSocketDisconnect:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing WebSocket chat: {e}")
+        await connection.send({"type": "error", "id": message_id, "detail": str(e)})
+    finally:
+        if admitted:
+            admission_concurrency.release(INTERACTIVE)
+
+
+@app.websocket("/chat/ws")
+async def chat_ws(
+    websocket: WebSocket,
+    session_id: str = "default",
+    user_id: Optional[str] = None,
+    advisor_id: Optional[str] = None,
+):
+    """
+    Persistent chat channel: one connection per session, many messages.
+
+    Replies use the /chat/stream events as JSON frames ({"type": "text", "id": ..., ...});
+    the server also pushes household_update frames when a household the
+    connection follows (advisor_id, or the whole book) turns AT_RISK.
+    See clawdbot_websocket for the frame protocol.
+    """
+    await websocket.accept()
+    connection = ChatConnection(
+        websocket, session_id, user_id=user_id, advisor_id=advisor_id,
+        request_id=websocket.headers.get(REQUEST_ID_HEADER),
+    )
+    chat_connections.connect(connection)
+    writer = asyncio.create_task(connection.run_writer())
+    try:
+        while True:
+            try:
+                frame = await websocket.receive_json()
+            except ValueError:
+                await connection.send({"type": "error", "detail": "frames must be JSON objects"})
+                continue
+            if not isinstance(frame, dict):
+                await connection.send({"type": "error", "detail": "frames must be JSON objects"})
+                continue
+
+            kind = frame.get("type", "message")
+            if kind == "message":
+                # Messages are answered in order so each turn sees the previous one's session state
+                await answer_ws_message(connection, frame)
+            elif kind == "subscribe":
+                advisor_id = frame.get("advisor_id")
+                if advisor_id is not None and (isinstance(advisor_id, bool) or not isinstance(advisor_id, (str, int))):
+                    await connection.send({"type": "error", "detail": "advisor_id must be a string, a number or null"})
+                    continue
+                connection.advisor_id = advisor_key(advisor_id)
+                await connection.send({"type": "subscribed", "advisor_id": connection.advisor_id})
+            elif kind == "ping":
+                await connection.send({"type": "pong"})
+            else:
+                await connection.send({"type": "error", "detail": f"unknown frame type: {kind}"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        chat_connections.disconnect(connection)
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
 
 
 # ==================== Direct API Endpoints ====================
@@ -184,78 +873,243 @@ async def create_workflow(request: WorkflowCreateRequest):
         advisor_id=request.advisor_id,
         metadata=request.metadata,
     )
-    return result
+    household = result.get("household") if isinstance(result, dict) else None
+    if isinstance(household, dict) and household.get("id") is not None:
+        dashboard_aggregates.upsert(household)
+    else:
+        dashboard_aggregates.mark_stale()
+    return trusted_json(result)
 
 
 @app.get("/workflows/{workflow_id}")
 async def get_workflow(workflow_id: str):
     """Get workflow details."""
-    return await backend_client.get_workflow(workflow_id)
+    return trusted_json(await backend_client.get_workflow(workflow_id))
 
 
 @app.get("/households")
-async def list_households(advisor_id: Optional[str] = None, status: Optional[str] = None):
-    """List all households."""
-    return await backend_client.list_households(advisor_id=advisor_id, status=status)
+async def list_households(
+    http_request: Request,
+    advisor_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=HOUSEHOLDS_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+):
+    """
+    List households; pass limit/offset to fetch one page instead of the whole book.
+    Supports If-None-Match (304 when unchanged).
+    """
+    if limit is not None or offset:
+        return etag_json(http_request, await backend_client.list_households_page(
+            limit=limit or HOUSEHOLDS_MAX_LIMIT, offset=offset, advisor_id=advisor_id, status=status
+        ))
+    households = await backend_client.list_households(advisor_id=advisor_id, status=status)
+    if advisor_id is None and status is None:
+        dashboard_aggregates.sync(households)
+    return etag_json(http_request, households)
 
 
 @app.get("/households/{household_id}")
-async def get_household(household_id: int):
-    """Get household details."""
-    return await backend_client.get_household(household_id)
+async def get_household(household_id: int, http_request: Request):
+    """Get household details. Supports If-None-Match (304 when unchanged)."""
+    return etag_json(http_request, await backend_client.get_household(household_id))
 
 
 @app.post("/tasks/{task_id}/complete")
-async def complete_task(task_id: int, request: TaskCompleteRequest):
-    """Complete a task."""
-    return await backend_client.complete_task(task_id=task_id, note=request.note)
+async def complete_task(task_id: int, request: TaskCompleteRequest, http_request: Request):
+    """
+    Complete a task. With the task outbox enabled the completion is stored
+    durably and 202 is returned at once; an Idempotency-Key header makes
+    client retries safe.
+    """
+    if task_outbox is not None:
+        entry, created = await task_outbox.enqueue(
+            task_id, request.note, idempotency_key=http_request.headers.get("idempotency-key")
+        )
+        return trusted_json(
+            {
+                "status": entry["status"],
+                "outbox_id": entry["id"],
+                "task_id": entry["task_id"],
+                "idempotency_key": entry["idempotency_key"],
+                "duplicate": not created,
+            },
+            status_code=202,
+            headers={"Location": f"/tasks/outbox/{entry['id']}"},
+        )
+    result = await backend_client.complete_task(task_id=task_id, note=request.note)
+    dashboard_aggregates.task_completed(household_id_of(result))
+    return trusted_json(result)
+
+
+def _require_outbox() -> TaskOutbox:
+    if task_outbox is None:
+        raise HTTPException(status_code=404, detail="Task outbox is not enabled (set CLAWDBOT_TASK_OUTBOX_PATH)")
+    return task_outbox
+
+
+@app.get("/tasks/outbox")
+async def task_outbox_status(status: Optional[str] = None, limit: int = Query(100, ge=1, le=1000)):
+    """Outbox counts plus undelivered entries in delivery order (or only those in `status`)."""
+    outbox = _require_outbox()
+    return trusted_json({
+        "stats": await outbox.stats(),
+        "entries": await outbox.entries(status=status, limit=limit),
+    })
+
+
+@app.get("/tasks/outbox/{entry_id}")
+async def task_outbox_entry(entry_id: int):
+    """One outbox entry: its state, attempts, last error and (once delivered) the backend result."""
+    entry = await _require_outbox().get(entry_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Outbox entry {entry_id} not found")
+    return trusted_json(entry)
+
+
+@app.post("/tasks/outbox/{entry_id}/retry")
+async def task_outbox_retry(entry_id: int):
+    """Requeue a failed outbox entry."""
+    outbox = _require_outbox()
+    if not await outbox.retry(entry_id):
+        raise HTTPException(status_code=409, detail=f"Outbox entry {entry_id} is not in the failed state")
+    return trusted_json(await outbox.get(entry_id))
+
+
+@app.post("/tasks/complete:batch")
+async def complete_tasks_batch(request: TaskCompleteBatchRequest):
+    """Complete many tasks in one call; returns a result or error per task."""
+    if len(request.tasks) > BATCH_MAX_TASKS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {BATCH_MAX_TASKS} tasks can be completed per batch",
+        )
+    concurrency = min(request.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    results = await backend_client.complete_tasks(
+        [{"task_id": item.task_id, "note": item.note or request.note} for item in request.tasks],
+        concurrency=concurrency,
+    )
+    for item in results:
+        if item["ok"]:
+            dashboard_aggregates.task_completed(household_id_of(item.get("result")))
+    completed = sum(1 for item in results if item["ok"])
+    return trusted_json({
+        "completed": completed,
+        "failed": len(results) - completed,
+        "results": results,
+    })
 
 
 @app.post("/documents/validate")
 async def validate_document(payload: Dict):
     """Validate a document."""
-    return await backend_client.validate_document(
+    return trusted_json(await backend_client.validate_document(
         document_id=payload.get("document_id"),
         document_url=payload.get("document_url"),
-    )
+    ))
 
 
 @app.get("/households/{household_id}/meeting-pack")
-async def get_meeting_pack(household_id: int):
-    """Generate meeting pack."""
-    return await backend_client.get_meeting_pack(household_id)
+async def get_meeting_pack(household_id: int, http_request: Request, wait: bool = False):
+    """
+    Get a meeting pack.
+
+    Returns the pack (200) if one is cached for the household's current
+    version. Otherwise queues generation and returns 202 with a job to poll
+    at /meeting-packs/jobs/{job_id}; pass ?wait=true to block until ready.
+    """
+    if wait:
+        return trusted_json(await meeting_packs.get_or_generate(household_id))
+
+    version = await meeting_packs.current_version(household_id)
+    pack = meeting_packs.get_cached(household_id, version)
+    if pack is not None:
+        return trusted_json(pack)
+
+    job = meeting_packs.submit(household_id, version)
+    status_url = str(http_request.url_for("get_meeting_pack_job", job_id=job.job_id))
+    return JSONResponse(
+        status_code=202,
+        content={**job.to_dict(), "status_url": status_url},
+        headers={"Location": status_url, "Retry-After": "2"},
+    )
+
+
+@app.get("/meeting-packs/jobs/{job_id}")
+async def get_meeting_pack_job(job_id: str):
+    """Poll a meeting pack generation job; includes the pack once done."""
+    job = meeting_packs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown meeting pack job")
+    body = job.to_dict()
+    if job.status == JOB_DONE:
+        body["pack"] = meeting_packs.get_job_pack(job)
+    elif job.status != JOB_FAILED:
+        return JSONResponse(status_code=202, content=body, headers={"Retry-After": "2"})
+    return trusted_json(body)
 
 
 @app.get("/predictions/eta/{workflow_id}")
 async def get_eta(workflow_id: str):
     """Get ETA prediction."""
-    return await backend_client.get_eta_prediction(workflow_id)
+    return trusted_json(await backend_client.get_eta_prediction(workflow_id))
+
+
+@app.post("/events")
+async def backend_events(http_request: Request):
+    """
+    Receive household/task/workflow change events from the backend and apply
+    them to the cache and dashboard aggregates (see clawdbot_events).
+    """
+    if not event_verifier.enabled:
+        raise HTTPException(status_code=404, detail="Backend events are not enabled")
+    body = await http_request.body()
+    try:
+        event_verifier.verify(http_request.headers, body)
+    except EventAuthError as e:
+        logger.warning(f"Rejected backend event request: {e}")
+        raise HTTPException(status_code=401, detail="Invalid event credentials")
+    try:
+        events = parse_events(json.loads(body))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid event payload: {e}")
+    return trusted_json(event_processor.apply_all(events))
 
 
 # ==================== Helper Functions ====================
 
-def format_dashboard_response(households: list) -> str:
-    """Format dashboard data as a readable response."""
-    total = len(households)
-    at_risk = sum(1 for h in households if h.get("status") == "AT_RISK")
-    in_progress = sum(1 for h in households if h.get("status") == "IN_PROGRESS")
-    
-    total_tasks = sum(h.get("open_tasks_count", 0) for h in households)
-    total_nigo = sum(h.get("nigo_issues_count", 0) for h in households)
+async def ensure_dashboard_aggregates() -> None:
+    """Build the dashboard aggregates from a household snapshot if they are missing or expired."""
+    if not dashboard_aggregates.is_fresh():
+        households = await backend_client.list_households()
+        dashboard_aggregates.rebuild(households)
 
+
+def format_dashboard_response(summary: Dict[str, Any]) -> str:
+    """Format dashboard aggregates as a readable response."""
     return (
         f"📊 Transition OS Dashboard\n\n"
-        f"Total Households: {total}\n"
-        f"  • In Progress: {in_progress}\n"
-        f"  • At Risk: {at_risk}\n\n"
-        f"Open Tasks: {total_tasks}\n"
-        f"NIGO Issues: {total_nigo}\n\n"
+        f"Total Households: {summary['total_households']}\n"
+        f"  • In Progress: {summary['in_progress']}\n"
+        f"  • At Risk: {summary['at_risk']}\n\n"
+        f"Open Tasks: {summary['open_tasks']}\n"
+        f"NIGO Issues: {summary['nigo_issues']}\n\n"
         f"Use /households to see the full list."
     )
 
 
-def format_households_list(households: list) -> str:
-    """Format households list as a readable response."""
+def format_household_detail(household: Dict[str, Any]) -> str:
+    """Format a single household as a readable response."""
+    status_icon = "🔴" if household.get("status") == "AT_RISK" else "🟢"
+    return (
+        f"{status_icon} {household.get('name')} (ID: {household.get('id')})\n"
+        f"   Status: {household.get('status')}\n"
+        f"   Advisor: {household.get('advisor_name')} | Tasks: {household.get('open_tasks_count')} | NIGO: {household.get('nigo_issues_count')}"
+    )
+
+
+def format_households_list(households: list, total: Optional[int] = None) -> str:
+    """Format households list as a readable response (`total` = size of the whole book, if known)."""
     if not households:
         return "No households found."
 
@@ -267,8 +1121,9 @@ def format_households_list(households: list) -> str:
             f"   Advisor: {h.get('advisor_name')} | Tasks: {h.get('open_tasks_count')} | NIGO: {h.get('nigo_issues_count')}\n"
         )
     
-    if len(households) > 10:
-        lines.append(f"\n... and {len(households) - 10} more")
+    total = max(total or 0, len(households))
+    if total > 10:
+        lines.append(f"\n... and {total - 10} more")
 
     return "\n".join(lines)
 
@@ -280,6 +1135,9 @@ if __name__ == "__main__":
     
     port = int(os.getenv("CLAWDBOT_PORT", "8080"))
     host = os.getenv("CLAWDBOT_HOST", "0.0.0.0")
+    # One worker per core on the instance; each worker process has its own
+    # event loop, backend connection pool and in-memory caches
+    workers = int(os.getenv("CLAWDBOT_WORKERS", "1"))
     
     print(f"""
     ╔═══════════════════════════════════════════════════════════╗
@@ -288,8 +1146,21 @@ if __name__ == "__main__":
     ║                                                           ║
     ║   Backend: {backend_client.base_url:<45} ║
     ║   Port:    {port:<45} ║
+    ║   Workers: {workers:<45} ║
     ║                                                           ║
     ╚═══════════════════════════════════════════════════════════╝
     """)
     
-    uvicorn.run(app, host=host, port=port)
+    # Multiple workers need an import string so each process builds its own app.
+    # With more than one worker, SIGHUP restarts the workers one by one (graceful reload).
+    uvicorn.run(
+        "openclaw.clawdbot_server:app" if workers > 1 else app,
+        host=host,
+        port=port,
+        workers=workers,
+        loop="auto",  # uvloop when installed
+        http="auto",  # httptools when installed
+        log_level=os.getenv("LOG_LEVEL", "info").lower(),
+        timeout_graceful_shutdown=int(os.getenv("CLAWDBOT_GRACEFUL_TIMEOUT", "30")),
+        timeout_keep_alive=int(os.getenv("CLAWDBOT_KEEPALIVE_TIMEOUT", "5")),
+    )
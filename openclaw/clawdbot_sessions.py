@@ -0,0 +1,163 @@
+"""
+Chat Session Store for Clawdbot (EC2)
+
+Keeps per-session conversation state between /chat turns so follow-ups like
+"12" (after "Which household?") or "complete that task" can be resolved
+against the IDs earlier turns named.
+
+Sessions are keyed by (user_id, session_id) and bounded by count, idle TTL
+and an estimate of their memory footprint; the least recently used session
+is evicted first.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from openclaw.clawdbot_cache import estimate_size
+
+# Fixed per-session overhead used in the memory estimate
+SESSION_BASE_BYTES = 512
+
+SessionKey = Tuple[Optional[str], str]
+
+
+@dataclass
+class ChatSession:
+    session_id: str
+    user_id: Optional[str] = None
+    # Last household list shown in this session
+    households: Optional[List[Dict]] = None
+    # Last resolved entity IDs (household_id, task_id, workflow_id, document_id)
+    entities: Dict[str, Any] = field(default_factory=dict)
+    # Intent waiting for an argument, e.g. ("meeting_pack", "household_id")
+    pending_intent: Optional[str] = None
+    pending_arg: Optional[str] = None
+    # Free-form conversation slots
+    slots: Dict[str, Any] = field(default_factory=dict)
+    turns: int = 0
+    last_seen: float = 0.0
+    households_bytes: int = 0
+
+    def remember_households(self, households: List[Dict]) -> None:
+        """Keep the household list from this turn for follow-up questions."""
+        if households is self.households:
+            return
+        self.households = households
+        self.households_bytes = estimate_size(households)
+
+    def await_argument(self, intent: str, arg: str) -> None:
+        """Record that the last reply asked the user for `arg` to finish `intent`."""
+        self.pending_intent = intent
+        self.pending_arg = arg
+
+    def clear_pending(self) -> None:
+        self.pending_intent = None
+        self.pending_arg = None
+
+    def size(self) -> int:
+        """Estimated memory footprint in bytes."""
+        return (
+            SESSION_BASE_BYTES
+            + self.households_bytes
+            + estimate_size(self.entities)
+            + estimate_size(self.slots)
+        )
+
+
+class SessionStore:
+    """In-process LRU store of chat sessions with an idle TTL and a memory cap."""
+
+    def __init__(
+        self,
+        ttl: float = 1800.0,
+        max_sessions: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            ttl: Seconds of inactivity after which a session is dropped
+            max_sessions: Maximum number of sessions kept
+            max_bytes: Maximum estimated size of all sessions
+            clock: Monotonic clock (overridable for tests)
+        """
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._sessions: "OrderedDict[SessionKey, ChatSession]" = OrderedDict()
+        self._sizes: Dict[SessionKey, int] = {}
+        self._bytes = 0
+        self.created = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, user_id: Optional[str], session_id: Optional[str]) -> ChatSession:
+        """Return the live session for (user_id, session_id), creating it if needed."""
+        key = (user_id, session_id or "default")
+        now = self._clock()
+        session = self._sessions.get(key)
+        if session is not None and now - session.last_seen > self.ttl:
+            self._remove(key)
+            self.expired += 1
+            session = None
+        if session is None:
+            session = ChatSession(session_id=key[1], user_id=user_id)
+            self._sessions[key] = session
+            self._sizes[key] = 0
+            self.created += 1
+        else:
+            self._sessions.move_to_end(key)
+        session.last_seen = now
+        return session
+
+    def save(self, session: ChatSession) -> None:
+        """Re-account a session's memory after a turn and enforce the limits."""
+        key = (session.user_id, session.session_id)
+        if key not in self._sessions:
+            return
+        session.turns += 1
+        size = session.size()
+        self._bytes += size - self._sizes[key]
+        self._sizes[key] = size
+        self._evict(keep=key)
+
+    def drop(self, user_id: Optional[str], session_id: str) -> None:
+        """Forget a session."""
+        self._remove((user_id, session_id))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "bytes": self._bytes,
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "created": self.created,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: SessionKey) -> None:
+        if self._sessions.pop(key, None) is not None:
+            self._bytes -= self._sizes.pop(key, 0)
+
+    def _evict(self, keep: SessionKey) -> None:
+        now = self._clock()
+        # Idle sessions sit at the front of the LRU order
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if key == keep:
+                break
+            over_limit = len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes
+            if now - session.last_seen > self.ttl:
+                self.expired += 1
+            elif over_limit:
+                self.evictions += 1
+            else:
+                break
+            self._remove(key)
@@ -0,0 +1,331 @@
+"""
+Request Tracing for Clawdbot (EC2)
+
+Every request gets a correlation ID and a trace, so a slow /chat can be
+broken down into routing, backend calls and serialization:
+
+    - The request ID comes from the caller's X-Request-ID header (or is
+      generated) and is echoed on the response. The trace continues the
+      caller's W3C `traceparent` if it sent one.
+    - span("name", **attributes) times a stage of the work as a child of
+      whatever span is current. The current span lives in a context
+      variable, so concurrent requests (and the tasks they start) keep
+      separate traces.
+    - Backend calls carry X-Request-ID and a `traceparent` naming the
+      backend-call span, so the backend's logs join the same trace.
+    - Finished spans of sampled traces go to a JSON-lines file, written by
+      a background thread so the event loop never waits on the disk. It
+      needs no collector and works offline.
+
+One line per span:
+
+    {"trace_id": ..., "span_id": ..., "parent_id": ..., "request_id": ...,
+     "name": "backend get_household", "start": 1760000000.123,
+     "duration_ms": 12.4, "status": "ok", "attributes": {...}}
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "x-request-id"
+TRACEPARENT_HEADER = "traceparent"
+
+TRACEPARENT = re.compile(r"^00-(?P<trace_id>[0-9a-f]{32})-(?P<span_id>[0-9a-f]{16})-(?P<flags>[0-9a-f]{2})$")
+# Caller-supplied request IDs are echoed and logged, so only accept tame ones
+REQUEST_ID = re.compile(r"^[\w.:-]{1,128}$")
+
+# Span of the work currently running, if it is being traced
+_current_span: ContextVar[Optional["Span"]] = ContextVar("clawdbot_span", default=None)
+
+
+class Span:
+    """One timed unit of work within a trace."""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "request_id", "sampled",
+        "attributes", "start", "_started", "duration", "status", "error",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        request_id: str,
+        sampled: bool,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.request_id = request_id
+        self.sampled = sampled
+        self.attributes = attributes or {}
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.duration = time.perf_counter() - self._started
+        if error is not None:
+            self.status = "error"
+            self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "request_id": self.request_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+        if self.error is not None:
+            record["error"] = self.error
+        return record
+
+
+class JsonlSpanExporter:
+    """Appends finished spans to a JSON-lines file from a background thread."""
+
+    def __init__(self, path: str, max_queue: int = 10000, flush_interval: float = 1.0):
+        """
+        Args:
+            path: File to append to; "{pid}" is replaced by the process ID
+                  (one file per worker)
+            max_queue: Spans buffered before new ones are dropped
+            flush_interval: Seconds between writes when spans trickle in
+        """
+        self.path = path.replace("{pid}", str(os.getpid()))
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def export(self, span: Span) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(span.to_dict())
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write out the queued spans and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "queued": self._queue.qsize(),
+        }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                # Started lazily so it is created in the worker process, not before a fork
+                self._thread = threading.Thread(target=self._run, name="clawdbot-span-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                batch: List[Optional[Dict[str, Any]]] = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = None in batch
+            records = [record for record in batch if record is not None]
+            if records:
+                self._write(records)
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        data = "".join(json.dumps(record, default=str, separators=(",", ":")) + "\n" for record in records)
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # One O_APPEND write per batch: lines from workers sharing the file don't interleave
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data.encode("utf-8"))
+            finally:
+                os.close(fd)
+            self.exported += len(records)
+        except OSError as e:
+            self.errors += 1
+            logger.warning(f"Could not write {len(records)} span(s) to {self.path}: {e}")
+
+
+class Tracer:
+    """Creates traces and spans and hands the sampled ones to an exporter."""
+
+    def __init__(self, exporter: Optional[JsonlSpanExporter] = None, sample_rate: float = 1.0):
+        """
+        Args:
+            exporter: Where finished spans go (None = IDs are propagated but nothing is recorded)
+            sample_rate: Fraction of new traces recorded; a caller's traceparent flag wins
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @contextmanager
+    def trace(
+        self,
+        name: str,
+        request_id: Optional[str] = None,
+        traceparent: Optional[str] = None,
+        **attributes: Any,
+    ) -> Iterator[Span]:
+        """Run the enclosed code as the root span of a request (continuing the caller's trace, if any)."""
+        parent = TRACEPARENT.match(traceparent or "")
+        if parent is not None and parent["trace_id"] != "0" * 32:
+            trace_id, parent_id = parent["trace_id"], parent["span_id"]
+            sampled = int(parent["flags"], 16) & 1 == 1
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+            sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        if not request_id or not REQUEST_ID.match(request_id):
+            request_id = trace_id
+        span = Span(name, trace_id, parent_id, request_id, sampled and self.exporter is not None, attributes)
+        with self._activate(span):
+            yield span
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Time the enclosed code as a child of the current span (no-op outside a trace)."""
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        span = Span(name, parent.trace_id, parent.span_id, parent.request_id, parent.sampled, attributes)
+        with self._activate(span):
+            yield span
+
+    @contextmanager
+    def _activate(self, span: Span) -> Iterator[None]:
+        token = _current_span.set(span)
+        error: Optional[BaseException] = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish(error)
+            if span.sampled and self.exporter is not None:
+                self.exporter.export(span)
+
+    def stats(self) -> Dict[str, Any]:
+        if self.exporter is None:
+            return {"enabled": False}
+        return {"enabled": True, "sample_rate": self.sample_rate, **self.exporter.stats()}
+
+
+tracer = Tracer()
+
+
+def configure(path: Optional[str], sample_rate: float = 1.0) -> Tracer:
+    """Point the module tracer at a JSON-lines file (None = propagate IDs only)."""
+    if tracer.exporter is not None:
+        tracer.exporter.close()
+    tracer.exporter = JsonlSpanExporter(path) if path else None
+    tracer.sample_rate = sample_rate
+    return tracer
+
+
+def span(name: str, **attributes: Any):
+    """Child span of the current one on the module tracer; see Tracer.span."""
+    return tracer.span(name, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def trace_headers() -> Dict[str, str]:
+    """Headers carrying the current request ID and span to a downstream service."""
+    current = _current_span.get()
+    if current is None:
+        return {}
+    return {"X-Request-ID": current.request_id, "traceparent": current.traceparent()}
+
+
+class TracingMiddleware:
+    """ASGI middleware running each HTTP request as the root span of a trace."""
+
+    def __init__(self, app, skip_paths: Iterable[str] = ("/health", "/metrics")):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", ()))
+        request_id = headers.get(REQUEST_ID_HEADER.encode(), b"").decode("latin-1")
+        traceparent = headers.get(TRACEPARENT_HEADER.encode(), b"").decode("latin-1")
+        method = scope.get("method", "")
+        with tracer.trace(
+            f"{method} {scope.get('path', '')}", request_id=request_id, traceparent=traceparent,
+            method=method, path=scope.get("path", ""),
+        ) as root:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    root.set(status_code=message["status"])
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (b"x-request-id", root.request_id.encode())],
+                    }
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # Name the span by route template once routing has run, like the metrics do
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    root.name = f"{method} {route}"
@@ -0,0 +1,169 @@
+"""
+WebSocket Chat Connections for Clawdbot (EC2)
+
+/chat/ws keeps one connection open per chat session instead of an HTTP
+request per message. Each connection has an outbound queue drained by a
+single writer task, so chat replies and server-initiated pushes (e.g. a
+household turning AT_RISK) never interleave on the socket. ConnectionManager
+tracks the open connections and fans pushes out to them.
+
+Frames are JSON objects with a "type":
+
+    client → server   {"type": "message", "message": ..., "id": ..., "context": {...}}
+                      {"type": "subscribe", "advisor_id": ...}  (null = whole book)
+                      {"type": "ping"}
+    server → client   intent / text / data / done / error  (same payloads as the
+                      /chat/stream SSE events, plus the client's message "id")
+                      household_update  {"household_id", "advisor_id", "status", "previous_status"}
+                      subscribed {"advisor_id"}, pong
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional, Set
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from openclaw.clawdbot_responses import dumps
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth interrupting a user for
+DEFAULT_PUSH_STATUSES = ("AT_RISK",)
+
+
+def advisor_key(advisor_id: Any) -> Optional[str]:
+    """Advisor id as compared for pushes: query strings, JSON numbers and backend ids all become str."""
+    return None if advisor_id is None else str(advisor_id)
+
+
+class ChatConnection:
+    """One open /chat/ws socket and its outbound frame queue."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        session_id: str,
+        user_id: Optional[str] = None,
+        advisor_id: Optional[str] = None,
+        max_queue: int = 256,
+        request_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            websocket: Accepted WebSocket
+            session_id: Chat session the connection's messages belong to
+            user_id: Caller's user id (rate limiting and sessions)
+            advisor_id: Only push updates for this advisor's households (None = all)
+            max_queue: Frames buffered for a slow client before pushes are dropped
+            request_id: X-Request-ID the connection was opened with (tags its messages' traces)
+        """
+        self.websocket = websocket
+        self.session_id = session_id
+        self.user_id = user_id
+        self.advisor_id = advisor_key(advisor_id)
+        self.request_id = request_id
+        self.queue: asyncio.Queue = asyncio.Queue(max_queue)
+        self.dropped = 0
+        self.closed = False
+
+    async def send(self, frame: Dict[str, Any]) -> None:
+        """
+        Queue a reply frame, waiting if the client is behind (backpressure on its
+        own chat). Raises WebSocketDisconnect once the writer has stopped.
+        """
+        if self.closed:
+            raise WebSocketDisconnect(1011)
+        await self.queue.put(frame)
+
+    def push(self, frame: Dict[str, Any]) -> bool:
+        """Queue a server-initiated frame without waiting; dropped if the client is behind."""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    def wants(self, advisor_id: Any) -> bool:
+        return self.advisor_id is None or self.advisor_id == advisor_key(advisor_id)
+
+    async def run_writer(self) -> None:
+        """Send queued frames in order until cancelled; if a send fails, close the connection."""
+        try:
+            while True:
+                frame = await self.queue.get()
+                await self.websocket.send_text(dumps(frame).decode())
+        except Exception as e:
+            logger.info(f"Closing chat WebSocket for session {self.session_id}: send failed: {e}")
+            self.closed = True
+            # Unblock a send() waiting for room; it raises WebSocketDisconnect from now on
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            try:
+                # Ends the reader's receive loop with a WebSocketDisconnect
+                await self.websocket.close(code=1011)
+            except Exception:
+                pass
+
+
+class ConnectionManager:
+    """Registry of open chat connections, used to push updates to them."""
+
+    def __init__(self, push_statuses: Iterable[str] = DEFAULT_PUSH_STATUSES):
+        """
+        Args:
+            push_statuses: Household statuses that trigger a household_update push
+        """
+        self.push_statuses = set(push_statuses)
+        self._connections: Set[ChatConnection] = set()
+        self.connections_total = 0
+        self.pushes = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def connect(self, connection: ChatConnection) -> None:
+        self._connections.add(connection)
+        self.connections_total += 1
+
+    def disconnect(self, connection: ChatConnection) -> None:
+        self._connections.discard(connection)
+        self.dropped += connection.dropped
+
+    def broadcast(self, frame: Dict[str, Any], advisor_id: Optional[str] = None) -> int:
+        """Push `frame` to every connection following `advisor_id`; returns how many took it."""
+        sent = 0
+        for connection in list(self._connections):
+            if connection.wants(advisor_id) and connection.push(frame):
+                sent += 1
+        self.pushes += sent
+        return sent
+
+    def household_status_changed(
+        self, household_id: Any, advisor_id: Optional[str], previous: Optional[str], status: Optional[str]
+    ) -> None:
+        """DashboardAggregates status listener: push households entering a watched status."""
+        if status not in self.push_statuses or not self._connections:
+            return
+        self.broadcast(
+            {
+                "type": "household_update",
+                "household_id": household_id,
+                "advisor_id": advisor_id,
+                "status": status,
+                "previous_status": previous,
+            },
+            advisor_id,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self._connections),
+            "connections_total": self.connections_total,
+            "pushes": self.pushes,
+            "dropped_pushes": self.dropped + sum(c.dropped for c in self._connections),
+        }
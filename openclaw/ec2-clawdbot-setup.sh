@@ -45,6 +45,9 @@ echo "   python3 -m venv venv"
 echo "   source venv/bin/activate"
 echo "   pip install -r backend/requirements.txt"
 echo "   pip install httpx  # Additional dependency for backend client"
+echo "   pip install orjson  # Optional: faster JSON responses"
+echo "   pip install brotli  # Optional: brotli response compression (gzip otherwise)"
+echo "   pip install websockets  # Required for /chat/ws (uvicorn's WebSocket support)"
 echo ""
 echo "3. Configure environment variables:"
 echo "   cp openclaw/.env.example openclaw/.env"